@@ -0,0 +1,178 @@
+"""Graphique d'activité dessiné dans un seul ``Canvas``.
+
+Un graphique en contrôles Flet (une colonne de conteneurs par jour) coûte
+quatre contrôles par jour : ~120 pour un mois, ~1 500 pour un an. Ici tout
+est dessiné dans un ``canvas.Canvas`` : les barres (ou les cases du
+calendrier) d'une même couleur sont les rectangles d'un seul ``Path``, la
+courbe est un seul ``Path``. Le nombre de formes est constant (une poignée).
+
+La plage de jours est regroupée en intervalles selon la largeur disponible
+(au plus un intervalle par `bar_px` pixels) et chaque intervalle est une
+seule requête à la source, une somme sur une plage de jours
+(``StatsEngine.range_sum``, en O(log n)) : le coût d'un rendu dépend de la
+taille de l'écran, pas du nombre de jours affichés.
+
+Vues :
+
+    bar       barres (moyenne journalière de chaque intervalle)
+    line      courbe remplie
+    heatmap   calendrier, une colonne par semaine (ou par groupe de jours
+              consécutifs quand les semaines ne tiennent pas en largeur)
+"""
+from datetime import date
+
+import flet as ft
+import flet.canvas as cv
+
+from styles import tint
+
+DAY_LABELS = ("Lun", "Mar", "Mer", "Jeu", "Ven", "Sam", "Dim")
+HEATMAP_LEVELS = (0.25, 0.5, 0.75, 1.0)
+LABEL_HEIGHT = 18
+
+
+def buckets(count, slots):
+    """Découpe `count` jours en au plus `slots` intervalles contigus [lo, hi)"""
+    slots = max(1, min(count, slots))
+    return [(count * i // slots, count * (i + 1) // slots) for i in range(slots)]
+
+
+class ActivityChart:
+    def __init__(self, source, width=300, height=150, color="#7c4dff", goal=None, bar_px=8, cell_px=5):
+        """source(start, end) : total de l'activité sur les ordinaux [start, end)"""
+        self.source = source
+        self.width = width
+        self.height = height
+        self.color = color
+        # Valeur journalière qui remplit une barre (sinon, le maximum affiché)
+        self.goal = goal
+        self.bar_px = bar_px
+        self.cell_px = cell_px
+        self.mode = "bar"
+        self.start = date.today().toordinal()
+        self.days = 7
+        self.queries = 0
+        # Largeur laissée au parent : on_resize donne la largeur réelle
+        self.canvas = cv.Canvas(height=height, on_resize=self.on_resize, resize_interval=200)
+
+    def show(self, mode, start, days):
+        """Change de vue ou de plage (`start` : date ou ordinal) puis redessine"""
+        self.mode = mode
+        self.start = start if isinstance(start, int) else start.toordinal()
+        self.days = days
+        self.render()
+
+    def on_resize(self, e):
+        # Seule la largeur change le regroupement ; redessin à la taille réelle
+        if abs(e.width - self.width) < 1:
+            return
+        self.width = e.width
+        self.render()
+        self.canvas.update()
+
+    def _total(self, lo, hi):
+        self.queries += 1
+        return self.source(self.start + lo, self.start + hi)
+
+    def render(self):
+        if self.mode == "heatmap":
+            self.canvas.shapes = self._heatmap()
+        else:
+            self.canvas.shapes = self._series()
+
+    def _series(self):
+        plot_height = self.height - LABEL_HEIGHT
+        ranges = buckets(self.days, int(self.width // self.bar_px))
+        values = [self._total(lo, hi) / (hi - lo) for lo, hi in ranges]
+        scale = max(self.goal or 0, max(values, default=0)) or 1
+        step = self.width / len(ranges)
+        if self.mode == "line":
+            shapes = self._line(values, scale, step, plot_height)
+        else:
+            shapes = self._bars(values, scale, step, plot_height)
+        return shapes + self._labels(ranges, step)
+
+    def _bars(self, values, scale, step, plot_height):
+        gap = min(step * 0.2, 6)
+        radius = min((step - gap) / 2, 8)
+        track = []
+        bars = []
+        for i, value in enumerate(values):
+            x = i * step + gap / 2
+            track.append(cv.Path.Rect(x, 0, step - gap, plot_height, radius))
+            height = plot_height * min(value / scale, 1.0)
+            if height > 0:
+                bars.append(cv.Path.Rect(x, plot_height - height, step - gap, height, radius))
+        return [
+            cv.Path(track, paint=ft.Paint(color=tint("white", 0.1))),
+            cv.Path(bars, paint=ft.Paint(color=self.color)),
+        ]
+
+    def _line(self, values, scale, step, plot_height):
+        points = [
+            (i * step + step / 2, plot_height * (1 - min(value / scale, 1.0)))
+            for i, value in enumerate(values)
+        ]
+        stroke = [cv.Path.MoveTo(*points[0])] + [cv.Path.LineTo(x, y) for x, y in points[1:]]
+        fill = stroke + [cv.Path.LineTo(points[-1][0], plot_height), cv.Path.LineTo(points[0][0], plot_height), cv.Path.Close()]
+        return [
+            cv.Path(fill, paint=ft.Paint(color=tint(self.color, 0.2))),
+            cv.Path(stroke, paint=ft.Paint(color=self.color, stroke_width=2, style=ft.PaintingStyle.STROKE)),
+        ]
+
+    def _labels(self, ranges, step):
+        style = ft.TextStyle(size=10, color="#888")
+        y = self.height - LABEL_HEIGHT + 4
+        if self.days <= 7 and len(ranges) == self.days:
+            return [
+                cv.Text(i * step + step / 2, y, DAY_LABELS[date.fromordinal(self.start + i).weekday()],
+                        style=style, alignment=ft.alignment.top_center)
+                for i in range(self.days)
+            ]
+        first = date.fromordinal(self.start)
+        last = date.fromordinal(self.start + self.days - 1)
+        return [
+            cv.Text(0, y, first.strftime("%d/%m"), style=style),
+            cv.Text(self.width, y, last.strftime("%d/%m"), style=style, alignment=ft.alignment.top_right),
+        ]
+
+    def _heatmap(self):
+        # Semaines commençant le lundi ; au-delà de la largeur, `span` jours consécutifs par case
+        offset = date.fromordinal(self.start).weekday()
+        weeks = -(-(self.days + offset) // 7)
+        columns = max(1, min(weeks, int(self.width // self.cell_px)))
+        span = -(-weeks // columns)
+        if span == 1:
+            start = -offset
+        else:
+            start = 0
+            columns = -(-self.days // (7 * span))
+        cell = min(self.width / columns, (self.height - LABEL_HEIGHT) / 7)
+        gap = cell * 0.15
+        cells = []
+        values = []
+        for column in range(columns):
+            for row in range(7):
+                lo = start + (column * 7 + row) * span
+                hi = min(lo + span, self.days)
+                lo = max(lo, 0)
+                if hi <= lo:
+                    continue
+                cells.append((column * cell, row * cell))
+                values.append(self._total(lo, hi) / (hi - lo))
+        scale = self.goal or max(values, default=0) or 1
+        paths = [[] for _ in range(len(HEATMAP_LEVELS) + 1)]
+        for (x, y), value in zip(cells, values):
+            level = 0 if value <= 0 else next(
+                (i for i, bound in enumerate(HEATMAP_LEVELS, 1) if value / scale <= bound), len(HEATMAP_LEVELS)
+            )
+            paths[level].append(cv.Path.Rect(x, y, cell - gap, cell - gap, gap))
+        colors = [tint("white", 0.08)] + [tint(self.color, bound) for bound in HEATMAP_LEVELS]
+        shapes = [cv.Path(rects, paint=ft.Paint(color=color)) for rects, color in zip(paths, colors) if rects]
+        first = date.fromordinal(self.start)
+        last = date.fromordinal(self.start + self.days - 1)
+        style = ft.TextStyle(size=10, color="#888")
+        y = 7 * cell + 4
+        shapes.append(cv.Text(0, y, first.strftime("%m/%Y"), style=style))
+        shapes.append(cv.Text(columns * cell, y, last.strftime("%m/%Y"), style=style, alignment=ft.alignment.top_right))
+        return shapes
@@ -0,0 +1,176 @@
+"""Cache local des ressources distantes (images d'avatar, etc.).
+
+Les fichiers sont rangés par empreinte SHA-256 (``blobs/ab/abcdef…``) : deux
+URL au contenu identique partagent le même fichier. Un index JSON associe
+chaque URL à son empreinte, sa taille, ses en-têtes de validation (ETag,
+Last-Modified) et sa date de dernier accès. Au-delà de ``max_bytes``, les
+entrées les moins récemment utilisées sont supprimées. Les dates d'accès
+relevées par ``lookup`` sont enregistrées au plus toutes les
+``SAVE_INTERVAL`` secondes : l'ordre LRU survit au redémarrage, à ces
+quelques secondes près.
+
+``lookup`` ne touche jamais au réseau : l'interface l'appelle pour afficher
+immédiatement la copie locale. ``fetch`` (à lancer hors du thread UI)
+télécharge ou revalide la ressource par requête conditionnelle ; en cas
+d'erreur réseau, la copie locale, même ancienne, reste servie.
+
+Un navigateur ne peut pas lire un chemin du serveur : en mode web, le cache
+est rangé sous le dossier `assets_dir` servi par Flet et ``src`` donne le
+chemin relatif à ce dossier.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+
+from storage import default_storage_dir
+
+# Délai minimal entre deux enregistrements de l'index dus aux seuls accès
+SAVE_INTERVAL = 30.0
+
+
+def _write_atomic(path, data):
+    # Nom temporaire unique : plusieurs sessions peuvent écrire le même fichier en même temps
+    with tempfile.NamedTemporaryFile(dir=os.path.dirname(path), delete=False) as f:
+        f.write(data)
+    try:
+        os.replace(f.name, path)
+    except OSError:
+        os.remove(f.name)
+        raise
+
+
+class AssetCache:
+    def __init__(self, root=None, max_bytes=32 * 1024 * 1024, max_age=7 * 24 * 3600, timeout=10.0, assets_dir=None):
+        self.root = root or os.path.join(default_storage_dir(), "assets")
+        # Dossier servi par Flet (ft.app(assets_dir=...)) qui contient root, en mode web
+        self.assets_dir = assets_dir
+        self.index_path = os.path.join(self.root, "index.json")
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._index = self._load_index()
+        self._saved_at = time.monotonic()
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, encoding="utf-8") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        # Entrées dont le fichier a disparu (nettoyage manuel, stockage vidé)
+        return {url: entry for url, entry in index.items() if os.path.exists(self.blob_path(entry["hash"]))}
+
+    def _save_index(self):
+        os.makedirs(self.root, exist_ok=True)
+        _write_atomic(self.index_path, json.dumps(self._index).encode("utf-8"))
+        self._saved_at = time.monotonic()
+
+    def blob_path(self, digest):
+        return os.path.join(self.root, "blobs", digest[:2], digest)
+
+    def src(self, path):
+        """Source d'image Flet d'un fichier du cache : chemin local, ou relatif à assets_dir en mode web"""
+        if path is None or self.assets_dir is None:
+            return path
+        return "/" + os.path.relpath(path, self.assets_dir).replace(os.sep, "/")
+
+    @property
+    def total_bytes(self):
+        # Un même contenu n'est compté qu'une fois
+        return sum({entry["hash"]: entry["size"] for entry in self._index.values()}.values())
+
+    def lookup(self, url):
+        """Chemin local de la ressource si elle est en cache, sans accès réseau"""
+        with self._lock:
+            entry = self._index.get(url)
+            if entry is None:
+                return None
+            entry["last_access"] = time.time()
+            if time.monotonic() - self._saved_at >= SAVE_INTERVAL:
+                try:
+                    self._save_index()
+                except OSError:
+                    # Simple date d'accès : la copie locale reste servie
+                    pass
+            return self.blob_path(entry["hash"])
+
+    def fetch(self, url):
+        """Chemin local de la ressource, téléchargée ou revalidée si nécessaire (bloquant)"""
+        with self._lock:
+            entry = dict(self._index.get(url) or {})
+        if entry and time.time() - entry["validated_at"] < self.max_age:
+            return self.lookup(url)
+
+        request = urllib.request.Request(url, headers={"User-Agent": "SmartTraining"})
+        if entry.get("etag"):
+            request.add_header("If-None-Match", entry["etag"])
+        if entry.get("last_modified"):
+            request.add_header("If-Modified-Since", entry["last_modified"])
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                data = response.read()
+                headers = response.headers
+        except urllib.error.HTTPError as e:
+            if e.code != 304:
+                return self.lookup(url)
+            # Inchangée côté serveur : on prolonge simplement la validité
+            with self._lock:
+                if url in self._index:
+                    self._index[url]["validated_at"] = time.time()
+                    self._save_index()
+            return self.lookup(url)
+        except (urllib.error.URLError, OSError):
+            return self.lookup(url)
+        return self.store(url, data, etag=headers.get("ETag"), last_modified=headers.get("Last-Modified"))
+
+    def store(self, url, data, etag=None, last_modified=None):
+        """Ajoute un contenu au cache et renvoie son chemin local"""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.blob_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            _write_atomic(path, data)
+        now = time.time()
+        with self._lock:
+            previous = self._index.get(url)
+            self._index[url] = {
+                "hash": digest,
+                "size": len(data),
+                "etag": etag,
+                "last_modified": last_modified,
+                "validated_at": now,
+                "last_access": now,
+            }
+            if previous and previous["hash"] != digest:
+                self._release(previous["hash"])
+            self._evict(keep=url)
+            self._save_index()
+        return path
+
+    def _release(self, digest):
+        # Supprime le fichier s'il n'est plus référencé par aucune URL
+        if not any(entry["hash"] == digest for entry in self._index.values()):
+            try:
+                os.remove(self.blob_path(digest))
+            except OSError:
+                pass
+
+    def _evict(self, keep=None):
+        """Supprime les entrées les moins récemment utilisées jusqu'à passer sous max_bytes"""
+        by_access = sorted(self._index.items(), key=lambda item: item[1]["last_access"])
+        total = self.total_bytes
+        for url, entry in by_access:
+            if total <= self.max_bytes:
+                break
+            if url == keep:
+                continue
+            del self._index[url]
+            if not any(other["hash"] == entry["hash"] for other in self._index.values()):
+                total -= entry["size"]
+            self._release(entry["hash"])
@@ -0,0 +1,93 @@
+"""Graphique d'activité : coût d'un rendu selon la plage affichée et la largeur.
+
+Historique simulé (dix ans de séances) dans un ``StatsEngine`` ; pour chaque
+vue et chaque plage on mesure le rendu de ``ActivityChart`` (formes, éléments
+de tracé, requêtes à la source, octets envoyés) et on le compare au nombre de
+contrôles qu'aurait un graphique en barres construit en contrôles Flet
+(quatre contrôles par jour, plus la colonne).
+
+    python benchmarks/bench_activity_chart.py --widths 300 1200
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from headless import count_controls, make_headless_page
+
+from activity_chart import ActivityChart
+from stats_engine import StatsEngine
+
+VIEWS = [("bar", 7), ("bar", 30), ("line", 365), ("line", 3650), ("heatmap", 371), ("heatmap", 3650)]
+
+
+def engine(years=10, seed=2025):
+    rng = random.Random(seed)
+    stats = StatsEngine()
+    today = date.today()
+    for day in range(365 * years):
+        if rng.random() < 0.6:
+            stats.add_session({
+                "date": (today - timedelta(days=day)).isoformat(),
+                "sport": "Course",
+                "minutes": rng.randint(10, 90),
+                "calories": 0,
+            })
+    return stats
+
+
+def measure(stats, width, mode, days, repeat):
+    page, connection = make_headless_page(f"chart-{width}-{mode}-{days}")
+    chart = ActivityChart(stats.range_sum, width=width, goal=45)
+    page.add(chart.canvas)
+    start = date.today().toordinal() - days + 1
+    timings = []
+    for _ in range(repeat):
+        queries = chart.queries
+        started = time.perf_counter()
+        chart.show(mode, start, days)
+        timings.append((time.perf_counter() - started) * 1000)
+    sent = connection.payload_bytes
+    chart.canvas.update()
+    return {
+        "width": width,
+        "mode": mode,
+        "days": days,
+        "render_ms": round(statistics.median(timings), 3),
+        "queries": chart.queries - queries,
+        "controls": count_controls(chart.canvas),
+        "path_elements": sum(len(getattr(shape, "elements", None) or ()) for shape in chart.canvas.shapes),
+        "payload_bytes": connection.payload_bytes - sent,
+        "control_chart_controls": 5 * days + 1,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--widths", type=int, nargs="+", default=[300, 1200])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    stats = engine()
+    results = [
+        measure(stats, width, mode, days, args.repeat)
+        for width in args.widths for mode, days in VIEWS
+    ]
+    for result in results:
+        print(
+            f"{result['width']:>5} px  {result['mode']:<8} {result['days']:>5} jours  "
+            f"rendu {result['render_ms']:>6.2f} ms  {result['queries']:>4} requêtes  "
+            f"{result['controls']:>2} contrôles ({result['path_elements']} éléments, {result['payload_bytes']} octets)  "
+            f"en contrôles Flet : {result['control_chart_controls']}"
+        )
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Calories : recalcul d'un historique complet après un changement de table MET.
+
+Historique simulé de `users` profils (poids différents, séances découpées en
+1 à 3 segments d'intensité) ; on compare ``batch_calories`` (une passe NumPy
+sur les segments) à ``session_calories`` appelé séance par séance.
+
+    python benchmarks/bench_calories.py --users 1000 10000 --sessions 200
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from calories import INTENSITIES, MET_TABLE, batch_calories, session_calories
+
+SPORTS = list(MET_TABLE) + ["Libre"]
+
+
+def history(users, sessions, seed=2025):
+    """Segments en colonnes : séance, profil, sport, minutes, intensité ; poids par profil"""
+    rng = np.random.default_rng(seed)
+    count = users * sessions
+    session_users = rng.integers(0, users, count)
+    session_sports = rng.integers(0, len(SPORTS), count)
+    per_session = rng.integers(1, 4, count)
+    segment_sessions = np.repeat(np.arange(count), per_session)
+    return {
+        "sessions": segment_sessions,
+        "users": session_users[segment_sessions],
+        "sports": session_sports[segment_sessions],
+        "minutes": np.round(rng.uniform(2, 40, len(segment_sessions)), 2),
+        "intensities": rng.integers(0, len(INTENSITIES), len(segment_sessions)),
+        "weights": np.round(rng.uniform(45, 110, users), 1),
+        "count": count,
+    }
+
+
+def loop_calories(columns):
+    """Référence : segments regroupés par séance puis ``session_calories``"""
+    segments = {}
+    sports = {}
+    for session, user, sport, minutes, intensity in zip(
+        columns["sessions"].tolist(), columns["users"].tolist(), columns["sports"].tolist(),
+        columns["minutes"].tolist(), columns["intensities"].tolist(),
+    ):
+        segments.setdefault(session, []).append((minutes, intensity))
+        sports[session] = (SPORTS[sport], user)
+    weights = columns["weights"].tolist()
+    return [
+        session_calories(sports[session][0], weight=weights[sports[session][1]], segments=segments[session])
+        for session in range(columns["count"])
+    ]
+
+
+def measure(users, sessions):
+    columns = history(users, sessions)
+    started = time.perf_counter()
+    per_session = batch_calories(
+        columns["sports"], columns["minutes"], columns["weights"][columns["users"]], columns["intensities"],
+        SPORTS, sessions=columns["sessions"], session_count=columns["count"],
+    )
+    lifetime = np.bincount(columns["users"], weights=batch_calories(
+        columns["sports"], columns["minutes"], columns["weights"][columns["users"]], columns["intensities"], SPORTS,
+    ), minlength=users)
+    batch_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    expected = loop_calories(columns)
+    loop_s = time.perf_counter() - started
+    assert per_session.tolist() == expected
+    return {
+        "users": users,
+        "sessions": columns["count"],
+        "segments": len(columns["sessions"]),
+        "batch_ms": round(batch_s * 1000, 2),
+        "loop_ms": round(loop_s * 1000, 2),
+        "speedup": round(loop_s / batch_s, 1),
+        "mean_lifetime_kcal": int(lifetime.mean()),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, nargs="+", default=[1000, 10_000])
+    parser.add_argument("--sessions", type=int, default=200, help="séances par profil en moyenne")
+    args = parser.parse_args()
+
+    results = [measure(users, args.sessions) for users in args.users]
+    for result in results:
+        print(
+            f"{result['users']:>7} profils ({result['sessions']} séances, {result['segments']} segments)  "
+            f"vectorisé {result['batch_ms']:>8.2f} ms  boucle {result['loop_ms']:>9.2f} ms  (x{result['speedup']})"
+        )
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
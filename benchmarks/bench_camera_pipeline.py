@@ -0,0 +1,46 @@
+"""Mesure du pipeline caméra sans écran : latence de bout en bout et cadence atteinte.
+
+    python benchmarks/bench_camera_pipeline.py --fps 30 --cost-ms 20 --seconds 5
+    python benchmarks/bench_camera_pipeline.py --video clip.mp4
+"""
+import argparse
+import functools
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from camera_pipeline import FramePipeline, SyntheticFrameSource, SyntheticPoseEstimator, VideoSource
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--cost-ms", type=float, default=10.0, help="coût simulé de l'inférence")
+    parser.add_argument("--worker", choices=("process", "thread"), default="process")
+    parser.add_argument("--video", help="fichier vidéo à la place de la source synthétique")
+    args = parser.parse_args()
+
+    if args.video:
+        source = VideoSource(args.video)
+    else:
+        source = SyntheticFrameSource(fps=args.fps, count=int(args.fps * args.seconds))
+    estimator = functools.partial(SyntheticPoseEstimator, cost_ms=args.cost_ms)
+
+    pipeline = FramePipeline(source, estimator, worker=args.worker).start()
+    started = time.monotonic()
+    pipeline.wait()
+    elapsed = time.monotonic() - started
+    time.sleep(0.2)
+    pipeline.stop()
+
+    stats = pipeline.stats()
+    stats["seconds"] = round(elapsed, 2)
+    print(json.dumps(stats, indent=2))
+
+
+if __name__ == "__main__":
+    main()
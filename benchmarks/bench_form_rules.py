@@ -0,0 +1,74 @@
+"""Coût d'évaluation des règles de forme selon leur nombre.
+
+Deux familles de règles aléatoires : « bornées », dont les conditions portent
+sur les angles et un jeu fixe de paires de points (comme les règles réelles,
+le nombre de grandeurs distinctes plafonne), et « libres », où chaque règle
+peut introduire une nouvelle paire (les grandeurs croissent avec les règles).
+Le coût ne doit presque pas dépendre du nombre de règles dans le premier cas ;
+dans le second, il suit le nombre de grandeurs à calculer.
+
+    python benchmarks/bench_form_rules.py --frames 30000 --batch 15
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_rep_counter import synthetic_landmarks
+from form_rules import FormChecker
+from pose_analysis import ANGLE_NAMES, LANDMARKS
+
+
+def random_rules(count, seed=0, pairs=None):
+    """Règles aléatoires ; `pairs` : taille du jeu de paires de points (None : paires libres)"""
+    rng = random.Random(seed)
+    points = list(LANDMARKS)
+    pool = [(rng.choice(points), rng.choice(points)) for _ in range(pairs or 0)]
+    rules = []
+    for i in range(count):
+        conditions = [f"{rng.choice(ANGLE_NAMES)} {rng.choice('<>')} {rng.randint(30, 170)}" for _ in range(2)]
+        above, below = rng.choice(pool) if pool else (rng.choice(points), rng.choice(points))
+        conditions.append(f"{above} {rng.choice(('above', 'below'))} {below}")
+        rules.append({"id": f"r{i}", "message": f"Règle {i}", "when": conditions})
+    return rules
+
+
+def measure(landmarks, args, rules, family):
+    checker = FormChecker(rules)
+    events = 0
+    started = time.perf_counter()
+    for start in range(0, args.frames, args.batch):
+        events += len(checker.update(landmarks[start:start + args.batch], now=start / 30))
+    elapsed = time.perf_counter() - started
+    return {
+        "family": family,
+        "rules": len(rules),
+        "features": len(checker.compiled.features),
+        "frames_per_second": round(args.frames / elapsed),
+        "us_per_batch": round(elapsed / (args.frames / args.batch) * 1e6, 1),
+        "events": events,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--frames", type=int, default=30000)
+    parser.add_argument("--batch", type=int, default=15)
+    args = parser.parse_args()
+
+    landmarks, _ = synthetic_landmarks(args.frames)
+    results = []
+    for family, pairs in (("bornées", 8), ("libres", None)):
+        for count in (10, 50, 100, 300, 500):
+            results.append(measure(landmarks, args, random_rules(count, pairs=pairs), family))
+    for r in results:
+        print(f"{r['family']:<8} {r['rules']:>4} règles  {r['features']:>4} grandeurs  {r['us_per_batch']:>7.1f} µs/lot")
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
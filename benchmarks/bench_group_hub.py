@@ -0,0 +1,126 @@
+"""Charge du hub de groupe : combien de salles un cœur peut servir.
+
+Le hub tourne seul dans un processus (un cœur au plus, boucle asyncio unique) ;
+ce processus-ci ouvre `participants` clients par salle sur localhost, chacun
+envoyant son état à chaque tick. Pour chaque nombre de salles : CPU consommé
+par le hub (temps processus / temps écoulé), temps passé dans les ticks,
+ticks en retard, messages et octets envoyés. La capacité estimée est le
+nombre de salles pour lequel le hub occuperait 100 % d'un cœur.
+
+Sur une machine à un seul cœur, les clients se partagent le même cœur que le
+hub : les ticks en retard mesurent alors aussi la charge des clients.
+
+    python benchmarks/bench_group_hub.py --rooms 10 50 100 --seconds 3
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from group_hub import MAX_PARTICIPANTS, TICK_INTERVAL, GroupClient, GroupHub
+
+
+def run_hub(pipe, tick_interval):
+    async def serve():
+        hub = GroupHub(port=0, tick_interval=tick_interval)
+        pipe.send(await hub.start())
+        loop = asyncio.get_running_loop()
+        while await loop.run_in_executor(None, pipe.recv) == "stats":
+            pipe.send({**hub.stats(), "cpu_s": time.process_time(), "wall_s": time.perf_counter()})
+        await hub.stop()
+
+    asyncio.run(serve())
+
+
+def participant_state(rng):
+    state = {"r": 0, "tm": 0, "s": 0}
+
+    def next_state():
+        state["r"] += rng.random() < 0.3
+        state["tm"] += 1
+        state["s"] += rng.randint(0, 5)
+        return state
+    return next_state
+
+
+async def load(url, rooms, participants, seconds, tick_interval, hub):
+    rng = random.Random(0)
+    clients = [
+        GroupClient(url, f"salle-{room}", f"p{index}", state=participant_state(rng), tick_interval=tick_interval)
+        for room in range(rooms)
+        for index in range(participants)
+    ]
+    tasks = [asyncio.create_task(client.run()) for client in clients]
+    # Tous les clients connectés avant la mesure
+    while sum(client.id is not None for client in clients) < len(clients):
+        await asyncio.sleep(0.05)
+    before = await hub("stats")
+    await asyncio.sleep(seconds)
+    after = await hub("stats")
+    for client in clients:
+        await client.close()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return before, after
+
+
+def measure(rooms, participants, seconds, tick_interval):
+    parent, child = multiprocessing.Pipe()
+    process = multiprocessing.Process(target=run_hub, args=(child, tick_interval), daemon=True)
+    process.start()
+    port = parent.recv()
+
+    async def hub(command):
+        parent.send(command)
+        return await asyncio.get_running_loop().run_in_executor(None, parent.recv)
+
+    before, after = asyncio.run(load(f"ws://127.0.0.1:{port}", rooms, participants, seconds, tick_interval, hub))
+    parent.send("stop")
+    process.join(5)
+
+    wall = after["wall_s"] - before["wall_s"]
+    cpu = after["cpu_s"] - before["cpu_s"]
+    ticks = after["ticks"] - before["ticks"]
+    messages = after["messages_sent"] - before["messages_sent"]
+    return {
+        "rooms": rooms,
+        "clients": rooms * participants,
+        "hub_cpu_pct": round(100 * cpu / wall, 1),
+        "tick_ms": round(1000 * (after["tick_busy_s"] - before["tick_busy_s"]) / max(ticks, 1), 3),
+        "overruns": after["overruns"] - before["overruns"],
+        "updates_per_s": round((after["updates_received"] - before["updates_received"]) / wall),
+        "messages_per_s": round(messages / wall),
+        "bytes_per_message": round((after["bytes_sent"] - before["bytes_sent"]) / max(messages, 1), 1),
+        "dropped": after["dropped"] - before["dropped"],
+        "rooms_per_core": round(rooms * wall / cpu) if cpu else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rooms", type=int, nargs="+", default=[10, 50, 100])
+    parser.add_argument("--participants", type=int, default=MAX_PARTICIPANTS)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--tick", type=float, default=TICK_INTERVAL)
+    args = parser.parse_args()
+
+    results = []
+    for rooms in args.rooms:
+        result = measure(rooms, args.participants, args.seconds, args.tick)
+        results.append(result)
+        print(
+            f"{result['rooms']:>5} salles {result['clients']:>6} clients  CPU hub {result['hub_cpu_pct']:>5.1f} %  "
+            f"tick {result['tick_ms']:>7.3f} ms  {result['overruns']} en retard  "
+            f"{result['messages_per_s']:>6} msg/s ({result['bytes_per_message']} o)  "
+            f"≈ {result['rooms_per_core']} salles/cœur"
+        )
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Historique : débit d'export/import et mémoire, en CSV et en binaire colonnaire.
+
+Un ``history.jsonl`` simulé de `records` séances est exporté puis relu dans
+chaque format ; on mesure le débit (séances/s) et la taille des fichiers,
+puis, dans un second passage sous tracemalloc (plus lent), le pic de mémoire,
+qui ne doit dépendre que de `--chunk-size`.
+
+    python benchmarks/bench_history_io.py --records 100000 1000000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from calories import INTENSITIES
+from history_io import chunked, export_history, import_history, write_jsonl
+
+SPORTS = ["Judo", "Yoga", "Musculation", "Karaté", "Course", "Natation", "Libre"]
+
+
+def simulated(records, seed=2025):
+    """Séances générées une à une (jamais toutes en mémoire)"""
+    rng = random.Random(seed)
+    day = date.today() - timedelta(days=records // 2)
+    for _ in range(records):
+        day += timedelta(days=rng.random() < 0.5)
+        start = datetime.combine(day, datetime.min.time()) + timedelta(seconds=rng.randrange(6 * 3600, 22 * 3600))
+        minutes = rng.randint(10, 90)
+        segments = [[round(minutes / 2, 2), rng.choice(INTENSITIES)], [minutes - round(minutes / 2, 2), rng.choice(INTENSITIES)]]
+        yield {
+            "date": day.isoformat(),
+            "start": start.isoformat(timespec="seconds"),
+            "sport": rng.choice(SPORTS),
+            "minutes": minutes,
+            "calories": rng.randint(50, 900),
+            "segments": segments,
+        }
+
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - started
+
+
+def peak_memory(fn):
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def measure(records, chunk_size, folder):
+    source = os.path.join(folder, f"history-{records}.jsonl")
+    if not os.path.exists(source):
+        write_jsonl(chunked(simulated(records), chunk_size), source)
+    results = {"records": records, "jsonl_mb": round(os.path.getsize(source) / 2**20, 1)}
+    for suffix in (".csv", ".sth"):
+        path = os.path.join(folder, f"history-{records}{suffix}")
+        export = lambda: export_history(source, path, chunk_size)
+        load = lambda: sum(len(chunk) for chunk in import_history(path, chunk_size))
+        count, export_s = timed(export)
+        assert count == records
+        imported, import_s = timed(load)
+        assert imported == records
+        peak = max(peak_memory(export), peak_memory(load))
+        name = suffix[1:]
+        results[name] = {
+            "mb": round(os.path.getsize(path) / 2**20, 2),
+            "export_per_s": int(records / export_s),
+            "import_per_s": int(records / import_s),
+            "roundtrip_s": round(export_s + import_s, 2),
+            "peak_mb": round(peak / 2**20, 2),
+        }
+        os.remove(path)
+
+    # Vérification de l'aller-retour sur les premières séances
+    for suffix in (".csv", ".sth"):
+        path = os.path.join(folder, f"check{suffix}")
+        first = list(next(chunked(simulated(records), chunk_size)))
+        sample = os.path.join(folder, "check.jsonl")
+        with open(sample, "w", encoding="utf-8") as f:
+            f.write("".join(json.dumps(record, ensure_ascii=False) + "\n" for record in first))
+        export_history(sample, path, chunk_size)
+        assert [record for chunk in import_history(path, chunk_size) for record in chunk] == first
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--chunk-size", type=int, default=10_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        results = [measure(records, args.chunk_size, folder) for records in args.records]
+    for result in results:
+        print(f"{result['records']:>8} séances (jsonl {result['jsonl_mb']} Mo)")
+        for name in ("csv", "sth"):
+            r = result[name]
+            print(
+                f"    {name:<4} {r['mb']:>7.2f} Mo  export {r['export_per_s']:>8} séances/s  "
+                f"import {r['import_per_s']:>8} séances/s  aller-retour {r['roundtrip_s']:>6.2f} s  "
+                f"pic mémoire {r['peak_mb']:.2f} Mo"
+            )
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Classement d'un million de joueurs : construction, mises à jour, rangs, podium, voisinage.
+
+    python benchmarks/bench_leaderboard.py --players 1000000 --operations 100000
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from leaderboard import MAX_SCORE, local_community
+
+
+def timed_ops(operation, arguments):
+    """Durée par appel (µs) : médiane et p99"""
+    samples = []
+    for argument in arguments:
+        started = time.perf_counter()
+        operation(argument)
+        samples.append((time.perf_counter() - started) * 1e6)
+    samples.sort()
+    return {
+        "count": len(samples),
+        "p50_us": round(statistics.median(samples), 2),
+        "p99_us": round(samples[int(len(samples) * 0.99) - 1], 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--players", type=int, default=1_000_000)
+    parser.add_argument("--operations", type=int, default=100_000)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    boards = local_community(args.players)
+    build_s = time.perf_counter() - started
+    board = boards.all_time
+
+    rng = random.Random(1)
+    users = [f"joueur-{rng.randrange(args.players)}" for _ in range(args.operations)]
+    results = {
+        "players": len(board),
+        "build_s": round(build_s, 2),
+        "add": timed_ops(lambda user: board.add(user, rng.randint(10, 90)), users),
+        "set": timed_ops(lambda user: board.set(user, rng.randrange(MAX_SCORE // 10)), users),
+        "rank": timed_ops(board.rank, users),
+        "top_10": timed_ops(lambda _: board.top(10), range(args.operations // 10)),
+        "around_2": timed_ops(lambda user: board.around(user, 2), users[: args.operations // 10]),
+        "window_50": timed_ops(lambda start: board.window(start, 50), [rng.randrange(1, len(board)) for _ in range(args.operations // 10)]),
+        "submit": timed_ops(lambda user: boards.submit(user, 30), users[: args.operations // 10]),
+    }
+    for name, stats in results.items():
+        if isinstance(stats, dict):
+            print(f"{name:<10} {stats['p50_us']:>8.2f} µs (p99 {stats['p99_us']:>8.2f} µs)  × {stats['count']}")
+    print(f"{results['players']} joueurs, construction {results['build_s']} s")
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
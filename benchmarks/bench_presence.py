@@ -0,0 +1,93 @@
+"""Présence : coût des battements de cœur et de l'expiration selon le nombre d'utilisateurs en ligne.
+
+Temps simulé (horloge fournie) : chaque utilisateur bat toutes les
+`interval` secondes environ, et chaque seconde `churn` des utilisateurs
+partent sans prévenir (remplacés par de nouveaux). On compare ``expire``
+(roue temporelle) au parcours de tous les utilisateurs à chaque tick.
+
+    python benchmarks/bench_presence.py --users 10000 100000 --seconds 60
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from presence import Presence
+
+SPORTS = ["Judo", "Yoga", "Musculation", "Karaté", "Course", "Natation"]
+
+
+def measure(users, seconds, interval, churn, ttl):
+    rng = random.Random(users)
+    presence = Presence(ttl)
+    deadlines = {}
+    active = list(range(users))
+    next_user = users
+    # Démarrage étalé sur un intervalle, comme des connexions réelles
+    for user in active:
+        at = rng.random() * interval
+        presence.heartbeat(user, room=user % 1000, sport=SPORTS[user % len(SPORTS)], now=at)
+        deadlines[user] = at + ttl
+    heartbeat_s = expire_s = scan_s = 0.0
+    heartbeats = expired = 0
+    for second in range(int(interval) + 1, int(interval) + 1 + seconds):
+        # Départs silencieux remplacés par des arrivées
+        for _ in range(int(len(active) * churn)):
+            active[rng.randrange(len(active))] = next_user
+            next_user += 1
+        batch = [user for user in active if rng.random() < 1 / interval]
+        now = float(second)
+        started = time.perf_counter()
+        for user in batch:
+            presence.heartbeat(user, room=user % 1000, sport=SPORTS[user % len(SPORTS)], now=now)
+        heartbeat_s += time.perf_counter() - started
+        heartbeats += len(batch)
+        for user in batch:
+            deadlines[user] = now + ttl
+
+        started = time.perf_counter()
+        expired += len(presence.expire(now))
+        expire_s += time.perf_counter() - started
+
+        # Référence : parcours complet des échéances
+        started = time.perf_counter()
+        gone = [user for user, deadline in deadlines.items() if deadline <= now]
+        for user in gone:
+            del deadlines[user]
+        scan_s += time.perf_counter() - started
+    return {
+        "users": users,
+        "online": len(presence),
+        "heartbeat_us": round(heartbeat_s / max(heartbeats, 1) * 1e6, 3),
+        "expire_ms_per_tick": round(expire_s / seconds * 1000, 3),
+        "expire_us_per_user": round(expire_s / max(expired, 1) * 1e6, 3),
+        "scan_ms_per_tick": round(scan_s / seconds * 1000, 3),
+        "expired": expired,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, nargs="+", default=[1000, 10_000, 100_000])
+    parser.add_argument("--seconds", type=int, default=60)
+    parser.add_argument("--interval", type=float, default=5.0, help="période des battements (s)")
+    parser.add_argument("--churn", type=float, default=0.01, help="part des utilisateurs qui partent chaque seconde")
+    parser.add_argument("--ttl", type=float, default=15.0)
+    args = parser.parse_args()
+
+    results = [measure(users, args.seconds, args.interval, args.churn, args.ttl) for users in args.users]
+    for result in results:
+        print(
+            f"{result['users']:>7} utilisateurs  battement {result['heartbeat_us']:>6.3f} µs  "
+            f"expiration {result['expire_ms_per_tick']:>7.3f} ms/tick ({result['expire_us_per_user']:.3f} µs/expiré)  "
+            f"parcours complet {result['scan_ms_per_tick']:>7.3f} ms/tick"
+        )
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
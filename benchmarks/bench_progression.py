@@ -0,0 +1,97 @@
+"""Progression : recalcul de l'XP et des niveaux de tous les profils après un changement de courbe.
+
+Historique simulé (`users` profils, `sessions` séances chacun en moyenne) ;
+on compare ``recompute`` (une passe NumPy) à une boucle Python qui cumule
+l'XP séance par séance puis cherche les niveaux avec ``Curve.level``.
+
+    python benchmarks/bench_progression.py --users 1000 10000 --sessions 200
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from progression import GLOBAL_CURVE, curve_for, recompute, session_xp
+
+SPORTS = ["Judo", "Yoga", "Musculation", "Karaté", "Course", "Natation"]
+
+
+def history(users, sessions, seed=2025):
+    rng = np.random.default_rng(seed)
+    count = users * sessions
+    return (
+        rng.integers(0, users, count),
+        rng.integers(0, len(SPORTS), count),
+        rng.integers(10, 90, count),
+    )
+
+
+def loop_recompute(users, sports, minutes, user_count):
+    xp = [0] * user_count
+    sport_xp = [[0] * len(SPORTS) for _ in range(user_count)]
+    for user, sport, duration in zip(users, sports, minutes):
+        gained = session_xp(duration)
+        xp[user] += gained
+        sport_xp[user][sport] += gained
+    levels = [GLOBAL_CURVE.level(value) for value in xp]
+    sport_levels = [
+        [curve_for(SPORTS[column]).level(value) for column, value in enumerate(row)]
+        for row in sport_xp
+    ]
+    return xp, levels, sport_levels
+
+
+def measure(users, sessions):
+    columns = history(users, sessions)
+    started = time.perf_counter()
+    result = recompute(*columns, users, SPORTS)
+    vector_s = time.perf_counter() - started
+
+    lists = [column.tolist() for column in columns]
+    started = time.perf_counter()
+    xp, levels, sport_levels = loop_recompute(*lists, users)
+    loop_s = time.perf_counter() - started
+
+    assert result["xp"].tolist() == xp
+    assert result["level"].tolist() == levels
+    assert result["sport_level"].tolist() == sport_levels
+
+    started = time.perf_counter()
+    for value in xp:
+        GLOBAL_CURVE.level(value)
+    lookup_s = time.perf_counter() - started
+    return {
+        "users": users,
+        "sessions": users * sessions,
+        "recompute_ms": round(vector_s * 1000, 2),
+        "loop_ms": round(loop_s * 1000, 2),
+        "speedup": round(loop_s / vector_s, 1),
+        "level_lookup_us": round(lookup_s / users * 1e6, 3),
+        "max_level": int(result["level"].max()),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, nargs="+", default=[1000, 10_000])
+    parser.add_argument("--sessions", type=int, default=200, help="séances par profil en moyenne")
+    args = parser.parse_args()
+
+    results = [measure(users, args.sessions) for users in args.users]
+    for result in results:
+        print(
+            f"{result['users']:>7} profils ({result['sessions']} séances)  "
+            f"recompute {result['recompute_ms']:>8.2f} ms  boucle {result['loop_ms']:>9.2f} ms  "
+            f"(x{result['speedup']})  niveau {result['level_lookup_us']:.3f} µs"
+        )
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Débit du moteur d'angles et de comptage des répétitions (images/s).
+
+    python benchmarks/bench_rep_counter.py --frames 90000 --batch 30
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pose_analysis import EXERCISES, LANDMARKS, RepCounter
+
+
+def synthetic_landmarks(frames, reps_per_minute=20, fps=30, seed=0):
+    """Posture synthétique : genoux et coudes qui fléchissent en rythme, avec bruit"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(frames) / fps
+    phase = (1 - np.cos(2 * np.pi * t * reps_per_minute / 60)) / 2  # 0 = debout, 1 = fléchi
+    landmarks = np.zeros((frames, 33, 3), dtype=np.float32)
+    for side, dx in (("left", -0.1), ("right", 0.1)):
+        landmarks[:, LANDMARKS[f"{side}_shoulder"]] = (dx, 0.2, 0)
+        landmarks[:, LANDMARKS[f"{side}_hip"]] = (dx, 0.5, 0)
+        landmarks[:, LANDMARKS[f"{side}_knee"], 0] = dx + 0.25 * np.sin(phase * np.pi / 2)
+        landmarks[:, LANDMARKS[f"{side}_knee"], 1] = 0.5 + 0.25 * np.cos(phase * np.pi / 2)
+        landmarks[:, LANDMARKS[f"{side}_ankle"]] = (dx, 1.0, 0)
+        landmarks[:, LANDMARKS[f"{side}_elbow"]] = (dx, 0.45, 0)
+        landmarks[:, LANDMARKS[f"{side}_wrist"], 0] = dx + 0.25 * np.sin(phase * 2.2)
+        landmarks[:, LANDMARKS[f"{side}_wrist"], 1] = 0.45 + 0.25 * np.cos(phase * 2.2)
+    landmarks += rng.normal(0, 0.003, landmarks.shape).astype(np.float32)
+    expected = int(t[-1] * reps_per_minute / 60) if frames else 0
+    return landmarks, expected
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--frames", type=int, default=90000)
+    parser.add_argument("--batch", type=int, default=30)
+    args = parser.parse_args()
+
+    landmarks, expected = synthetic_landmarks(args.frames)
+    counter = RepCounter(tuple(EXERCISES))
+    started = time.perf_counter()
+    for start in range(0, args.frames, args.batch):
+        counter.update(landmarks[start:start + args.batch])
+    elapsed = time.perf_counter() - started
+
+    print(json.dumps({
+        "frames": args.frames,
+        "batch": args.batch,
+        "exercises": len(EXERCISES),
+        "frames_per_second": round(args.frames / elapsed),
+        "expected_squat_reps": expected,
+        "counts": counter.as_dict(),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
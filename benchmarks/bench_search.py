@@ -0,0 +1,64 @@
+"""Latence de la recherche au fil de la frappe sur un grand catalogue.
+
+Chaque requête est tapée lettre par lettre ; on mesure chaque frappe, ainsi
+que la construction de l'index et son rechargement depuis le disque.
+
+    python benchmarks/bench_search.py --entries 10000
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from bench_sports_grid import synthetic_catalog
+
+from search_index import SearchIndex
+
+QUERIES = ["karate", "musculation fessiers", "squat", "epaules", "natation crawl", "yoga equilibre", "tractions dos"]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--entries", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    entries = synthetic_catalog(args.entries).entries
+    started = time.perf_counter()
+    index = SearchIndex(entries)
+    build_ms = (time.perf_counter() - started) * 1000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "search_index.pickle")
+        index.save(path)
+        started = time.perf_counter()
+        SearchIndex.load_or_build(entries, path)
+        load_ms = (time.perf_counter() - started) * 1000
+
+    keystrokes = []
+    for _ in range(args.repeat):
+        for query in QUERIES:
+            index.matches("")
+            for end in range(1, len(query) + 1):
+                started = time.perf_counter()
+                index.search(query[:end])
+                keystrokes.append((time.perf_counter() - started) * 1000)
+    keystrokes.sort()
+    result = {
+        "entries": args.entries,
+        "terms": len(index.terms),
+        "build_ms": round(build_ms, 1),
+        "load_ms": round(load_ms, 1),
+        "keystroke_ms_p50": round(statistics.median(keystrokes), 3),
+        "keystroke_ms_p95": round(keystrokes[int(len(keystrokes) * 0.95)], 3),
+        "keystroke_ms_max": round(keystrokes[-1], 3),
+    }
+    print(json.dumps(result))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
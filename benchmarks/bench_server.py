@@ -0,0 +1,109 @@
+"""Mémoire par client connecté : sessions isolées contre mode serveur (server.py).
+
+Chaque session est une SmartTrainingApp sur une page sans rendu, avec son
+propre dossier de données ; toutes les sessions visitent chaque écran. On
+mesure la mémoire Python allouée par session (tracemalloc) une fois les
+sessions ouvertes, après la visite de tous les écrans, puis après la
+libération des écrans des sessions inactives (mode serveur uniquement).
+
+    python benchmarks/bench_server.py --sessions 20
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from headless import make_headless_page
+
+import main1
+from server import SessionRegistry, SharedResources
+from storage import JournalStore
+
+SCREENS = len(main1.SCREEN_TITLES)
+
+
+def settle(apps):
+    for app in apps:
+        app.startup_done.wait(10)
+        app.assets_loaded.wait(15)
+        app.ensure_search_index()
+        app.ensure_leaderboards()
+
+
+def traced_kb():
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0] / 1024
+
+
+def measure(mode, sessions, root):
+    shared = registry = None
+    if mode == "serveur":
+        shared = SharedResources(root, assets_dir=os.path.join(root, "assets"))
+        shared.search_index()
+        shared.leaderboards()
+        registry = SessionRegistry(idle_after=0)
+    tracemalloc.start()
+    before = traced_kb()
+    apps = []
+    for index in range(sessions):
+        page, _ = make_headless_page(f"session-{index}")
+        if shared:
+            app = main1.SmartTrainingApp(
+                page, store=shared.open_store(f"{index:032x}"), shared=shared, player_id=f"{index:032x}"
+            )
+            registry.add(app)
+        else:
+            app = main1.SmartTrainingApp(page, store=JournalStore(os.path.join(root, f"user-{index}")))
+        apps.append(app)
+    settle(apps)
+    opened = traced_kb()
+    for app in apps:
+        for screen in range(1, SCREENS):
+            app.go_to(screen)
+        app.go_to(0)
+    visited = traced_kb()
+    result = {
+        "mode": mode,
+        "sessions": sessions,
+        "opened_kb": round((opened - before) / sessions, 1),
+        "all_screens_kb": round((visited - before) / sessions, 1),
+    }
+    if registry:
+        registry.trim_idle(time.monotonic() + 1)
+        # Les écrans retirés quittent l'index de la page avec la mise à jour suivante
+        for app in apps:
+            app.updates.flush_now()
+        result["trimmed_kb"] = round((traced_kb() - before) / sessions, 1)
+    tracemalloc.stop()
+    for app in apps:
+        app.close()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=20)
+    args = parser.parse_args()
+
+    results = []
+    for mode in ("isolé", "serveur"):
+        with tempfile.TemporaryDirectory() as root:
+            results.append(measure(mode, args.sessions, root))
+    for result in results:
+        line = (
+            f"{result['mode']:<8} {result['sessions']} sessions  ouverte {result['opened_kb']:>8.1f} Ko  "
+            f"tous écrans {result['all_screens_kb']:>8.1f} Ko"
+        )
+        if "trimmed_kb" in result:
+            line += f"  après libération {result['trimmed_kb']:>8.1f} Ko"
+        worst = result.get("trimmed_kb", result["all_screens_kb"])
+        print(f"{line}  → ≈ {int(2**20 / worst)} sessions inactives par Go")
+    print(json.dumps(results, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+"""Coût de l'écran Sports selon la taille du catalogue.
+
+Construction de l'écran, premier affichage (diff envoyé) et chargement d'une
+page supplémentaire au défilement, pour des catalogues de 6 à 10 000 entrées.
+Le défilement est simulé jusqu'au bas de la grille, page après page, avec une
+hauteur de rangée fixe ; le coût d'une page ne doit dépendre ni de la taille
+du catalogue ni de la profondeur atteinte.
+
+    python benchmarks/bench_sports_grid.py --sizes 6 600 10000
+"""
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+from headless import count_controls, make_headless_page
+
+import main1
+from catalog import Catalog, builtin_entries
+from storage import JournalStore
+
+
+def synthetic_catalog(size):
+    """Catalogue de `size` entrées obtenu en déclinant le catalogue embarqué"""
+    base = builtin_entries()
+    entries = []
+    for i in range(size):
+        entry = dict(base[i % len(base)])
+        entry["id"] = f"{entry['id']}#{i}"
+        if i >= len(base):
+            entry["title"] = f"{entry['title']} {i // len(base) + 1}"
+        entries.append(entry)
+    return Catalog(entries)
+
+
+ROW_PITCH = 215.0
+VIEWPORT = 800.0
+
+
+def scroll_to_bottom(grid):
+    """Événement de défilement tel que l'enverrait le client, tout en bas du contenu actuel"""
+    padding = grid.view.padding
+    content = padding.top + padding.bottom + grid._rows(len(grid.view.controls)) * ROW_PITCH - grid.spacing
+    extent = max(content - VIEWPORT, 0.0)
+    return SimpleNamespace(pixels=extent, max_scroll_extent=extent, viewport_dimension=VIEWPORT)
+
+
+def measure(size, repeat, pages):
+    with tempfile.TemporaryDirectory() as data_dir:
+        page, connection = make_headless_page()
+        app = main1.SmartTrainingApp(page, store=JournalStore(data_dir), catalog=synthetic_catalog(size))
+        builds = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            app.build_screen(1)
+            builds.append((time.perf_counter() - started) * 1000)
+
+        sent = connection.payload_bytes
+        started = time.perf_counter()
+        app.go_to(1)
+        navigation_ms = (time.perf_counter() - started) * 1000
+        first_payload = connection.payload_bytes - sent
+
+        # Défilement jusqu'en bas de ce qui est chargé : une page de plus à chaque fois
+        grid = app.sports_grid
+        scrolls = []
+        for _ in range(pages):
+            if grid.exhausted:
+                break
+            event = scroll_to_bottom(grid)
+            started = time.perf_counter()
+            grid.on_scroll(event)
+            # La grille passe par l'ordonnanceur : l'envoi fait partie du coût mesuré
+            app.updates.flush_now()
+            scrolls.append((time.perf_counter() - started) * 1000)
+        app.store.close()
+    return {
+        "catalog": size,
+        "build_ms": round(statistics.median(builds), 3),
+        "controls": count_controls(grid.view),
+        "first_payload_bytes": first_payload,
+        "navigation_ms": round(navigation_ms, 3),
+        "scroll_page_ms": round(statistics.median(scrolls), 3) if scrolls else None,
+        # Dernières pages : à comparer aux premières, le coût ne doit pas croître avec la profondeur
+        "deep_scroll_page_ms": round(statistics.median(scrolls[-5:]), 3) if scrolls else None,
+        "loaded": grid.loaded,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[6, 600, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--pages", type=int, default=50, help="pages chargées en défilant")
+    args = parser.parse_args()
+
+    results = [measure(size, args.repeat, args.pages) for size in args.sizes]
+    for r in results:
+        print(
+            f"{r['catalog']:>6} entrées  construction {r['build_ms']:>7.2f} ms  "
+            f"premier affichage {r['navigation_ms']:>7.2f} ms / {r['first_payload_bytes']:>6} o  "
+            f"page suivante {r['scroll_page_ms'] or 0:>6.2f} ms "
+            f"(après {r['loaded']} cartes : {r['deep_scroll_page_ms'] or 0:>6.2f} ms, {r['controls']} contrôles)"
+        )
+    print(json.dumps(results))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+"""Calendrier d'entraînement : séries et cartes d'activité sur des années d'historique.
+
+Historique simulé (un jour sur deux actif en moyenne, par périodes) ; on
+compare ``TrainingCalendar`` (bits d'un entier) à un ensemble de dates
+parcouru jour par jour.
+
+    python benchmarks/bench_streaks.py --years 1 10 30
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from streaks import TrainingCalendar
+
+
+def history(years, seed=2025):
+    rng = random.Random(seed)
+    start = date(2026, 1, 1).toordinal() - 365 * years
+    days = []
+    active = True
+    for ordinal in range(start, start + 365 * years):
+        # Alternance de périodes assidues et de pauses
+        if rng.random() < 0.1:
+            active = not active
+        if rng.random() < (0.85 if active else 0.1):
+            days.append(ordinal)
+    return days
+
+
+def timeit(fn, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1e6
+
+
+def scan_longest(days):
+    best = run = 0
+    for ordinal in range(min(days), max(days) + 1):
+        run = run + 1 if ordinal in days else 0
+        best = max(best, run)
+    return best
+
+
+def measure(years, repeat):
+    days = history(years)
+    active = set(days)
+    calendar = TrainingCalendar()
+    started = time.perf_counter()
+    for ordinal in days:
+        calendar.add(ordinal)
+    add_us = (time.perf_counter() - started) / len(days) * 1e6
+    last = date.fromordinal(max(days))
+    first_of_month = last.replace(day=1)
+
+    assert calendar.longest() == scan_longest(active)
+    return {
+        "years": years,
+        "active_days": len(days),
+        "add_us": round(add_us, 3),
+        "current_us": round(timeit(lambda: calendar.current(last), repeat), 3),
+        "longest_us": round(timeit(calendar.longest, repeat), 3),
+        "longest_scan_us": round(timeit(lambda: scan_longest(active), max(repeat // 100, 1)), 1),
+        "month_us": round(timeit(lambda: calendar.month_active_days(last), repeat), 3),
+        "month_scan_us": round(timeit(
+            lambda: sum(1 for d in range(first_of_month.toordinal(), last.toordinal() + 1) if d in active), repeat
+        ), 3),
+        "heatmap_us": round(timeit(lambda: calendar.heatmap(last.year), max(repeat // 10, 1)), 1),
+        "longest": calendar.longest(),
+        "stored_bytes": len(json.dumps(calendar.to_dict())),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--years", type=int, nargs="+", default=[1, 10, 30])
+    parser.add_argument("--repeat", type=int, default=1000)
+    args = parser.parse_args()
+
+    results = [measure(years, args.repeat) for years in args.years]
+    for result in results:
+        print(
+            f"{result['years']:>3} ans ({result['active_days']} jours actifs)  ajout {result['add_us']:.3f} µs  "
+            f"série {result['current_us']:.3f} µs  plus longue {result['longest_us']:.2f} µs "
+            f"(parcours {result['longest_scan_us']:.0f} µs)  mois {result['month_us']:.2f} µs  "
+            f"carte annuelle {result['heatmap_us']:.0f} µs  {result['stored_bytes']} octets"
+        )
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
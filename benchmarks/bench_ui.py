@@ -0,0 +1,231 @@
+"""Mesures des écrans de SmartTrainingApp sur une page sans rendu.
+
+Pour chaque écran : nombre de contrôles, temps de construction, pic mémoire,
+blocs mémoire retenus ;
+pour chaque transition du menu : latence de navigation et taille du diff ;
+au démarrage : temps jusqu'au premier affichage, en mode rapide et complet ;
+pour des démarrages/arrêts de séance : demandes de mise à jour fusionnées.
+Les résultats sont écrits en JSON et comparés à ui_baseline.json : un écran
+qui dépasse les tolérances fait échouer la commande (code de sortie 1).
+Les durées retenues sont le minimum des `--repeat` mesures (le bruit de la
+machine ne fait qu'ajouter du temps) et une durée n'échoue qu'au-delà d'un
+plancher absolu : ×3 sur 1 ms relève du bruit, pas d'une régression.
+
+    python benchmarks/bench_ui.py                    # mesure + contrôle
+    python benchmarks/bench_ui.py --update-baseline  # accepte les mesures actuelles
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from headless import count_controls, make_headless_page
+
+import main1
+from storage import JournalStore
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BASELINE_PATH = os.path.join(HERE, "ui_baseline.json")
+SCREENS = ["Accueil", "Sports", "Solo IA", "Groupe", "Statistiques", "Paramètres", "À propos"]
+STARTUP_MODES = ["fast", "eager"]
+DEFAULT_TOLERANCES = {
+    "control_count": 1.5, "build_ms": 3.0, "peak_kb": 2.0, "allocations": 1.25, "navigation_ms": 3.0, "time_to_first_frame_ms": 3.0,
+}
+# Seuils absolus (ms) sous lesquels une durée n'est jamais une régression
+DEFAULT_FLOORS = {"build_ms": 10.0, "navigation_ms": 15.0, "time_to_first_frame_ms": 25.0}
+
+
+def make_app(data_dir, startup_mode="eager"):
+    page, connection = make_headless_page()
+    app = main1.SmartTrainingApp(page, store=JournalStore(data_dir), startup_mode=startup_mode)
+    return app, page, connection
+
+
+def settle(app):
+    """Attend la fin du travail lancé après le premier affichage (il fausserait tracemalloc)"""
+    app.startup_done.wait(10)
+    app.assets_loaded.wait(15)
+    app.ensure_search_index()
+    app.ensure_leaderboards()
+
+
+def measure_startup(repeat):
+    startup = {}
+    for mode in STARTUP_MODES:
+        timings = []
+        ready = []
+        for _ in range(repeat):
+            with tempfile.TemporaryDirectory() as data_dir:
+                app, page, connection = make_app(data_dir, startup_mode=mode)
+                timings.append(app.time_to_first_frame)
+                app.startup_done.wait(10)
+                ready.append((time.perf_counter() - app.startup_started) * 1000)
+                # Évite que le travail de fond (avatar, classements) déborde sur la mesure suivante
+                app.assets_loaded.wait(15)
+                app.ensure_leaderboards()
+                app.store.close()
+        startup[mode] = {
+            "time_to_first_frame_ms": round(min(timings), 3),
+            "time_to_ready_ms": round(min(ready), 3),
+        }
+    return startup
+
+
+def measure_screens(app, repeat):
+    screens = {}
+    for index, name in enumerate(SCREENS):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            app.build_screen(index)
+            timings.append((time.perf_counter() - started) * 1000)
+
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        control = app.build_screen(index)
+        _, peak = tracemalloc.get_traced_memory()
+        # Blocs encore alloués une fois l'écran construit (contrôles + styles)
+        retained = tracemalloc.take_snapshot().compare_to(before, "filename")
+        tracemalloc.stop()
+
+        screens[name] = {
+            "control_count": count_controls(control),
+            "build_ms": round(min(timings), 3),
+            "peak_kb": round(peak / 1024, 1),
+            "allocations": sum(stat.count_diff for stat in retained),
+        }
+    return screens
+
+
+def measure_navigation(app, connection, repeat):
+    transitions = {}
+    # Premier passage : tous les écrans en cache
+    for index in range(len(SCREENS)):
+        app.go_to(index)
+    for source in range(len(SCREENS)):
+        for target in range(len(SCREENS)):
+            if source == target:
+                continue
+            timings = []
+            payloads = []
+            for _ in range(repeat):
+                app.go_to(source)
+                sent = connection.payload_bytes
+                started = time.perf_counter()
+                app.go_to(target)
+                timings.append((time.perf_counter() - started) * 1000)
+                payloads.append(connection.payload_bytes - sent)
+            transitions[f"{source}->{target}"] = {
+                "navigation_ms": round(min(timings), 3),
+                "payload_bytes": int(statistics.median(payloads)),
+            }
+    return transitions
+
+
+def measure_updates(app, connection, repeat):
+    """Lots envoyés et demandes fusionnées par l'ordonnanceur sur des démarrages/arrêts de séance"""
+    app.go_to(2)
+    app.updates.flush_now()
+    before = app.updates.stats()
+    batches = connection.batches
+    for _ in range(repeat):
+        app.toggle_session(None)
+        app.toggle_session(None)
+    time.sleep(4 * app.updates.frame_interval)
+    after = app.updates.stats()
+    return {
+        "actions": 2 * repeat,
+        "batches": connection.batches - batches,
+        **{key: after[key] - before[key] for key in after},
+    }
+
+
+def check(results, baseline):
+    """Liste des régressions par rapport à la référence"""
+    tolerances = {**DEFAULT_TOLERANCES, **baseline.get("tolerances", {})}
+    floors = {**DEFAULT_FLOORS, **baseline.get("floors", {})}
+    failures = []
+    sections = (
+        ("screens", ("control_count", "build_ms", "peak_kb", "allocations")),
+        ("transitions", ("navigation_ms",)),
+        ("startup", ("time_to_first_frame_ms",)),
+    )
+    for section, metrics in sections:
+        for key, reference in baseline.get(section, {}).items():
+            current = results.get(section, {}).get(key)
+            if current is None:
+                continue
+            for metric in metrics:
+                limit = max(reference[metric] * tolerances[metric], floors.get(metric, 0))
+                if current[metric] > limit:
+                    failures.append(
+                        f"{section}[{key}].{metric} = {current[metric]} > {limit:.2f} "
+                        f"(référence {reference[metric]} × {tolerances[metric]}, plancher {floors.get(metric, 0)})"
+                    )
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", default=os.path.join(HERE, "ui_results.json"))
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    # Deux instances : les constructions répétées écrasent les références des écrans en cache
+    with tempfile.TemporaryDirectory() as data_dir:
+        app, page, connection = make_app(data_dir)
+        settle(app)
+        screens = measure_screens(app, args.repeat)
+        app.store.close()
+    with tempfile.TemporaryDirectory() as data_dir:
+        app, page, connection = make_app(data_dir)
+        settle(app)
+        transitions = measure_navigation(app, connection, args.repeat)
+        updates = measure_updates(app, connection, args.repeat)
+        app.store.close()
+    startup = measure_startup(args.repeat)
+    results = {"screens": screens, "transitions": transitions, "startup": startup, "updates": updates}
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+
+    for name, screen in results["screens"].items():
+        print(
+            f"{name:<14} {screen['control_count']:>5} contrôles  {screen['build_ms']:>8.2f} ms  "
+            f"{screen['peak_kb']:>8.1f} Ko  {screen['allocations']:>6} allocations"
+        )
+    worst = max(results["transitions"].items(), key=lambda item: item[1]["navigation_ms"])
+    for mode, stats in results["startup"].items():
+        print(f"Démarrage {mode:<6} premier affichage {stats['time_to_first_frame_ms']:>8.2f} ms  prêt {stats['time_to_ready_ms']:>8.2f} ms")
+    updates = results["updates"]
+    print(
+        f"Séances : {updates['actions']} actions, {updates['requests']} demandes de mise à jour, "
+        f"{updates['flushes']} envois ({updates['merged']} fusionnées), {updates['batches']} lots"
+    )
+    print(f"Navigation la plus lente : {worst[0]} ({worst[1]['navigation_ms']} ms, {worst[1]['payload_bytes']} octets)")
+
+    if args.update_baseline:
+        baseline = {"tolerances": DEFAULT_TOLERANCES, "floors": DEFAULT_FLOORS, **results}
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2, ensure_ascii=False)
+        print(f"Référence mise à jour : {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("Pas de référence : relancer avec --update-baseline")
+        return 0
+    with open(args.baseline, encoding="utf-8") as f:
+        failures = check(results, json.load(f))
+    for failure in failures:
+        print(f"RÉGRESSION {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+"""Page Flet sans rendu pour les mesures.
+
+Une vraie ``ft.Page`` est branchée sur une connexion qui traite les commandes
+comme le serveur Flet (attribution des identifiants, diff des contrôles) mais
+jette les messages au lieu de les envoyer : on mesure le coût Python réel et
+la taille des mises à jour, sans client.
+
+Importer ce module coupe aussi le réseau de ``AssetCache`` : l'avatar n'est
+servi que depuis le cache local, les mesures ne dépendent ni de la connexion
+ni d'un délai de téléchargement.
+"""
+import asyncio
+import json
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import flet as ft
+from flet.core.local_connection import LocalConnection
+from flet.core.protocol import CommandEncoder, PageCommandsBatchResponsePayload
+
+from asset_cache import AssetCache
+
+
+def offline_fetch(cache, url):
+    """``AssetCache.fetch`` sans téléchargement : copie locale ou None"""
+    return cache.lookup(url)
+
+
+AssetCache.fetch = offline_fetch
+
+
+class HeadlessConnection(LocalConnection):
+    def __init__(self):
+        super().__init__()
+        self.batches = 0
+        self.payload_bytes = 0
+
+    def send_command(self, session_id, command):
+        return self.send_commands(session_id, [command])
+
+    def send_commands(self, session_id, commands):
+        results = []
+        messages = []
+        for command in commands:
+            result, message = self._process_command(command)
+            if command.name in ("add", "get"):
+                results.append(result)
+            if message:
+                messages.append(message)
+        self.batches += 1
+        self.payload_bytes += len(json.dumps(messages, cls=CommandEncoder, separators=(",", ":")))
+        return PageCommandsBatchResponsePayload(results=results, error="")
+
+
+def make_headless_page(session_id="bench"):
+    """Page + connexion ; la boucle asyncio tourne dans un thread (page.run_task)"""
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, name="headless-loop", daemon=True).start()
+    connection = HeadlessConnection()
+    page = ft.Page(connection, session_id, loop)
+    return page, connection
+
+
+def count_controls(control):
+    """Nombre de contrôles du sous-arbre (contrôle compris)"""
+    total = 1
+    for child in control._get_children():
+        total += count_controls(child)
+    return total
@@ -0,0 +1,114 @@
+"""Calories : estimation par équivalents métaboliques (MET).
+
+Une minute d'effort à `met` MET brûle ``met × 3,5 × poids / 200`` kcal
+(consommation d'oxygène de 3,5 ml/kg/min par MET). Chaque sport a un MET par
+niveau d'intensité ; une séance est découpée en segments (minutes, intensité)
+et ses calories sont la somme de ses segments.
+
+``batch_calories`` fait le même calcul sur des tableaux de segments (NumPy,
+importé à la demande) : recalculer tout un historique, ou tous les profils
+après un changement de table, est une seule opération vectorisée.
+"""
+DEFAULT_WEIGHT = 70.0
+INTENSITIES = ("léger", "modéré", "intense")
+MODERATE = 1
+
+# MET (léger, modéré, intense), d'après le Compendium of Physical Activities
+MET_TABLE = {
+    "Course": (6.0, 9.8, 11.8),
+    "Natation": (5.8, 8.3, 9.8),
+    "Musculation": (3.5, 5.0, 6.0),
+    "Yoga": (2.5, 3.0, 4.0),
+    "Judo": (5.3, 7.8, 10.3),
+    "Karaté": (5.3, 7.8, 10.3),
+}
+DEFAULT_MET = (3.5, 5.0, 7.0)
+
+
+def met(sport, intensity=MODERATE):
+    return MET_TABLE.get(sport, DEFAULT_MET)[intensity]
+
+
+def intensity_index(intensity):
+    """Indice d'une intensité donnée par son nom ou son indice"""
+    return INTENSITIES.index(intensity) if isinstance(intensity, str) else int(intensity)
+
+
+def segments_of(record):
+    """Segments [(minutes, intensité)] d'une séance ; une séance sans segments est d'intensité modérée"""
+    segments = record.get("segments")
+    if not segments:
+        return [(record["minutes"], MODERATE)]
+    return [(minutes, intensity_index(intensity)) for minutes, intensity in segments]
+
+
+def kcal_per_minute(sport, weight=DEFAULT_WEIGHT, intensity=MODERATE):
+    return met(sport, intensity) * (3.5 / 200) * weight
+
+
+def session_calories(sport, minutes=0, weight=DEFAULT_WEIGHT, segments=None):
+    """Calories d'une séance (kcal, entier)"""
+    segments = segments or [(minutes, MODERATE)]
+    return round(sum(
+        kcal_per_minute(sport, weight, intensity_index(intensity)) * duration
+        for duration, intensity in segments
+    ))
+
+
+def met_matrix(sport_names):
+    """Table MET (sports × intensités) alignée sur `sport_names`"""
+    import numpy as np
+
+    return np.array([MET_TABLE.get(sport, DEFAULT_MET) for sport in sport_names], dtype=np.float64)
+
+
+def batch_calories(sports, minutes, weights, intensities=None, sport_names=tuple(MET_TABLE), sessions=None, session_count=None):
+    """Calories de segments en tableaux : un élément par segment.
+
+    `sports` : indices dans `sport_names` ; `weights` : poids (kg), scalaire ou
+    par segment ; `intensities` : indices dans ``INTENSITIES`` (modéré par
+    défaut). Sans `sessions`, renvoie les kcal de chaque segment (flottants) ;
+    avec `sessions` (indice de séance de chaque segment), les kcal arrondies
+    de chaque séance.
+    """
+    import numpy as np
+
+    sports = np.asarray(sports, dtype=np.int64)
+    if intensities is None:
+        intensities = np.full(sports.shape, MODERATE, dtype=np.int64)
+    mets = met_matrix(sport_names)[sports, np.asarray(intensities, dtype=np.int64)]
+    kcal = mets * (3.5 / 200) * np.asarray(weights, dtype=np.float64) * np.asarray(minutes, dtype=np.float64)
+    if sessions is None:
+        return kcal
+    return np.rint(np.bincount(sessions, weights=kcal, minlength=session_count or 0)).astype(np.int64)
+
+
+def history_arrays(records, sport_names):
+    """Séances → tableaux de segments (séance, sport, minutes, intensité) pour ``batch_calories``"""
+    import numpy as np
+
+    index = {sport: position for position, sport in enumerate(sport_names)}
+    sessions, sports, minutes, intensities = [], [], [], []
+    for position, record in enumerate(records):
+        sport = index[record["sport"]]
+        for duration, intensity in segments_of(record):
+            sessions.append(position)
+            sports.append(sport)
+            minutes.append(duration)
+            intensities.append(intensity)
+    return (
+        np.asarray(sessions, dtype=np.int64),
+        np.asarray(sports, dtype=np.int64),
+        np.asarray(minutes, dtype=np.float64),
+        np.asarray(intensities, dtype=np.int64),
+    )
+
+
+def recompute_history(records, weight=DEFAULT_WEIGHT):
+    """Calories de chaque séance d'un historique avec la table actuelle (tableau d'entiers)"""
+    records = list(records)
+    sport_names = sorted({record["sport"] for record in records})
+    sessions, sports, minutes, intensities = history_arrays(records, sport_names)
+    return batch_calories(
+        sports, minutes, weight, intensities, sport_names, sessions=sessions, session_count=len(records)
+    )
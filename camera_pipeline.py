@@ -0,0 +1,309 @@
+"""Pipeline caméra → estimation de posture à latence bornée.
+
+Le producteur lit les images d'une source (caméra, fichier vidéo ou source
+synthétique pour les tests sans écran) et les copie dans un anneau de slots en
+mémoire partagée. Seul l'indice du slot transite par la file de travail, qui
+est bornée : quand le worker prend du retard, l'image la plus ancienne est
+jetée au profit de la plus récente, le retard ne s'accumule donc jamais.
+
+L'inférence tourne dans un processus séparé (ou un thread si le système ne
+permet pas le multiprocessing, par exemple sur Android, voir
+``default_worker``) avec un estimateur de posture interchangeable.
+"""
+import multiprocessing
+import queue
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:  # pas de _posixshmem (Android)
+    shared_memory = None
+
+
+def default_worker():
+    """« process » si le système a sémaphores et mémoire partagée, sinon « thread »"""
+    if shared_memory is None:
+        return "thread"
+    try:
+        # Sans sem_open (Android), les files multiprocessing sont inutilisables
+        import multiprocessing.synchronize  # noqa: F401
+    except ImportError:
+        return "thread"
+    return "process"
+
+
+class PoseEstimator:
+    """Interface des estimateurs : une image HxWx3 → tableau (articulations, 3) ou None"""
+
+    def estimate(self, frame):
+        raise NotImplementedError()
+
+    def close(self):
+        pass
+
+
+class SyntheticPoseEstimator(PoseEstimator):
+    """Estimateur déterministe pour les tests : 33 points dérivés de l'image"""
+
+    def __init__(self, joints=33, cost_ms=0.0):
+        self.joints = joints
+        self.cost_ms = cost_ms
+
+    def estimate(self, frame):
+        if self.cost_ms:
+            time.sleep(self.cost_ms / 1000)
+        level = float(frame[::16, ::16].mean()) / 255
+        base = np.linspace(0.0, 1.0, self.joints, dtype=np.float32)
+        return np.stack([base, np.full_like(base, level), np.zeros_like(base)], axis=1)
+
+
+class MediaPipePoseEstimator(PoseEstimator):
+    """Estimateur MediaPipe Pose (dépendance optionnelle)"""
+
+    def __init__(self, model_complexity=0):
+        import mediapipe as mp
+        self._pose = mp.solutions.pose.Pose(model_complexity=model_complexity)
+
+    def estimate(self, frame):
+        result = self._pose.process(frame)
+        if not result.pose_landmarks:
+            return None
+        return np.array(
+            [(p.x, p.y, p.z) for p in result.pose_landmarks.landmark], dtype=np.float32
+        )
+
+    def close(self):
+        self._pose.close()
+
+
+class SyntheticFrameSource:
+    """Images générées à cadence fixe, pour faire tourner le pipeline sans caméra"""
+
+    def __init__(self, width=320, height=240, fps=30, count=None):
+        self.shape = (height, width, 3)
+        self.fps = fps
+        self.count = count
+
+    def frames(self):
+        interval = 1.0 / self.fps
+        next_at = time.monotonic()
+        i = 0
+        while self.count is None or i < self.count:
+            frame = np.empty(self.shape, dtype=np.uint8)
+            frame[...] = i % 256
+            yield frame
+            i += 1
+            next_at += interval
+            delay = next_at - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+
+    def close(self):
+        pass
+
+
+class VideoSource:
+    """Caméra (index entier) ou fichier vidéo (chemin) lus avec OpenCV"""
+
+    def __init__(self, device=0, width=320, height=240):
+        import cv2
+        self._cv2 = cv2
+        self._capture = cv2.VideoCapture(device)
+        if not self._capture.isOpened():
+            raise IOError(f"Source vidéo indisponible : {device}")
+        self.shape = (height, width, 3)
+
+    def frames(self):
+        while True:
+            ok, frame = self._capture.read()
+            if not ok:
+                return
+            frame = self._cv2.resize(frame, (self.shape[1], self.shape[0]))
+            yield self._cv2.cvtColor(frame, self._cv2.COLOR_BGR2RGB)
+
+    def close(self):
+        self._capture.release()
+
+
+def _worker_main(ring, shape, slots, estimator_factory, work, free, results):
+    # En processus, `ring` est le nom du segment partagé ; en thread, l'anneau lui-même
+    shm = None
+    if isinstance(ring, str):
+        # Le processus worker partage le resource_tracker du parent : seul le parent libère le segment
+        shm = shared_memory.SharedMemory(name=ring)
+        frames = np.ndarray((slots,) + tuple(shape), dtype=np.uint8, buffer=shm.buf)
+    else:
+        frames = ring
+    estimator = estimator_factory()
+    try:
+        while True:
+            item = work.get()
+            if item is None:
+                break
+            slot, frame_id, captured_at = item
+            started_at = time.monotonic()
+            landmarks = estimator.estimate(frames[slot])
+            # Le slot est rendu dès que l'estimateur n'en a plus besoin
+            free.put(slot)
+            results.put((frame_id, captured_at, started_at, time.monotonic(), landmarks))
+    finally:
+        estimator.close()
+        del frames
+        if shm is not None:
+            shm.close()
+
+
+class FramePipeline:
+    def __init__(self, source, estimator_factory=SyntheticPoseEstimator, queue_size=1,
+                 worker=None, on_result=None, window=120):
+        self.source = source
+        self.estimator_factory = estimator_factory
+        self.queue_size = queue_size
+        self.worker = worker or default_worker()
+        self.on_result = on_result
+        self.captured = 0
+        self.dropped = 0
+        self.processed = 0
+        self._latencies = deque(maxlen=window)
+        self._done_at = deque(maxlen=window)
+        self._running = False
+
+    def start(self):
+        # Un slot en écriture, un en inférence, plus ceux en attente dans la file
+        slots = self.queue_size + 2
+        shape = self.source.shape
+        self._shm = None
+
+        if self.worker == "process":
+            self._shm = shared_memory.SharedMemory(create=True, size=slots * int(np.prod(shape)))
+            self._frames = np.ndarray((slots,) + shape, dtype=np.uint8, buffer=self._shm.buf)
+            ring = self._shm.name
+            context = multiprocessing.get_context()
+            self._work = context.Queue(self.queue_size)
+            self._free = context.Queue()
+            self._results = context.Queue()
+            spawn = context.Process
+        else:
+            # Même espace mémoire : l'anneau est un simple tableau
+            self._frames = ring = np.empty((slots,) + shape, dtype=np.uint8)
+            self._work = queue.Queue(self.queue_size)
+            self._free = queue.Queue()
+            self._results = queue.Queue()
+            spawn = threading.Thread
+        for slot in range(slots):
+            self._free.put(slot)
+
+        self._running = True
+        self._worker = spawn(
+            target=_worker_main,
+            args=(ring, shape, slots, self.estimator_factory,
+                  self._work, self._free, self._results),
+            daemon=True,
+        )
+        self._worker.start()
+        self._producer = threading.Thread(target=self._produce, name="frame-producer", daemon=True)
+        self._collector = threading.Thread(target=self._collect, name="frame-results", daemon=True)
+        self._producer.start()
+        self._collector.start()
+        return self
+
+    def stop(self):
+        if not self._running:
+            return
+        self._running = False
+        self._producer.join(timeout=2.0)
+        # Le worker a pu mourir : jamais d'attente sans délai sur la file bornée
+        try:
+            while True:
+                self._work.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            self._work.put(None, timeout=1.0)
+        except queue.Full:
+            pass
+        self._worker.join(timeout=5.0)
+        if self._worker.is_alive() and self.worker == "process":
+            self._worker.terminate()
+            self._worker.join(timeout=1.0)
+        if self.worker == "process":
+            # Données non lues par un worker mort : ne pas bloquer la sortie du processus
+            self._work.cancel_join_thread()
+        self._results.put(None)
+        self._collector.join(timeout=2.0)
+        self.source.close()
+        del self._frames
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+
+    def wait(self, timeout=None):
+        """Attend la fin d'une source finie (fichier vidéo, source synthétique bornée)"""
+        self._producer.join(timeout)
+
+    def _produce(self):
+        for frame in self.source.frames():
+            if not self._running:
+                break
+            self.captured += 1
+            captured_at = time.monotonic()
+            try:
+                slot = self._free.get_nowait()
+            except queue.Empty:
+                # Tous les slots sont occupés : l'image est obsolète avant même d'être copiée
+                self.dropped += 1
+                continue
+            self._frames[slot] = frame
+            self._submit((slot, self.captured, captured_at))
+
+    def _submit(self, item):
+        while True:
+            try:
+                self._work.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    stale = self._work.get_nowait()
+                except queue.Empty:
+                    continue
+                self._free.put(stale[0])
+                self.dropped += 1
+
+    def _collect(self):
+        while True:
+            item = self._results.get()
+            if item is None:
+                return
+            frame_id, captured_at, started_at, done_at, landmarks = item
+            self.processed += 1
+            self._latencies.append(done_at - captured_at)
+            self._done_at.append(done_at)
+            if self.on_result:
+                self.on_result(frame_id, landmarks)
+
+    def stats(self):
+        """Latence de bout en bout (ms) et cadence atteinte sur la fenêtre glissante"""
+        latencies = sorted(self._latencies)
+        fps = 0.0
+        if len(self._done_at) > 1:
+            span = self._done_at[-1] - self._done_at[0]
+            fps = (len(self._done_at) - 1) / span if span > 0 else 0.0
+        return {
+            "captured": self.captured,
+            "processed": self.processed,
+            "dropped": self.dropped,
+            "fps": round(fps, 1),
+            "latency_ms_p50": _percentile_ms(latencies, 0.50),
+            "latency_ms_p95": _percentile_ms(latencies, 0.95),
+        }
+
+
+def _percentile_ms(sorted_values, q):
+    if not sorted_values:
+        return None
+    index = min(int(len(sorted_values) * q), len(sorted_values) - 1)
+    return round(sorted_values[index] * 1000, 2)
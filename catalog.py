@@ -0,0 +1,138 @@
+"""Catalogue des sports et des variantes d'exercices.
+
+Chaque entrée est un dictionnaire :
+
+    id        identifiant stable ("judo", "musculation/squat-goblet")
+    title     nom affiché
+    sport     sport de rattachement (progression, règles de forme)
+    kind      "sport" ou "exercise"
+    emoji, color_from, color_to   apparence de la carte
+    muscles, tags                 listes de mots (recherche)
+
+Le catalogue embarqué ci-dessous peut être remplacé par un fichier JSON de
+même forme (``SMART_TRAINING_CATALOG`` ou ``assets/catalog.json``) pour livrer
+des centaines d'entrées sans toucher au code. L'interface n'en lit jamais
+que des tranches (``slice``) : le coût d'affichage ne dépend pas de sa taille.
+"""
+import json
+import os
+
+# (titre, emoji, couleur de départ, couleur d'arrivée, tags)
+SPORTS = [
+    ("Judo", "🥋", "#ad1457", "#f50057", ["combat", "art martial", "projection"]),
+    ("Yoga", "🧘", "#00695c", "#009688", ["souplesse", "respiration", "équilibre"]),
+    ("Musculation", "💪", "#b71c1c", "#f44336", ["force", "salle", "renforcement"]),
+    ("Karaté", "🥊", "#e65100", "#ff9800", ["combat", "art martial", "kata"]),
+    ("Course", "🏃", "#1565c0", "#2196f3", ["cardio", "endurance", "extérieur"]),
+    ("Natation", "🏊", "#006064", "#00bcd4", ["cardio", "endurance", "piscine"]),
+]
+
+# sport → [(exercice, muscles, tags)]
+EXERCISES = {
+    "Judo": [
+        ("Uchi-komi", ["dos", "jambes"], ["technique", "répétition"]),
+        ("Randori", ["corps entier"], ["combat", "cardio"]),
+        ("Ukemi (chutes)", ["dos", "épaules"], ["technique", "sécurité"]),
+        ("Tirage à l'élastique", ["dos", "biceps"], ["renforcement"]),
+    ],
+    "Yoga": [
+        ("Salutation au soleil", ["corps entier"], ["enchaînement", "échauffement"]),
+        ("Posture du guerrier", ["jambes", "fessiers"], ["équilibre", "force"]),
+        ("Chien tête en bas", ["ischio-jambiers", "épaules"], ["étirement"]),
+        ("Posture de l'arbre", ["chevilles", "abdominaux"], ["équilibre"]),
+        ("Planche", ["abdominaux", "épaules"], ["gainage"]),
+    ],
+    "Musculation": [
+        ("Squat", ["quadriceps", "fessiers"], ["jambes", "poids du corps"]),
+        ("Squat goblet", ["quadriceps", "fessiers"], ["jambes", "haltère"]),
+        ("Pompes", ["pectoraux", "triceps"], ["poids du corps", "haut du corps"]),
+        ("Curl biceps", ["biceps"], ["haltère", "bras"]),
+        ("Développé épaules", ["épaules", "triceps"], ["haltère", "haut du corps"]),
+        ("Soulevé de terre", ["dos", "ischio-jambiers", "fessiers"], ["barre", "force"]),
+        ("Fentes", ["quadriceps", "fessiers"], ["jambes", "équilibre"]),
+        ("Tractions", ["dos", "biceps"], ["poids du corps", "barre fixe"]),
+        ("Dips", ["triceps", "pectoraux"], ["poids du corps"]),
+        ("Gainage", ["abdominaux"], ["poids du corps", "tronc"]),
+    ],
+    "Karaté": [
+        ("Kihon", ["jambes", "épaules"], ["technique", "répétition"]),
+        ("Kata Heian Shodan", ["corps entier"], ["kata", "mémoire"]),
+        ("Kumite", ["corps entier"], ["combat", "cardio"]),
+        ("Mae-geri", ["quadriceps", "abdominaux"], ["coup de pied", "technique"]),
+    ],
+    "Course": [
+        ("Footing", ["jambes"], ["endurance", "fondamentale"]),
+        ("Fractionné", ["jambes", "cœur"], ["vitesse", "intervalles"]),
+        ("Côtes", ["mollets", "fessiers"], ["force", "dénivelé"]),
+        ("Sortie longue", ["jambes"], ["endurance"]),
+    ],
+    "Natation": [
+        ("Crawl", ["épaules", "dos"], ["nage libre", "endurance"]),
+        ("Brasse", ["pectoraux", "jambes"], ["technique"]),
+        ("Dos crawlé", ["dos", "épaules"], ["technique"]),
+        ("Battements de jambes", ["jambes", "abdominaux"], ["planche", "éducatif"]),
+    ],
+}
+
+CATALOG_PATH = os.environ.get(
+    "SMART_TRAINING_CATALOG",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "catalog.json"),
+)
+
+
+def slugify(text):
+    return "-".join("".join(c if c.isalnum() else " " for c in text.lower()).split())
+
+
+def builtin_entries():
+    """Sports puis leurs exercices, avec l'apparence du sport parent"""
+    entries = []
+    for title, emoji, color_from, color_to, tags in SPORTS:
+        entries.append({
+            "id": slugify(title),
+            "title": title,
+            "sport": title,
+            "kind": "sport",
+            "emoji": emoji,
+            "color_from": color_from,
+            "color_to": color_to,
+            "muscles": [],
+            "tags": tags,
+        })
+    for title, emoji, color_from, color_to, _ in SPORTS:
+        for name, muscles, tags in EXERCISES.get(title, []):
+            entries.append({
+                "id": f"{slugify(title)}/{slugify(name)}",
+                "title": name,
+                "sport": title,
+                "kind": "exercise",
+                "emoji": emoji,
+                "color_from": color_from,
+                "color_to": color_to,
+                "muscles": muscles,
+                "tags": tags,
+            })
+    return entries
+
+
+class Catalog:
+    def __init__(self, entries):
+        self.entries = list(entries)
+        self._by_id = {entry["id"]: entry for entry in self.entries}
+
+    @classmethod
+    def load(cls, path=CATALOG_PATH):
+        """Catalogue JSON s'il existe, sinon le catalogue embarqué"""
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                return cls(json.load(f))
+        return cls(builtin_entries())
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __getitem__(self, entry_id):
+        return self._by_id[entry_id]
+
+    def slice(self, start, count):
+        return self.entries[start:start + count]
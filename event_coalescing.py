@@ -0,0 +1,95 @@
+"""Regroupement des événements d'interface fréquents (survol, saisie, curseurs).
+
+Flet appelle un gestionnaire par événement reçu, et chaque ``update()`` qui
+s'ensuit est un aller-retour avec le client (surtout en mode web/PWA). Un
+``EventCoalescer`` s'intercale entre l'événement et le gestionnaire :
+
+    latest(handler)             seul le dernier événement est traité, à la
+                                prochaine image (au plus une fois par image)
+    throttle(handler, interval) au plus une exécution par intervalle, avec le
+                                dernier événement reçu entre-temps
+    debounce(handler, wait)     exécution après `wait` secondes sans événement
+
+Le regroupement se fait par contrôle : deux cartes survolées en même temps
+gardent chacune leur dernier événement. La planification tourne sur la boucle
+asyncio de la page ; les gestionnaires (synchrones) sont exécutés dans le
+pool de threads de Flet, comme un gestionnaire ordinaire.
+
+``patch`` complète le dispositif : il n'affecte que les propriétés qui
+changent et n'envoie la mise à jour que si l'une d'elles a changé.
+"""
+import math
+
+FRAME_INTERVAL = 1 / 60
+
+
+class EventCoalescer:
+    def __init__(self, page, frame_interval=FRAME_INTERVAL):
+        self.page = page
+        self.frame_interval = frame_interval
+        self._events = {}
+        self._handles = {}
+        self._last_run = {}
+        self.received = 0
+        self.dispatched = 0
+
+    def latest(self, handler):
+        return self._wrap(handler, lambda key, pending, now: None if pending else self._next_frame(now))
+
+    def throttle(self, handler, interval):
+        def due(key, pending, now):
+            if pending:
+                return None
+            return max(self._next_frame(now), self._last_run.get(key, -math.inf) + interval)
+        return self._wrap(handler, due, track=True)
+
+    def debounce(self, handler, wait):
+        return self._wrap(handler, lambda key, pending, now: now + wait)
+
+    def _next_frame(self, now):
+        return (math.floor(now / self.frame_interval) + 1) * self.frame_interval
+
+    def _wrap(self, handler, due, track=False):
+        def on_event(e):
+            # Appelé depuis un thread de Flet : tout l'état vit sur la boucle de la page
+            self.page.loop.call_soon_threadsafe(self._receive, handler, due, track, e)
+        on_event.__wrapped__ = handler
+        return on_event
+
+    def _receive(self, handler, due, track, e):
+        self.received += 1
+        key = (handler, id(e.control))
+        self._events[key] = e
+        handle = self._handles.get(key)
+        when = due(key, handle is not None, self.page.loop.time())
+        if when is None:
+            # Déjà planifié : l'événement le plus récent remplace le précédent
+            return
+        if handle is not None:
+            handle.cancel()
+        self._handles[key] = self.page.loop.call_at(when, self._fire, key, handler, track)
+
+    def _fire(self, key, handler, track):
+        del self._handles[key]
+        e = self._events.pop(key)
+        if track:
+            self._last_run[key] = self.page.loop.time()
+        self.dispatched += 1
+        self.page.run_thread(handler, e)
+
+    def stats(self):
+        return {
+            "received": self.received,
+            "dispatched": self.dispatched,
+            "coalesced": self.received - self.dispatched,
+        }
+
+
+def patch(control, **props):
+    """Affecte les propriétés qui changent ; renvoie False si rien n'a changé (rien à envoyer)"""
+    changed = False
+    for name, value in props.items():
+        if getattr(control, name) != value:
+            setattr(control, name, value)
+            changed = True
+    return changed
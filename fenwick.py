@@ -0,0 +1,53 @@
+"""Arbre de Fenwick (Binary Indexed Tree).
+
+Ajout ponctuel et somme de préfixe en O(log n), construction en O(n).
+Pour des valeurs positives (des effectifs), ``find`` fait l'opération
+inverse : l'indice où la somme de préfixe atteint k, aussi en O(log n). C'est
+la recherche du k-ième élément d'un arbre d'effectifs.
+"""
+
+
+class FenwickTree:
+    def __init__(self, values=()):
+        self.size = len(values)
+        self.tree = [0] + list(values)
+        for i in range(1, self.size + 1):
+            parent = i + (i & -i)
+            if parent <= self.size:
+                self.tree[parent] += self.tree[i]
+
+    def add(self, index, delta):
+        """Ajoute delta à la valeur d'indice index (base 0)"""
+        i = index + 1
+        while i <= self.size:
+            self.tree[i] += delta
+            i += i & -i
+
+    def prefix_sum(self, end):
+        """Somme des valeurs d'indice [0, end)"""
+        total = 0
+        i = min(end, self.size)
+        while i > 0:
+            total += self.tree[i]
+            i -= i & -i
+        return total
+
+    def range_sum(self, start, end):
+        """Somme des valeurs d'indice [start, end)"""
+        if end <= start:
+            return 0
+        return self.prefix_sum(end) - self.prefix_sum(max(start, 0))
+
+    def find(self, k):
+        """Plus petit indice i (base 0) tel que prefix_sum(i + 1) >= k (self.size si k dépasse le total)"""
+        if k <= 0:
+            return 0
+        position = 0
+        step = 1 << self.size.bit_length()
+        while step:
+            nxt = position + step
+            if nxt <= self.size and self.tree[nxt] < k:
+                position = nxt
+                k -= self.tree[nxt]
+            step >>= 1
+        return position
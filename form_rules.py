@@ -0,0 +1,217 @@
+"""Règles de correction de forme, compilées en prédicats vectorisés.
+
+Chaque sport déclare ses règles sous forme de conditions lisibles :
+
+    "left_knee < 90"            angle articulaire (degrés) comparé à un seuil
+    "left_hip below left_knee"  position verticale d'un point par rapport à un autre
+
+Toutes les règles d'un sport sont compilées une seule fois. Les grandeurs
+nécessaires (angles, écarts verticaux) sont dédupliquées, et les seuils de
+chaque grandeur triés : la place d'une valeur parmi eux (un ``searchsorted``
+sur toutes les grandeurs à la fois) désigne un intervalle, et chaque
+intervalle a son masque de bits des règles dont les conditions sur cette
+grandeur sont vraies. L'évaluation d'un lot d'images est un ET de ces masques,
+grandeur par grandeur : le coût dépend du nombre de grandeurs distinctes et
+d'un mot de 64 bits par tranche de 64 règles, plus du nombre de conditions.
+Une règle se déclenche quand elle est vraie sur une part suffisante de la
+fenêtre glissante ; les retours sont espacés (anti-rebond). Ce suivi de la
+fenêtre reste, lui, linéaire en nombre de règles.
+"""
+import time
+
+import numpy as np
+
+from pose_analysis import ANGLE_NAMES, LANDMARKS, joint_angles
+
+FORM_RULES = {
+    "Musculation": [
+        {
+            "id": "squat_trop_bas",
+            "message": "Genoux trop fléchis : remontez légèrement",
+            "when": ["left_knee < 70", "right_knee < 70", "left_hip below left_knee"],
+        },
+        {
+            "id": "dos_penche",
+            "message": "Gardez le buste droit",
+            "when": ["left_hip < 60", "right_hip < 60"],
+        },
+        {
+            "id": "bras_verrouilles",
+            "message": "Ne verrouillez pas complètement les coudes",
+            "when": ["left_elbow > 178", "right_elbow > 178"],
+        },
+    ],
+    "Yoga": [
+        {
+            "id": "genou_guerrier",
+            "message": "Pliez le genou avant à 90°",
+            "when": ["left_knee > 120", "left_hip below left_knee", "right_knee > 150"],
+        },
+        {
+            "id": "epaules_hautes",
+            "message": "Relâchez les épaules",
+            "when": ["left_shoulder > 170", "right_shoulder > 170"],
+        },
+    ],
+    "Judo": [
+        {
+            "id": "garde_haute",
+            "message": "Fléchissez les genoux pour abaisser votre centre de gravité",
+            "when": ["left_knee > 170", "right_knee > 170"],
+        },
+        {
+            "id": "buste_trop_penche",
+            "message": "Redressez le buste",
+            "when": ["left_hip < 110", "right_hip < 110", "nose below left_hip"],
+        },
+    ],
+    "Karaté": [
+        {
+            "id": "position_haute",
+            "message": "Descendez dans votre position",
+            "when": ["left_knee > 165", "right_knee > 165"],
+        },
+    ],
+}
+
+_COMPARISONS = {"<": 1.0, ">": -1.0}
+_RELATIONS = {"above": 1.0, "below": -1.0}
+
+
+def parse_condition(text):
+    """'left_knee < 90' → (('angle', 'left_knee'), sens, seuil)"""
+    left, op, right = text.split()
+    if op in _COMPARISONS:
+        if left not in ANGLE_NAMES:
+            raise ValueError(f"Angle inconnu dans la règle : {left}")
+        return ("angle", left), _COMPARISONS[op], float(right)
+    if op in _RELATIONS:
+        if left not in LANDMARKS or right not in LANDMARKS:
+            raise ValueError(f"Point inconnu dans la règle : {text}")
+        # y croît vers le bas de l'image : « above » ⇔ y_a - y_b < 0
+        return ("dy", left, right), _RELATIONS[op], 0.0
+    raise ValueError(f"Opérateur inconnu dans la règle : {text}")
+
+
+# Grandeurs bornées (angles en degrés, écarts en coordonnées normalisées) : décalées de
+# SPAN par grandeur, toutes les valeurs et tous les seuils tiennent dans un seul tableau trié
+SPAN = 1024.0
+LIMIT = SPAN / 2 - 1
+
+
+class CompiledRules:
+    def __init__(self, rules):
+        self.rules = list(rules)
+        features = {}
+        by_feature = []
+        for r, rule in enumerate(self.rules):
+            for condition in rule["when"]:
+                feature, sign, threshold = parse_condition(condition)
+                if feature not in features:
+                    features[feature] = len(features)
+                    by_feature.append([])
+                threshold = float(np.clip(np.float32(threshold), -LIMIT, LIMIT))
+                by_feature[features[feature]].append((r, sign, threshold))
+
+        self.features = list(features)
+        self.angle_names = tuple(f[1] for f in self.features if f[0] == "angle")
+        self._angle_columns = np.array([i for i, f in enumerate(self.features) if f[0] == "angle"], dtype=np.intp)
+        self._dy_columns = np.array([i for i, f in enumerate(self.features) if f[0] == "dy"], dtype=np.intp)
+        self._dy_points = np.array(
+            [(LANDMARKS[f[1]], LANDMARKS[f[2]]) for f in self.features if f[0] == "dy"], dtype=np.intp
+        ).reshape(-1, 2)
+
+        # Pour k seuils t_0 < … < t_k-1 d'une grandeur : intervalle b = 2j sous t_j (ou au-dessus
+        # de tous pour j = k), b = 2j + 1 égal à t_j, puis une ligne pour NaN (posture absente)
+        words = max(1, -(-len(self.rules) // 64))
+        keys, starts, bases, masks = [], [], [], []
+        for i, conditions in enumerate(by_feature):
+            thresholds = sorted({threshold for _, _, threshold in conditions})
+            rank = {threshold: j for j, threshold in enumerate(thresholds)}
+            starts.append(len(keys))
+            bases.append(sum(len(mask) for mask in masks))
+            keys.extend(i * SPAN + threshold for threshold in thresholds)
+            mask = np.full((2 * len(thresholds) + 2, words), ~np.uint64(0), dtype=np.uint64)
+            buckets = np.arange(2 * len(thresholds) + 1)
+            for r, sign, threshold in conditions:
+                j = rank[threshold]
+                # « < t_j » vrai sur b ≤ 2j, « > t_j » vrai sur b ≥ 2j + 2
+                false = buckets > 2 * j if sign > 0 else buckets <= 2 * j + 1
+                bit = ~np.uint64(1 << (r % 64))
+                mask[np.flatnonzero(false), r // 64] &= bit
+                mask[-1, r // 64] &= bit
+            masks.append(mask)
+        self._keys = np.array(keys, dtype=np.float64)
+        # Sentinelle : l'indice len(keys) (au-dessus de tous les seuils) reste lisible
+        self._padded_keys = np.append(self._keys, np.inf)
+        self._offsets = np.arange(len(self.features)) * SPAN
+        self._starts = np.array(starts, dtype=np.intp)
+        self._bases = np.array(bases, dtype=np.intp)
+        self._nan_rows = self._bases + np.array([len(mask) - 1 for mask in masks], dtype=np.intp)
+        self._masks = np.concatenate(masks) if masks else np.zeros((0, words), dtype=np.uint64)
+
+    def evaluate(self, landmarks):
+        """Règles vraies pour chaque image d'un lot : (F, J, 3) → booléens (F, règles)"""
+        landmarks = np.asarray(landmarks, dtype=np.float32)
+        if not self.rules:
+            return np.zeros((len(landmarks), 0), dtype=bool)
+        if not self.features:
+            return np.ones((len(landmarks), len(self.rules)), dtype=bool)
+        values = np.empty((len(landmarks), len(self.features)), dtype=np.float32)
+        if len(self._angle_columns):
+            values[:, self._angle_columns] = joint_angles(landmarks, self.angle_names)
+        if len(self._dy_columns):
+            values[:, self._dy_columns] = (
+                landmarks[:, self._dy_points[:, 0], 1] - landmarks[:, self._dy_points[:, 1], 1]
+            )
+        # Intervalle de chaque valeur parmi les seuils de sa grandeur (NaN : ligne dédiée)
+        keys = np.clip(values, -LIMIT, LIMIT) + self._offsets
+        below = np.searchsorted(self._keys, keys)
+        buckets = 2 * (below - self._starts) + (self._padded_keys[below] == keys)
+        rows = np.where(np.isnan(values), self._nan_rows, self._bases + buckets)
+        # Une règle est vraie si ses conditions le sont sur toutes les grandeurs
+        satisfied = np.bitwise_and.reduce(self._masks[rows], axis=1)
+        bits = np.unpackbits(satisfied.astype("<u8").view(np.uint8), axis=1, bitorder="little")
+        return bits[:, :len(self.rules)].astype(bool)
+
+
+class FormChecker:
+    def __init__(self, rules, window=15, min_ratio=0.6, cooldown=4.0, min_interval=1.5):
+        self.compiled = CompiledRules(rules)
+        self.window = window
+        self.min_ratio = min_ratio
+        self.cooldown = cooldown
+        self.min_interval = min_interval
+        count = len(self.compiled.rules)
+        self._recent = np.zeros((0, count), dtype=bool)
+        self._active = np.zeros(count, dtype=bool)
+        self._last_fired = np.full(count, -np.inf)
+        self._last_event = -np.inf
+
+    def update(self, landmarks, now=None):
+        """Évalue un lot d'images ; renvoie les règles (dict) à signaler à l'utilisateur"""
+        if not self.compiled.rules or len(landmarks) == 0:
+            return []
+        now = time.monotonic() if now is None else now
+        satisfied = np.concatenate([self._recent, self.compiled.evaluate(landmarks)])
+        self._recent = satisfied[-(self.window - 1):] if self.window > 1 else satisfied[:0]
+
+        # Part de la fenêtre glissante où chaque règle est vraie, pour chaque nouvelle image
+        cumsum = np.concatenate([np.zeros((1, satisfied.shape[1])), np.cumsum(satisfied, axis=0)])
+        ends = np.arange(len(satisfied) - len(landmarks), len(satisfied)) + 1
+        starts = np.maximum(ends - self.window, 0)
+        ratio = (cumsum[ends] - cumsum[starts]) / (ends - starts)[:, None]
+        triggered = ratio >= self.min_ratio
+
+        # Front montant sur le lot, puis anti-rebond par règle et global
+        previous = np.concatenate([self._active[None, :], triggered[:-1]])
+        rising = (triggered & ~previous).any(axis=0)
+        self._active = triggered[-1]
+        ready = rising & (now - self._last_fired >= self.cooldown)
+        if not ready.any() or now - self._last_event < self.min_interval:
+            return []
+        # Un seul retour à la fois : le premier déclaré parmi les règles prêtes
+        index = int(np.flatnonzero(ready)[0])
+        self._last_fired[index] = now
+        self._last_event = now
+        return [self.compiled.rules[index]]
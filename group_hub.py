@@ -0,0 +1,434 @@
+"""Sessions de groupe en direct : hub WebSocket local et client.
+
+Le hub regroupe les participants par salle (10 au plus). Chaque client envoie
+son état (répétitions, chrono, score) quand il change ; le hub ne diffuse pas
+chaque message reçu mais, à tick fixe, un seul delta par salle avec les
+champs modifiés depuis le tick précédent. Le delta est encodé une fois et
+envoyé tel quel à tous les membres de la salle.
+
+Messages (JSON compact) :
+
+    client → hub   {"t": "join", "room": "judo", "sport": "Judo", "name": "Oussama"}
+                   {"t": "set", "r": 12, "tm": 95, "s": 340}     champs modifiés
+                   {"t": "hb"}                                   rien de neuf, toujours là
+    hub → client   {"t": "snap", "k": 17, "id": 3, "p": {"3": {"n": "Oussama", "r": 12, ...}}, "o": [2, 5, 40]}
+                   {"t": "d", "k": 18, "p": {"3": {"r": 13}}, "j": {"4": "Lina"}, "l": [2]}
+                   {"t": "error", "reason": "full"}
+
+"o" donne les effectifs en ligne (salle, sport de la salle, total) ; il n'est
+présent dans un delta que s'il a changé. Chaque message reçu compte comme
+battement de cœur (``presence.Presence``) : un client muet plus de
+`presence_ttl` secondes est déconnecté.
+
+Les valeurs d'un delta sont absolues : appliquer deux fois le même delta, ou
+un delta déjà couvert par un instantané, ne change rien.
+
+Contre-pression : chaque client a une file de sortie courte (`max_pending`
+deltas). Un client qui ne suit pas voit sa file vidée et reçoit, dès qu'il
+peut à nouveau écrire, un instantané de la salle à la place des deltas
+perdus ; un envoi bloqué plus de `send_timeout` secondes ferme la connexion.
+Un client lent ne retient ainsi ni mémoire ni temps du hub.
+
+    python group_hub.py --port 8765
+
+``websockets`` n'est importé qu'au démarrage du hub ou du client.
+"""
+import argparse
+import asyncio
+import json
+import time
+from collections import deque
+
+from presence import Presence
+
+HOST = "127.0.0.1"
+PORT = 8765
+TICK_INTERVAL = 0.1
+MAX_PARTICIPANTS = 10
+HEARTBEAT_INTERVAL = 5.0
+# Champs diffusés : répétitions, chrono (s), score ; entiers positifs bornés
+FIELDS = ("r", "tm", "s")
+MAX_VALUE = 10**9
+MAX_NAME = 32
+
+
+class JoinError(Exception):
+    """Refus du hub (salle complète, message invalide)"""
+
+
+def encode(message):
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+
+
+class Room:
+    def __init__(self, name, sport=None):
+        self.name = name
+        self.sport = sport
+        self.online = None
+        self.peers = {}
+        self.names = {}
+        self.state = {}
+        self.changed = {}
+        self.joined = {}
+        self.left = []
+
+    def add(self, peer, name):
+        self.peers[peer.id] = peer
+        self.names[peer.id] = name
+        self.state[peer.id] = dict.fromkeys(FIELDS, 0)
+        self.joined[str(peer.id)] = name
+
+    def remove(self, peer):
+        del self.peers[peer.id]
+        del self.names[peer.id]
+        del self.state[peer.id]
+        self.changed.pop(peer.id, None)
+        if self.joined.pop(str(peer.id), None) is None:
+            self.left.append(peer.id)
+
+    def set(self, peer_id, values):
+        """Applique les champs valides d'un message ; les autres sont ignorés (jamais rediffusés)"""
+        state = self.state[peer_id]
+        for field in FIELDS:
+            value = values.get(field)
+            # bool est un int : exclu explicitement, comme tout ce qui ferait échouer le tri des clients
+            if type(value) is not int or not 0 <= value <= MAX_VALUE:
+                continue
+            if value != state[field]:
+                state[field] = value
+                self.changed.setdefault(peer_id, {})[field] = value
+
+    def snapshot(self, tick, peer_id):
+        return encode({
+            "t": "snap",
+            "k": tick,
+            "id": peer_id,
+            "p": {str(pid): {"n": self.names[pid], **state} for pid, state in self.state.items()},
+            "o": self.online,
+        })
+
+    def delta(self, tick, online):
+        """Delta encodé depuis le tick précédent, ou None si rien n'a changé"""
+        if online == self.online and not (self.changed or self.joined or self.left):
+            return None
+        message = {"t": "d", "k": tick}
+        if online != self.online:
+            message["o"] = self.online = online
+        if self.joined:
+            message["j"] = self.joined
+        if self.left:
+            message["l"] = self.left
+        if self.changed:
+            message["p"] = {str(pid): fields for pid, fields in self.changed.items()}
+        self.changed = {}
+        self.joined = {}
+        self.left = []
+        return encode(message)
+
+
+class Peer:
+    def __init__(self, hub, connection, peer_id):
+        self.hub = hub
+        self.connection = connection
+        self.id = peer_id
+        self.room = None
+        self.outbox = deque()
+        self.resync = True
+        self.wakeup = asyncio.Event()
+
+    def push(self, message):
+        if len(self.outbox) >= self.hub.max_pending:
+            # Client en retard : les deltas en attente sont remplacés par un instantané
+            self.hub.dropped += len(self.outbox)
+            self.outbox.clear()
+            self.resync = True
+        else:
+            self.outbox.append(message)
+        self.wakeup.set()
+
+    async def write(self):
+        from websockets.exceptions import ConnectionClosed
+
+        try:
+            await self._write()
+        except (asyncio.TimeoutError, ConnectionClosed):
+            # Envoi bloqué ou connexion perdue : le gestionnaire ferme et retire le client
+            pass
+
+    async def _write(self):
+        while True:
+            await self.wakeup.wait()
+            self.wakeup.clear()
+            while self.resync or self.outbox:
+                if self.resync:
+                    # Instantané pris au moment de l'envoi : il couvre tous les deltas en attente
+                    self.resync = False
+                    self.outbox.clear()
+                    message = self.room.snapshot(self.hub.tick, self.id)
+                    self.hub.snapshots += 1
+                else:
+                    message = self.outbox.popleft()
+                await asyncio.wait_for(self.connection.send(message), self.hub.send_timeout)
+                self.hub.messages_sent += 1
+                self.hub.bytes_sent += len(message)
+
+
+class GroupHub:
+    def __init__(
+        self, host=HOST, port=PORT, tick_interval=TICK_INTERVAL, max_pending=4, send_timeout=5.0,
+        presence_ttl=3 * HEARTBEAT_INTERVAL,
+    ):
+        self.host = host
+        self.port = port
+        self.tick_interval = tick_interval
+        self.max_pending = max_pending
+        self.send_timeout = send_timeout
+        self.rooms = {}
+        self.peers = {}
+        self.presence = Presence(presence_ttl)
+        self.tick = 0
+        self._next_id = 0
+        self._server = None
+        self._ticker = None
+        self.updates_received = 0
+        self.messages_sent = 0
+        self.bytes_sent = 0
+        self.snapshots = 0
+        self.dropped = 0
+        self.tick_busy = 0.0
+        self.overruns = 0
+        self.expired = 0
+
+    async def start(self):
+        """Démarre l'écoute ; renvoie le port effectif (utile avec port=0)"""
+        from websockets.asyncio.server import serve
+
+        self._server = await serve(self.handle, self.host, self.port, compression=None)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._ticker = asyncio.create_task(self._run_ticks())
+        return self.port
+
+    async def stop(self):
+        if self._ticker:
+            self._ticker.cancel()
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def handle(self, connection):
+        from websockets.exceptions import ConnectionClosed
+
+        try:
+            hello = json.loads(await connection.recv())
+        except (ConnectionClosed, ValueError):
+            return
+        if not isinstance(hello, dict) or hello.get("t") != "join":
+            await connection.send(encode({"t": "error", "reason": "join"}))
+            return
+        name = str(hello.get("room", ""))
+        room = self.rooms.get(name)
+        if room is None:
+            room = self.rooms[name] = Room(name, str(hello.get("sport") or name))
+        elif len(room.peers) >= MAX_PARTICIPANTS:
+            await connection.send(encode({"t": "error", "reason": "full"}))
+            return
+        self._next_id += 1
+        peer = Peer(self, connection, self._next_id)
+        peer.room = room
+        name = hello.get("name")
+        room.add(peer, name[:MAX_NAME] if isinstance(name, str) else "")
+        self.peers[peer.id] = peer
+        self.presence.heartbeat(peer.id, room.name, room.sport)
+        room.online = self.online(room)
+        peer.wakeup.set()
+        writer = asyncio.create_task(peer.write())
+        reader = asyncio.create_task(self._read(peer))
+        try:
+            await asyncio.wait((writer, reader), return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            writer.cancel()
+            reader.cancel()
+            room.remove(peer)
+            del self.peers[peer.id]
+            self.presence.leave(peer.id)
+            if not room.peers:
+                del self.rooms[room.name]
+
+    async def _read(self, peer):
+        from websockets.exceptions import ConnectionClosed
+
+        try:
+            async for raw in peer.connection:
+                try:
+                    message = json.loads(raw)
+                except ValueError:
+                    continue
+                if not isinstance(message, dict):
+                    continue
+                self.presence.heartbeat(peer.id, peer.room.name, peer.room.sport)
+                if message.get("t") == "set":
+                    self.updates_received += 1
+                    peer.room.set(peer.id, message)
+        except ConnectionClosed:
+            pass
+
+    async def _run_ticks(self):
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time() + self.tick_interval
+        while True:
+            await asyncio.sleep(max(next_tick - loop.time(), 0))
+            started = time.perf_counter()
+            self.broadcast()
+            self.tick_busy += time.perf_counter() - started
+            next_tick += self.tick_interval
+            if loop.time() > next_tick:
+                # Tick en retard d'une période entière : le hub est saturé
+                self.overruns += 1
+                next_tick = loop.time() + self.tick_interval
+
+    def online(self, room):
+        return [self.presence.online(room=room.name), self.presence.online(sport=room.sport), len(self.presence)]
+
+    def broadcast(self):
+        self.tick += 1
+        for peer_id in self.presence.expire():
+            # Plus de battement de cœur : connexion morte ou client figé
+            self.expired += 1
+            asyncio.create_task(self.peers[peer_id].connection.close())
+        for room in self.rooms.values():
+            message = room.delta(self.tick, self.online(room))
+            if message is None:
+                continue
+            for peer in room.peers.values():
+                peer.push(message)
+
+    def stats(self):
+        return {
+            "rooms": len(self.rooms),
+            "peers": sum(len(room.peers) for room in self.rooms.values()),
+            "ticks": self.tick,
+            "updates_received": self.updates_received,
+            "messages_sent": self.messages_sent,
+            "bytes_sent": self.bytes_sent,
+            "snapshots": self.snapshots,
+            "dropped": self.dropped,
+            "tick_busy_s": round(self.tick_busy, 4),
+            "overruns": self.overruns,
+            "online": len(self.presence),
+            "expired": self.expired,
+        }
+
+
+class GroupClient:
+    """Participant : envoie son état au plus une fois par tick, tient à jour celui de la salle.
+
+    `state` est appelée à chaque tick et renvoie {"r", "tm", "s"} ; seuls les
+    champs modifiés partent, et un simple battement de cœur toutes les
+    HEARTBEAT_INTERVAL secondes quand rien ne change. `on_change(client)` est appelée sur la boucle
+    asyncio après chaque message du hub.
+    """
+
+    def __init__(self, url, room, name, state=None, on_change=None, tick_interval=TICK_INTERVAL, sport=None):
+        self.url = url
+        self.room = room
+        self.sport = sport
+        self.name = name
+        self.state = state
+        self.on_change = on_change
+        self.tick_interval = tick_interval
+        self.id = None
+        self.participants = {}
+        # En ligne : salle, sport, total
+        self.online = None
+        self.tick = 0
+        self.connection = None
+        self._sent = {}
+        self._sent_at = 0.0
+
+    async def run(self):
+        """Rejoint la salle et suit ses mises à jour jusqu'à la déconnexion"""
+        from websockets.asyncio.client import connect
+        from websockets.exceptions import ConnectionClosed
+
+        async with connect(self.url, compression=None) as connection:
+            self.connection = connection
+            await connection.send(encode({"t": "join", "room": self.room, "sport": self.sport, "name": self.name}))
+            sender = asyncio.create_task(self._send_state())
+            try:
+                async for raw in connection:
+                    self.apply(json.loads(raw))
+            except ConnectionClosed:
+                pass
+            finally:
+                sender.cancel()
+                self.connection = None
+
+    async def close(self):
+        if self.connection:
+            await self.connection.close()
+
+    async def send(self, **values):
+        changed = {field: value for field, value in values.items() if self._sent.get(field) != value}
+        if changed:
+            self._sent.update(changed)
+            await self.connection.send(encode({"t": "set", **changed}))
+            self._sent_at = time.monotonic()
+        elif time.monotonic() - self._sent_at >= HEARTBEAT_INTERVAL:
+            await self.connection.send(encode({"t": "hb"}))
+            self._sent_at = time.monotonic()
+
+    async def _send_state(self):
+        while True:
+            await self.send(**(self.state() if self.state else {}))
+            await asyncio.sleep(self.tick_interval)
+
+    def apply(self, message):
+        kind = message.get("t")
+        if kind == "error":
+            raise JoinError(message.get("reason"))
+        if kind == "snap":
+            self.id = message["id"]
+            self.participants = message["p"]
+        elif kind == "d":
+            for pid, name in message.get("j", {}).items():
+                self.participants.setdefault(pid, {"n": name, **dict.fromkeys(FIELDS, 0)})
+            for pid in message.get("l", ()):
+                self.participants.pop(str(pid), None)
+            for pid, fields in message.get("p", {}).items():
+                if pid in self.participants:
+                    self.participants[pid].update(fields)
+        if message.get("o"):
+            self.online = message["o"]
+        self.tick = message.get("k", self.tick)
+        if self.on_change:
+            self.on_change(self)
+
+    def ranking(self):
+        """Participants triés par score décroissant : [(nom, état, est_moi)]"""
+        return sorted(
+            ((p["n"], p, pid == str(self.id)) for pid, p in self.participants.items()),
+            key=lambda item: item[1]["s"],
+            reverse=True,
+        )
+
+
+async def serve_forever(hub):
+    await hub.start()
+    print(f"Hub de groupe sur ws://{hub.host}:{hub.port} (tick {hub.tick_interval * 1000:.0f} ms)")
+    await asyncio.Future()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--tick", type=float, default=TICK_INTERVAL)
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve_forever(GroupHub(args.host, args.port, args.tick)))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,370 @@
+"""Export et import de l'historique des séances, en CSV ou en format binaire colonnaire.
+
+Tout passe par des générateurs de paquets de `chunk_size` séances : lecture
+de ``history.jsonl``, encodage, écriture, et l'inverse. Exporter ou importer
+un million de séances n'occupe jamais plus d'un paquet en mémoire.
+
+Format binaire (``.sth``) : l'en-tête ``MAGIC`` puis une suite de blocs,
+chacun ``<longueur compressée, longueur brute>`` suivi du bloc compressé
+(zlib). Un bloc contient un paquet de séances rangé par colonnes :
+
+    n, sports du bloc (noms UTF-8 séparés par des sauts de ligne)
+    jour          int32, écart avec le jour précédent (ordinal pour le premier du bloc)
+    début         int32, secondes depuis minuit du jour (``NO_START`` : inconnu)
+    sport         uint16, indice dans les sports du bloc
+    minutes       int32
+    calories      int32
+    segments      uint16 par séance, puis centièmes de minute (int32) et
+                  intensité (uint8) de chaque segment
+
+Les jours consécutifs et les colonnes de petits entiers se compressent très
+bien ; chaque bloc se décode seul.
+
+Import : ``validate_history`` vérifie tout le fichier avant qu'une seule
+séance ne soit appliquée, et ``session_key`` identifie les séances déjà
+présentes (un import répété n'ajoute rien).
+"""
+import csv
+import io
+import json
+import os
+import struct
+import zlib
+from array import array
+from datetime import date, datetime, timedelta
+
+from calories import INTENSITIES, intensity_index
+
+MAGIC = b"STH1"
+CHUNK_SIZE = 10_000
+CSV_FIELDS = ("date", "start", "sport", "minutes", "calories", "segments")
+NO_START = -2**31
+_BLOCK = struct.Struct("<II")
+_COUNTS = struct.Struct("<II")
+
+
+def chunked(records, chunk_size=CHUNK_SIZE):
+    """Regroupe un flux de séances en listes de `chunk_size`"""
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def read_jsonl(path, chunk_size=CHUNK_SIZE):
+    """Paquets de séances de ``history.jsonl`` (ligne tronquée en fin de fichier ignorée)"""
+    def records():
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    return
+    return chunked(records(), chunk_size)
+
+
+def write_jsonl(chunks, path):
+    count = 0
+    with open(path, "a", encoding="utf-8") as f:
+        for chunk in chunks:
+            f.write("".join(json.dumps(record, ensure_ascii=False) + "\n" for record in chunk))
+            count += len(chunk)
+    return count
+
+
+# CSV ---------------------------------------------------------------------
+
+def _segments_text(segments):
+    return ";".join(f"{minutes}:{intensity}" for minutes, intensity in segments or ())
+
+
+def _parse_segments(text):
+    segments = []
+    for part in text.split(";") if text else ():
+        minutes, intensity = part.split(":")
+        segments.append([float(minutes), intensity])
+    return segments
+
+
+def csv_chunks(chunks):
+    """Texte CSV paquet par paquet (en-tête avec le premier)"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(CSV_FIELDS)
+    for chunk in chunks:
+        writer.writerows(
+            (r["date"], r.get("start", ""), r["sport"], r.get("minutes", 0), r.get("calories", 0),
+             _segments_text(r.get("segments")))
+            for r in chunk
+        )
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+def write_csv(chunks, path):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        for text in csv_chunks(chunks):
+            f.write(text)
+
+
+def _csv_record(row):
+    record = {
+        "date": row["date"],
+        "sport": row["sport"],
+        "minutes": int(row["minutes"]),
+        "calories": int(row["calories"]),
+    }
+    if row["start"]:
+        record["start"] = row["start"]
+    segments = _parse_segments(row["segments"])
+    if segments:
+        record["segments"] = segments
+    return _ordered(record)
+
+
+def read_csv(path, chunk_size=CHUNK_SIZE):
+    """Paquets de séances d'un export CSV ; ValueError si une colonne manque ou une ligne est illisible"""
+    def records():
+        with open(path, encoding="utf-8", newline="") as f:
+            reader = csv.DictReader(f)
+            try:
+                fields = reader.fieldnames or ()
+            except csv.Error as ex:
+                raise ValueError(f"{path} : CSV illisible ({ex})") from ex
+            missing = [field for field in CSV_FIELDS if field not in fields]
+            if missing:
+                raise ValueError(f"{path} : colonnes manquantes : {', '.join(missing)}")
+            try:
+                for row in reader:
+                    yield _csv_record(row)
+            except (csv.Error, TypeError, ValueError) as ex:
+                # Ligne incomplète (champs à None), nombre ou segment illisible
+                raise ValueError(f"{path} : ligne {reader.line_num} invalide ({ex})") from ex
+    return chunked(records(), chunk_size)
+
+
+def _ordered(record):
+    """Champs dans l'ordre de l'enregistrement d'origine"""
+    return {field: record[field] for field in CSV_FIELDS if field in record}
+
+
+# Binaire colonnaire ------------------------------------------------------
+
+def _start_seconds(start, day_text, day):
+    """Début en secondes depuis minuit du jour de la séance"""
+    if not start:
+        return NO_START
+    if len(start) == 19 and start[:10] == day_text and start[10] == "T":
+        return int(start[11:13]) * 3600 + int(start[14:16]) * 60 + int(start[17:19])
+    offset = datetime.fromisoformat(start) - datetime.combine(day, datetime.min.time())
+    return int(offset.total_seconds())
+
+
+def _start_text(seconds, day_text, day):
+    if 0 <= seconds < 86400:
+        hours, rest = divmod(seconds, 3600)
+        return f"{day_text}T{hours:02d}:{rest // 60:02d}:{rest % 60:02d}"
+    return (datetime.combine(day, datetime.min.time()) + timedelta(seconds=seconds)).isoformat(timespec="seconds")
+
+
+def encode_block(chunk):
+    """Paquet de séances → bloc binaire (en-tête compris)"""
+    sports = {}
+    previous_day = 0
+    days, starts, sport_ids, minutes, calories = (array("i") for _ in range(5))
+    segment_counts = array("H")
+    segment_minutes = array("i")
+    segment_levels = array("B")
+    day_text = None
+    for record in chunk:
+        # Séances d'un même jour consécutives : une seule conversion de date
+        if record["date"] != day_text:
+            day_text = record["date"]
+            day = date.fromisoformat(day_text[:10])
+            ordinal = day.toordinal()
+        days.append(ordinal - previous_day)
+        previous_day = ordinal
+        starts.append(_start_seconds(record.get("start"), day_text, day))
+        sport_ids.append(sports.setdefault(record["sport"], len(sports)))
+        minutes.append(record.get("minutes", 0))
+        calories.append(record.get("calories", 0))
+        segments = record.get("segments") or ()
+        segment_counts.append(len(segments))
+        for duration, intensity in segments:
+            segment_minutes.append(round(duration * 100))
+            segment_levels.append(intensity_index(intensity))
+    names = "\n".join(sports).encode("utf-8")
+    raw = b"".join((
+        _COUNTS.pack(len(chunk), len(names)), names,
+        days.tobytes(), starts.tobytes(), array("H", sport_ids).tobytes(), minutes.tobytes(), calories.tobytes(),
+        segment_counts.tobytes(), segment_minutes.tobytes(), segment_levels.tobytes(),
+    ))
+    data = zlib.compress(raw, 6)
+    return _BLOCK.pack(len(data), len(raw)) + data
+
+
+def _take(raw, offset, typecode, count):
+    column = array(typecode)
+    end = offset + column.itemsize * count
+    if end > len(raw):
+        raise ValueError("colonne tronquée")
+    column.frombytes(raw[offset:end])
+    return column, end
+
+
+def decode_block(raw):
+    """Bloc décompressé → liste de séances"""
+    count, names_length = _COUNTS.unpack_from(raw)
+    offset = _COUNTS.size
+    names = raw[offset:offset + names_length].decode("utf-8").split("\n")
+    offset += names_length
+    days, offset = _take(raw, offset, "i", count)
+    starts, offset = _take(raw, offset, "i", count)
+    sport_ids, offset = _take(raw, offset, "H", count)
+    minutes, offset = _take(raw, offset, "i", count)
+    calories, offset = _take(raw, offset, "i", count)
+    segment_counts, offset = _take(raw, offset, "H", count)
+    total = sum(segment_counts)
+    segment_minutes, offset = _take(raw, offset, "i", total)
+    segment_levels, offset = _take(raw, offset, "B", total)
+    records = []
+    segment = 0
+    previous_day = 0
+    for i in range(count):
+        if days[i] or not i:
+            previous_day += days[i]
+            day = date.fromordinal(previous_day)
+            day_text = day.isoformat()
+        record = {"date": day_text}
+        if starts[i] != NO_START:
+            record["start"] = _start_text(starts[i], day_text, day)
+        record["sport"] = names[sport_ids[i]]
+        record["minutes"] = minutes[i]
+        record["calories"] = calories[i]
+        if segment_counts[i]:
+            end = segment + segment_counts[i]
+            record["segments"] = [
+                [segment_minutes[j] / 100, INTENSITIES[segment_levels[j]]] for j in range(segment, end)
+            ]
+            segment = end
+        records.append(record)
+    return records
+
+
+def binary_chunks(chunks):
+    """Octets du format binaire, bloc par bloc (en-tête avec le premier)"""
+    yield MAGIC
+    for chunk in chunks:
+        yield encode_block(chunk)
+
+
+def write_binary(chunks, path):
+    with open(path, "wb") as f:
+        for data in binary_chunks(chunks):
+            f.write(data)
+
+
+def read_binary(path):
+    """Paquets de séances d'un fichier ``.sth`` (un paquet par bloc)"""
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} : format d'historique inconnu")
+        while True:
+            header = f.read(_BLOCK.size)
+            if not header:
+                return
+            try:
+                length, raw_length = _BLOCK.unpack(header)
+                raw = zlib.decompress(f.read(length))
+                if len(raw) != raw_length:
+                    raise ValueError("longueur inattendue")
+                records = decode_block(raw)
+            except (struct.error, zlib.error, IndexError, OverflowError, ValueError) as ex:
+                # En-tête ou bloc tronqué, données altérées (indices, dates ou UTF-8 hors limites)
+                raise ValueError(f"{path} : bloc corrompu ({ex})") from ex
+            yield records
+
+
+# Export / import ---------------------------------------------------------
+
+FORMATS = {".csv": (write_csv, read_csv), ".sth": (write_binary, read_binary)}
+
+
+def _format(path):
+    for suffix, handlers in FORMATS.items():
+        if path.lower().endswith(suffix):
+            return handlers
+    raise ValueError(f"{path} : extension attendue {', '.join(FORMATS)}")
+
+
+def export_history(history_path, path, chunk_size=CHUNK_SIZE):
+    """Exporte ``history.jsonl`` vers `path` (.csv ou .sth) ; renvoie le nombre de séances"""
+    write, _ = _format(path)
+    count = 0
+
+    def counted(chunks):
+        nonlocal count
+        for chunk in chunks:
+            count += len(chunk)
+            yield chunk
+
+    write(counted(read_jsonl(history_path, chunk_size)), path)
+    return count
+
+
+def import_history(path, chunk_size=CHUNK_SIZE):
+    """Paquets de séances d'un export (.csv ou .sth)"""
+    _, read = _format(path)
+    if read is read_binary:
+        # Blocs de la taille choisie à l'export
+        return read_binary(path)
+    return read(path, chunk_size)
+
+
+# Validation et dédoublonnage ---------------------------------------------
+
+def check_record(record):
+    """Lève ValueError si la séance ne peut pas être importée telle quelle"""
+    try:
+        date.fromisoformat(record["date"][:10])
+        if record.get("start"):
+            datetime.fromisoformat(record["start"])
+        valid = (
+            isinstance(record["sport"], str) and bool(record["sport"])
+            and all(isinstance(record.get(field, 0), int) and record.get(field, 0) >= 0
+                    for field in ("minutes", "calories"))
+            and all(duration >= 0 and intensity in INTENSITIES for duration, intensity in record.get("segments") or ())
+        )
+    except (KeyError, TypeError, ValueError):
+        valid = False
+    if not valid:
+        raise ValueError(f"séance invalide : {record!r}")
+
+
+def validate_history(path, chunk_size=CHUNK_SIZE):
+    """Vérifie tout un export, paquet par paquet, sans rien appliquer ; renvoie le nombre de séances"""
+    count = 0
+    for chunk in import_history(path, chunk_size):
+        for record in chunk:
+            check_record(record)
+        count += len(chunk)
+    return count
+
+
+def session_key(record):
+    """Identité d'une séance : jour, début, sport (et durée, qui distingue les séances sans début)"""
+    return (record["date"], record.get("start"), record["sport"], record.get("minutes", 0))
+
+
+def history_keys(history_path, chunk_size=CHUNK_SIZE):
+    """Clés des séances de ``history.jsonl`` (une par séance : seule structure proportionnelle à l'historique)"""
+    keys = set()
+    if os.path.exists(history_path):
+        for chunk in read_jsonl(history_path, chunk_size):
+            keys.update(map(session_key, chunk))
+    return keys
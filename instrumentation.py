@@ -0,0 +1,206 @@
+"""Instrumentation optionnelle des chemins chauds (navigation, mises à jour, événements).
+
+Désactivée par défaut. Activation : ``SMART_TRAINING_PROFILE=1``. Quand elle
+est désactivée, ``timed`` renvoie la fonction d'origine telle quelle et
+``instrument_page`` ne fait rien : aucun coût à l'exécution.
+
+Une fois activée, chaque appel est enregistré dans un histogramme de latence
+(seaux en puissances de 2, en µs) avec son nombre d'appels ; les mises à jour
+de la page enregistrent aussi la taille du diff envoyé. Un résumé est écrit
+sur stderr à la sortie, et ``SMART_TRAINING_TRACE=chemin.json`` produit une
+trace au format Chrome (chrome://tracing, Perfetto).
+"""
+import atexit
+import contextlib
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+
+ENABLED = os.environ.get("SMART_TRAINING_PROFILE", "") not in ("", "0")
+TRACE_PATH = os.environ.get("SMART_TRAINING_TRACE")
+# La taille des envois passe par un attribut privé de la connexion Flet, vérifié pour cette version
+PAYLOAD_HOOK_FLET = "0.25."
+
+
+class Histogram:
+    """Histogramme à seaux logarithmiques (puissances de 2)"""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.max = 0
+        self.buckets = {}
+
+    def add(self, value):
+        value = int(value)
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+        bucket = value.bit_length()
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    def percentile(self, q):
+        """Borne haute du seau contenant le quantile q"""
+        target = q * self.count
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= target:
+                return (1 << bucket) - 1
+        return self.max
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count, 1) if self.count else 0,
+            "p50": self.percentile(0.5),
+            "p95": self.percentile(0.95),
+            "max": self.max,
+        }
+
+
+class Recorder:
+    def __init__(self, trace_limit=200000):
+        self.latencies = {}
+        self.sizes = {}
+        self.events = deque(maxlen=trace_limit)
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter_ns()
+
+    def record(self, name, start_ns, end_ns):
+        with self._lock:
+            self.latencies.setdefault(name, Histogram()).add((end_ns - start_ns) // 1000)
+            if TRACE_PATH:
+                self.events.append((name, start_ns, end_ns, threading.get_ident()))
+
+    def record_size(self, name, size):
+        with self._lock:
+            self.sizes.setdefault(name, Histogram()).add(size)
+
+    def summary(self):
+        with self._lock:
+            return {
+                "latency_us": {name: h.summary() for name, h in sorted(self.latencies.items())},
+                "payload_bytes": {name: h.summary() for name, h in sorted(self.sizes.items())},
+            }
+
+    def write_trace(self, path):
+        with self._lock:
+            events = [
+                {
+                    "name": name,
+                    "ph": "X",
+                    "ts": (start - self._origin) / 1000,
+                    "dur": (end - start) / 1000,
+                    "pid": os.getpid(),
+                    "tid": tid,
+                }
+                for name, start, end, tid in self.events
+            ]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+    def dump(self):
+        summary = self.summary()
+        print("── Instrumentation ──", file=sys.stderr)
+        for name, stats in summary["latency_us"].items():
+            print(
+                f"{name:<40} n={stats['count']:<6} moy={stats['mean']:>9} µs "
+                f"p50≤{stats['p50']:>8} p95≤{stats['p95']:>8} max={stats['max']:>8}",
+                file=sys.stderr,
+            )
+        for name, stats in summary["payload_bytes"].items():
+            print(f"{name:<40} n={stats['count']:<6} moy={stats['mean']:>9} o  max={stats['max']:>8} o", file=sys.stderr)
+        if TRACE_PATH:
+            self.write_trace(TRACE_PATH)
+            print(f"Trace écrite : {TRACE_PATH}", file=sys.stderr)
+
+
+recorder = Recorder()
+if ENABLED:
+    atexit.register(recorder.dump)
+
+
+def timed(name=None):
+    """Décorateur de mesure ; sans effet quand l'instrumentation est désactivée"""
+    def decorate(func):
+        if not ENABLED:
+            return func
+        label = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                recorder.record(label, start, time.perf_counter_ns())
+        return wrapper
+    return decorate
+
+
+def record_duration(name, seconds):
+    """Enregistre une durée mesurée ailleurs (démarrage, etc.)"""
+    if not ENABLED:
+        return
+    end = time.perf_counter_ns()
+    recorder.record(name, end - int(seconds * 1e9), end)
+
+
+def caller_name(depth=1):
+    """Nom de la fonction `depth` niveaux au-dessus de l'appelant ; None quand l'instrumentation est désactivée"""
+    return sys._getframe(depth + 1).f_code.co_name if ENABLED else None
+
+
+_attribution = threading.local()
+
+
+@contextlib.contextmanager
+def attributed_to(callers):
+    """Les page.update() du bloc sont enregistrés au nom de `callers` (demandes regroupées)"""
+    _attribution.callers = callers
+    try:
+        yield
+    finally:
+        _attribution.callers = None
+
+
+def instrument_page(page):
+    """Mesure chaque page.update() (par appelant) et la taille des commandes envoyées"""
+    if not ENABLED:
+        return
+    update = page.update
+
+    def timed_update(*controls):
+        callers = getattr(_attribution, "callers", None) or (sys._getframe(1).f_code.co_name,)
+        start = time.perf_counter_ns()
+        try:
+            return update(*controls)
+        finally:
+            end = time.perf_counter_ns()
+            for caller in callers:
+                recorder.record(f"page.update<{caller}>", start, end)
+
+    page.update = timed_update
+
+    try:
+        from flet.version import version
+        from flet.core.protocol import CommandEncoder
+    except ImportError:
+        return
+    connection = getattr(page, "_Page__conn", None)
+    if not version.startswith(PAYLOAD_HOOK_FLET) or not callable(getattr(connection, "send_commands", None)):
+        # Autre version de Flet : la durée des mises à jour reste mesurée, pas leur taille
+        return
+    send_commands = connection.send_commands
+
+    def measured_send_commands(session_id, commands):
+        size = len(json.dumps(commands, cls=CommandEncoder, separators=(",", ":")))
+        recorder.record_size("update_payload", size)
+        return send_commands(session_id, commands)
+
+    connection.send_commands = measured_send_commands
@@ -0,0 +1,165 @@
+"""Grille virtualisée, construite au fil du défilement.
+
+Flet sérialise et envoie chaque contrôle présent dans ``GridView.controls``,
+et chaque ``update()`` parcourt tout le sous-arbre : construire une carte
+complète par entrée d'un grand catalogue coûterait autant que le catalogue
+entier. ``LazyGrid`` :
+
+- ne construit que la première page (un écran et un peu de marge), puis
+  ajoute la page suivante quand le défilement approche de la fin ;
+- ne garde dans ``GridView.controls`` que les cartes des rangées proches de
+  la zone visible (la fenêtre) ; les rangées au-dessus et au-dessous sont
+  remplacées par un padding de même hauteur, et leurs cartes reconstruites
+  si l'on y revient.
+
+Le coût d'ouverture de l'écran ne dépend pas de la taille de la source, et
+celui d'un défilement (``update()`` compris, qui parcourt tout le sous-arbre)
+ne dépend que de la taille de la fenêtre, pas de la profondeur atteinte.
+
+La source est n'importe quel objet avec ``len()`` et ``slice(start, count)``
+(``Catalog``, résultats de recherche…). Avec `schedule`
+(``UpdateScheduler.mark_dirty``), la mise à jour de la grille part avec la
+prochaine image de l'ordonnanceur ; `release_item` est appelé pour chaque
+entrée dont la carte quitte la grille (recyclage, changement de source).
+"""
+import math
+
+import flet as ft
+
+# Espacement entre rangées de GridView quand `spacing` n'est pas donné (valeur de Flet)
+DEFAULT_SPACING = 10
+
+
+def _sides(padding):
+    """(gauche, haut, droite, bas) d'un padding Flet (nombre, Padding ou None)"""
+    if padding is None:
+        return 0, 0, 0, 0
+    if isinstance(padding, (int, float)):
+        return padding, padding, padding, padding
+    return padding.left, padding.top, padding.right, padding.bottom
+
+
+class LazyGrid:
+    def __init__(
+        self, source, build_item, page_size=12, preload=1.5, keep_rows=6, runs_count=2,
+        schedule=None, release_item=None, **grid_options
+    ):
+        self.source = source
+        self.build_item = build_item
+        self.schedule = schedule
+        self.release_item = release_item
+        self.page_size = page_size
+        # Chargement déclenché à moins de `preload` hauteurs d'écran de la fin
+        self.preload = preload
+        # Rangées réelles conservées de part et d'autre de la zone visible
+        self.keep_rows = keep_rows
+        self.runs_count = runs_count
+        self.entries = []
+        # Cartes construites : entries[first:first + len(view.controls)]
+        self.first = 0
+        # Hauteur d'une rangée espacement compris, mesurée au premier défilement
+        self.row_pitch = None
+        # Padding ajouté pour les rangées hors fenêtre
+        self.spacer = 0
+        self.base_padding = _sides(grid_options.pop("padding", None))
+        self.view = ft.GridView(
+            runs_count=runs_count, on_scroll=self.on_scroll, on_scroll_interval=100,
+            padding=ft.Padding(*self.base_padding), **grid_options
+        )
+        self.spacing = DEFAULT_SPACING if self.view.spacing is None else self.view.spacing
+        self.load_more()
+
+    @property
+    def loaded(self):
+        return len(self.entries)
+
+    @property
+    def exhausted(self):
+        return self.loaded >= len(self.source)
+
+    @property
+    def window(self):
+        """Indices des cartes présentes dans la grille"""
+        return range(self.first, self.first + len(self.view.controls))
+
+    def load_more(self):
+        """Charge la page suivante ; renvoie le nombre d'entrées ajoutées"""
+        entries = self.source.slice(self.loaded, self.page_size)
+        if self.window.stop == self.loaded:
+            # Fenêtre en bas de la grille : les nouvelles cartes y entrent directement
+            self.view.controls.extend(self.build_item(entry) for entry in entries)
+        self.entries.extend(entries)
+        return len(entries)
+
+    def _release(self, indices):
+        if self.release_item is not None:
+            for index in indices:
+                self.release_item(self.entries[index])
+
+    def _push(self):
+        if self.schedule:
+            self.schedule(self.view)
+        else:
+            self.view.update()
+
+    def reset(self, source):
+        """Change de source (filtre, recherche) et repart de la première page"""
+        self._release(self.window)
+        self.source = source
+        self.entries = []
+        self.first = 0
+        self.view.controls.clear()
+        self.load_more()
+        self.spacer = 0
+        self.view.padding = ft.Padding(*self.base_padding)
+        if self.view.page:
+            self._push()
+            self.view.scroll_to(offset=0)
+
+    def _rows(self, count):
+        return math.ceil(count / self.runs_count)
+
+    def visible_range(self, pixels, max_scroll_extent, viewport_dimension):
+        """Indices des cartes à garder construites pour une position de défilement"""
+        shown = self._rows(len(self.view.controls))
+        if shown == 0:
+            return range(0)
+        _, top, _, bottom = self.base_padding
+        # Le padding des rangées hors fenêtre est connu : seule la hauteur des rangées présentes est mesurée
+        content = max_scroll_extent + viewport_dimension - top - bottom - self.spacer
+        self.row_pitch = (content + self.spacing) / shown
+        first_row = int((pixels - top) // self.row_pitch) - self.keep_rows
+        last_row = int((pixels - top + viewport_dimension) // self.row_pitch) + self.keep_rows
+        return range(max(first_row, 0) * self.runs_count, min((last_row + 1) * self.runs_count, self.loaded))
+
+    def recycle(self, keep):
+        """Ne garde que les cartes de `keep` (reconstruites si besoin) ; le reste devient du padding"""
+        window = self.window
+        if keep == window:
+            return False
+        old = self.view.controls
+        self._release(index for index in window if index not in keep)
+        self.view.controls = [
+            old[index - window.start] if index in window else self.build_item(self.entries[index])
+            for index in keep
+        ]
+        self.first = keep.start
+        left, top, right, bottom = self.base_padding
+        above = self._rows(keep.start) * self.row_pitch
+        below = (self._rows(self.loaded) - self._rows(keep.stop)) * self.row_pitch
+        self.spacer = above + below
+        self.view.padding = ft.Padding(left, top + above, right, bottom + below)
+        return True
+
+    def on_scroll(self, e):
+        if e.max_scroll_extent is None or e.viewport_dimension is None:
+            return
+        # Zone visible estimée avec les dimensions mesurées, avant tout ajout
+        keep = self.visible_range(e.pixels, e.max_scroll_extent, e.viewport_dimension)
+        changed = False
+        if not self.exhausted and e.max_scroll_extent - e.pixels <= self.preload * e.viewport_dimension:
+            changed = self.load_more() > 0
+            keep = range(keep.start, self.loaded)
+        changed |= self.recycle(keep)
+        if changed:
+            self._push()
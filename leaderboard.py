@@ -0,0 +1,218 @@
+"""Classements : rang, podium et voisinage en O(log n).
+
+Un arbre de Fenwick compte les joueurs par seau de score (``bucket_width``
+points par seau, 1 par défaut : un seau par score exact). Le nombre de joueurs
+mieux classés qu'un score est une somme de suffixe, et le joueur à une
+position donnée se trouve avec ``FenwickTree.find`` ; chaque seau garde ses
+joueurs dans l'ordre d'arrivée (à score égal, le premier arrivé passe devant).
+
+    set / add        O(log B)          (B = nombre de seaux)
+    rank             O(log B)
+    top / window     O(log B + k)
+    around           O(log B + rayon)
+
+Les scores sont des entiers positifs ; au-delà de ``max_score`` ils sont
+rangés dans le dernier seau (rang exact tant que ce seau reste petit).
+
+``Leaderboards`` tient le classement général et celui de la semaine, mis à
+jour ensemble à chaque séance ; ``local_community`` en remplit un avec une
+communauté simulée, en attendant un vrai serveur.
+"""
+import math
+import random
+import threading
+from datetime import date
+from itertools import islice
+
+from fenwick import FenwickTree
+
+MAX_SCORE = 200_000
+
+
+def week_key(day=None):
+    """(année ISO, semaine ISO) d'une date"""
+    return tuple((day or date.today()).isocalendar())[:2]
+
+
+class Leaderboard:
+    def __init__(self, max_score=MAX_SCORE, bucket_width=1):
+        self.max_score = max_score
+        self.bucket_width = bucket_width
+        self.counts = FenwickTree([0] * (max_score // bucket_width + 1))
+        self.scores = {}
+        self.buckets = {}
+
+    @classmethod
+    def from_scores(cls, scores, max_score=MAX_SCORE, bucket_width=1):
+        """Construction en une passe depuis {joueur: score}, O(n + B)"""
+        board = cls.__new__(cls)
+        board.max_score = max_score
+        board.bucket_width = bucket_width
+        board.scores = dict(scores)
+        board.buckets = {}
+        counts = [0] * (max_score // bucket_width + 1)
+        for user, score in board.scores.items():
+            bucket = board._bucket(score)
+            board.buckets.setdefault(bucket, {})[user] = None
+            counts[bucket] += 1
+        board.counts = FenwickTree(counts)
+        return board
+
+    def __len__(self):
+        return len(self.scores)
+
+    def __contains__(self, user):
+        return user in self.scores
+
+    def _bucket(self, score):
+        return min(max(score, 0), self.max_score) // self.bucket_width
+
+    def score(self, user):
+        return self.scores.get(user)
+
+    def set(self, user, score):
+        """Fixe le score d'un joueur (ajouté s'il est nouveau) ; renvoie son rang"""
+        if user in self.scores:
+            self.remove(user)
+        self.scores[user] = score
+        bucket = self._bucket(score)
+        self.buckets.setdefault(bucket, {})[user] = None
+        self.counts.add(bucket, 1)
+        return self.rank(user)
+
+    def add(self, user, points):
+        return self.set(user, self.scores.get(user, 0) + points)
+
+    def remove(self, user):
+        bucket = self._bucket(self.scores.pop(user))
+        members = self.buckets[bucket]
+        del members[user]
+        if not members:
+            del self.buckets[bucket]
+        self.counts.add(bucket, -1)
+
+    def count_above(self, score):
+        """Nombre de joueurs au score strictement supérieur"""
+        bucket = self._bucket(score)
+        above = len(self.scores) - self.counts.prefix_sum(bucket + 1)
+        if self.bucket_width > 1 or score >= self.max_score:
+            above += sum(1 for user in self.buckets.get(bucket, ()) if self.scores[user] > score)
+        return above
+
+    def rank(self, user):
+        """Rang (1 = meilleur, ex aequo au même rang) ou None si le joueur est inconnu"""
+        if user not in self.scores:
+            return None
+        return self.count_above(self.scores[user]) + 1
+
+    def _members(self, bucket, skip=0):
+        members = self.buckets[bucket]
+        if self.bucket_width == 1 and bucket * self.bucket_width < self.max_score:
+            # Seau d'un seul score : l'ordre d'arrivée suffit, sans copie
+            return islice(members, skip, None)
+        return islice(sorted(members, key=self.scores.__getitem__, reverse=True), skip, None)
+
+    def _walk(self, bucket, skip=0):
+        """Joueurs dans l'ordre du classement, à partir du seau `bucket`"""
+        while True:
+            yield from self._members(bucket, skip)
+            skip = 0
+            below = self.counts.prefix_sum(bucket)
+            if below == 0:
+                return
+            bucket = self.counts.find(below)
+
+    def _ranked(self, users, position, count):
+        """[(rang, joueur, score)] pour des joueurs consécutifs à partir d'une position"""
+        entries = []
+        previous = None
+        for user in islice(users, count):
+            score = self.scores[user]
+            if previous is None:
+                rank = self.count_above(score) + 1
+            elif score != previous:
+                rank = position
+            entries.append((rank, user, score))
+            previous = score
+            position += 1
+        return entries
+
+    def window(self, start, count):
+        """`count` joueurs à partir de la position `start` (1 = premier)"""
+        start = max(start, 1)
+        if start > len(self.scores) or count <= 0:
+            return []
+        k = len(self.scores) - start + 1
+        bucket = self.counts.find(k)
+        skip = self.counts.prefix_sum(bucket + 1) - k
+        return self._ranked(self._walk(bucket, skip), start, count)
+
+    def top(self, k=10):
+        return self.window(1, k)
+
+    def around(self, user, radius=2):
+        """Les `radius` joueurs au-dessus, le joueur, puis les `radius` suivants"""
+        if user not in self.scores:
+            return []
+        score = self.scores[user]
+        above = self.count_above(score)
+        first = max(above - radius + 1, 1)
+        entries = self.window(first, above - first + 1) if above else []
+        entries.append((above + 1, user, score))
+        # Ex aequo : le joueur est placé en tête de son score
+        below = (
+            other for other in self._walk(self._bucket(score))
+            if other != user and self.scores[other] <= score
+        )
+        for rank, other, other_score in self._ranked(below, above + 2, radius):
+            entries.append((above + 1 if other_score == score else rank, other, other_score))
+        return entries
+
+
+class Leaderboards:
+    """Classement général et classement de la semaine, tenus à jour ensemble (thread-safe)"""
+
+    def __init__(self, all_time=None, weekly=None, week=None, max_score=MAX_SCORE):
+        self.lock = threading.Lock()
+        self.max_score = max_score
+        self.all_time = all_time or Leaderboard(max_score)
+        self.weekly = weekly or Leaderboard(max_score)
+        self.week = week or week_key()
+
+    def submit(self, user, points, day=None):
+        """Ajoute les points d'une séance ; le classement de la semaine repart de zéro chaque lundi"""
+        week = week_key(day)
+        with self.lock:
+            if week > self.week:
+                self.weekly = Leaderboard(self.max_score)
+                self.week = week
+            self.all_time.add(user, points)
+            if week == self.week:
+                self.weekly.add(user, points)
+
+    def join(self, user, total, week_points=0):
+        """Inscrit un joueur avec ses points déjà acquis (général, semaine en cours)"""
+        with self.lock:
+            self.all_time.set(user, total)
+            self.weekly.set(user, week_points)
+
+    def rank(self, user, board="all_time"):
+        with self.lock:
+            return getattr(self, board).rank(user)
+
+
+def local_community(size=5000, seed=2025, week=None, players=None):
+    """Classements d'une communauté simulée (même graine, mêmes scores), plus `players` {joueur: (total, semaine)}"""
+    rng = random.Random(seed)
+    all_time = {}
+    weekly = {}
+    for index in range(size):
+        # Minutes d'entraînement : quelques très assidus, beaucoup d'occasionnels
+        total = min(int(rng.lognormvariate(math.log(600), 1.0)), MAX_SCORE)
+        all_time[f"joueur-{index}"] = total
+        if rng.random() < 0.6:
+            weekly[f"joueur-{index}"] = min(int(rng.lognormvariate(math.log(60), 0.8)), total)
+    for user, (total, week_points) in (players or {}).items():
+        all_time[user] = total
+        weekly[user] = week_points
+    return Leaderboards(Leaderboard.from_scores(all_time), Leaderboard.from_scores(weekly), week)
@@ -2,63 +2,239 @@ import flet as ft
 from flet import Icons, Colors
 from datetime import datetime, timedelta
 import random
+import importlib.util
 import json
+import os
+import threading
 import time
+from collections import deque
+
+from activity_chart import ActivityChart
+from asset_cache import AssetCache
+from catalog import SPORTS, Catalog, slugify
+from event_coalescing import EventCoalescer, patch
+from group_hub import GroupClient, JoinError
+from history_io import export_history, history_keys, import_history, session_key, validate_history
+from stats_engine import ALL, StatsEngine
+from streaks import TrainingCalendar
+from styles import (
+    BADGE_PADDING, CARD_MARGIN, PANEL_BGCOLOR, SCALE_ANIMATION, SCREEN_PADDING,
+    button_style, diagonal_gradient, glow, outline, symmetric_padding, tint,
+)
+from update_scheduler import UpdateScheduler
+from instrumentation import instrument_page, record_duration, timed
+from lazy_grid import LazyGrid
+from leaderboard import local_community
+from progression import GLOBAL_CURVE, curve_for, total_xp
+from calories import DEFAULT_WEIGHT, INTENSITIES, MODERATE, session_calories
+from search_index import SearchIndex
+from session_timer import SessionTimer, format_elapsed
+from storage import JournalStore
+
+# Objectif quotidien utilisé pour les barres d'activité
+DAILY_GOAL_MINUTES = 45
+# Vues du graphique d'activité : libellé, titre, type de graphique
+ACTIVITY_VIEWS = {
+    "week": ("7 j", "Activité cette semaine", "bar"),
+    "month": ("30 j", "30 derniers jours", "bar"),
+    "year": ("1 an", "12 derniers mois", "line"),
+    "calendar": ("Carte", "Calendrier d'activité", "heatmap"),
+}
+
+# Exercices suivis par le comptage automatique selon le sport choisi
+SPORT_EXERCISES = {
+    "Musculation": ("squat", "pushup", "curl"),
+    "Yoga": ("squat",),
+    "Judo": ("squat", "pushup"),
+    "Karaté": ("squat", "pushup"),
+}
+EXERCISE_LABELS = {"squat": "squats", "pushup": "pompes", "curl": "curls", "shoulder_press": "développés"}
+POSE_BATCH = 15
+SPORTS_PAGE_SIZE = 8
+
+# Ressources locales (servies par Flet depuis assets/) et distantes (mises en cache)
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets")
+FONT_FILE = "fonts/Poppins-Regular.ttf"
+AVATAR_URL = "https://i.pravatar.cc/300?u=oussama2025"
+
+# Hub des sessions de groupe (python group_hub.py), une salle par sport
+GROUP_HUB_URL = os.environ.get("SMART_TRAINING_HUB", "ws://127.0.0.1:8765")
+
+# Classement : communauté locale simulée en attendant le serveur (score = minutes d'entraînement)
+COMMUNITY_SIZE = int(os.environ.get("SMART_TRAINING_COMMUNITY", "5000"))
+PLAYER_ID = "moi"
+
+# Données statiques partagées par toutes les sessions
+SCREEN_TITLES = ("Accueil", "Sports", "Solo IA", "Groupe", "Statistiques", "Paramètres", "À propos")
+QUOTES = (
+    "La discipline est le pont entre les objectifs et leur réalisation.",
+    "Chaque séance vous rapproche de votre meilleur vous-même.",
+    "La persévérance transforme l'obstacle en opportunité.",
+    "Votre corps peut accomplir tout ce que votre esprit croit.",
+    "Le succès est la somme de petits efforts répétés jour après jour.",
+)
+# Attributs créés par la construction de chaque écran (libérés avec lui)
+SCREEN_ATTRIBUTES = {
+    0: (
+        "home_level_text", "home_xp_text", "home_xp_bar", "home_rank_text", "stat_values",
+        "home_sport", "home_sport_emoji", "home_sport_title", "home_sport_detail",
+    ),
+    1: ("no_results_text", "sport_card_refs", "sports_grid"),
+    2: (
+        "solo_sport_text", "camera_icon", "camera_label", "camera_switch", "camera_view", "camera_status_text",
+        "reps_text", "session_button", "pause_button", "session_timer_text",
+    ),
+    3: ("group_online_text", "group_status_text", "group_button", "group_participants"),
+    4: ("stat_row_values", "stats_sports_column", "activity_title_text", "activity_average_text", "activity_chart"),
+}
+# Historique de navigation et mesures conservés par session
+HISTORY_LIMIT = 50
 
 class SmartTrainingApp:
-    def __init__(self, page: ft.Page):
+    def __init__(
+        self, page: ft.Page, retain_screens=True, store=None, startup_mode=None, catalog=None,
+        shared=None, player_id=PLAYER_ID,
+    ):
+        self.startup_started = time.perf_counter()
+        self.startup_mode = startup_mode or os.environ.get("SMART_TRAINING_STARTUP", "fast")
+        self.time_to_first_frame = None
+        self.startup_done = threading.Event()
+        self.assets_loaded = threading.Event()
+        self.drawer_lock = threading.Lock()
         self.page = page
+        # Ressources communes à toutes les sessions en mode serveur (server.py)
+        self.shared = shared
+        self.player_id = player_id
+        self.last_active = time.monotonic()
+        instrument_page(page)
+        
+        # Mises à jour regroupées : une seule par image
+        self.updates = UpdateScheduler(page)
+        self.snack_bar = None
+        
+        # Événements fréquents : survol des cartes au plus une fois par image,
+        # recherche lancée quand la frappe marque une pause
+        self.events = EventCoalescer(page)
+        self.card_hover = self.events.latest(self.on_card_hover)
+        self.search_changed = self.events.debounce(self.on_search, 0.1)
         self.current_index = 0
         self.history = [0]
         self.selected_sport = None
         self.training_mode = None
         self.camera_active = False
+        self.camera_pipeline = None
+        self.camera_status_at = 0
+        self.rep_counter = None
+        self.form_checker = None
+        self.pose_buffer = []
         self.session_active = False
+        self.activity_view = "week"
+        self.file_picker = None
         self.session_start_time = None
         self.session_timer = None
+        # Segments d'intensité de la séance en cours : [minutes, intensité]
+        self.session_segments = []
+        self.segment_start = None
+        self.timer_tick = 1.0
+        self.group_client = None
+        
+        # Cache des écrans : chaque écran est construit une seule fois puis
+        # rafraîchi sur place lors des navigations suivantes
+        self.retain_screens = retain_screens
+        self.screen_cache = {}
+        self.screen_versions = {}
+        self.data_version = 0
+        self.nav_timings = {}
         
         # Données utilisateur et statistiques
+        self.store = store or JournalStore()
+        if shared:
+            self.asset_cache = shared.asset_cache
+        else:
+            self.asset_cache = AssetCache(os.path.join(self.store.root, "assets"))
         self.user_data = self.load_user_data()
         self.stats = self.user_data.get("stats", {
-            "sessions": 0, 
-            "total_time": 0, 
-            "streak": 3,
-            "calories": 0,
             "level": 1,
             "xp": 0
         })
+        # Ancienne série figée : calculée désormais depuis le calendrier
+        self.stats.pop("streak", None)
         
         self.sports_progress = self.user_data.get("sports_progress", {})
+        self.profile = self.user_data.get("profile", {"weight": DEFAULT_WEIGHT})
+        self.catalog = catalog or (shared.catalog if shared else Catalog.load())
+        self.search_index = None
+        self.search_lock = threading.Lock()
+        self.leaderboards = None
+        self.leaderboard_lock = threading.Lock()
+        # Séance terminée et import (thread de travail) modifient les mêmes agrégats
+        self.history_lock = threading.Lock()
+        
+        # Historique des séances agrégé par jour et par sport
+        self.stats_engine = StatsEngine(self.user_data.get("daily", {}))
+        self.apply_progression()
+        # Jours d'entraînement, un bit par jour ; reconstruit depuis les agrégats s'il n'a jamais été enregistré
+        self.calendar = TrainingCalendar.from_dict(self.user_data.get("calendar"))
+        if self.calendar.origin is None:
+            self.calendar = TrainingCalendar.from_days(
+                int(ordinal) for ordinal, values in self.user_data.get("daily", {}).get(ALL, {}).items() if values[0]
+            )
         
         self.setup_page()
         self.create_ui()
         
+        # Premier écran affiché : mesure, puis chargement différé du reste
+        self.time_to_first_frame = (time.perf_counter() - self.startup_started) * 1000
+        record_duration("startup.time_to_first_frame", self.time_to_first_frame / 1000)
+        if self.startup_mode == "fast":
+            self.page.run_thread(self.finish_startup)
+        else:
+            self.startup_done.set()
+        self.page.run_thread(self.load_avatar)
+        self.page.run_thread(self.ensure_search_index)
+        self.page.run_thread(self.load_leaderboards)
+        
     def load_user_data(self):
         """Charge les données utilisateur depuis le stockage local"""
         try:
-            # En production, vous utiliseriez le stockage réel
-            return {
-                "stats": {
-                    "sessions": 12, 
-                    "total_time": 345, 
-                    "streak": 3,
-                    "calories": 2450,
-                    "level": 2,
-                    "xp": 450
-                },
-                "sports_progress": {
-                    "Judo": {"level": 3, "xp": 750, "sessions": 8},
-                    "Yoga": {"level": 2, "xp": 300, "sessions": 5},
-                    "Musculation": {"level": 1, "xp": 150, "sessions": 3}
-                }
-            }
-        except:
-            return {"stats": {}, "sports_progress": {}}
+            # Dernier snapshot + fin du journal
+            return self.store.load()
+        except (OSError, ValueError, KeyError, TypeError) as ex:
+            # Pas de repli sur un état vide : sans écrivain, rien ne serait sauvegardé, et
+            # le prochain snapshot écraserait les données illisibles mais récupérables
+            raise RuntimeError(f"Données utilisateur illisibles ({self.store.root}) : {ex}") from ex
     
     def save_user_data(self):
-        """Sauvegarde les données utilisateur"""
-        # En production, implémentez la sauvegarde réelle
-        pass
+        """Sauvegarde les données utilisateur (écriture différée, hors du thread UI)"""
+        self.store.save({
+            "stats": self.stats,
+            "sports_progress": self.sports_progress,
+            "profile": self.profile,
+            "calendar": self.calendar.to_dict(),
+        })
+        
+    def apply_progression(self):
+        """XP et niveaux (global et par sport) déduits des totaux enregistrés et des courbes actuelles"""
+        totals = self.stats_engine.totals()
+        self.stats["xp"] = total_xp(totals["sessions"], totals["minutes"])
+        self.stats["level"] = GLOBAL_CURVE.level(self.stats["xp"])
+        for sport, progress in self.sports_progress.items():
+            totals = self.stats_engine.totals(sport)
+            progress["sessions"] = totals["sessions"]
+            progress["xp"] = total_xp(totals["sessions"], totals["minutes"])
+            progress["level"] = curve_for(sport).level(progress["xp"])
+        
+    def streak_label(self, days=None):
+        days = self.calendar.current() if days is None else days
+        return f"{days} jour" if days <= 1 else f"{days} jours"
+        
+    def next_level_label(self):
+        _, done, needed = GLOBAL_CURVE.progress(self.stats["xp"])
+        return "Niveau maximal" if needed is None else f"{needed - done} XP"
+        
+    def xp_label(self, xp, curve=GLOBAL_CURVE):
+        _, done, needed = curve.progress(xp)
+        return f"{done} XP" if needed is None else f"{done}/{needed} XP"
         
     def setup_page(self):
         self.page.title = "Smart Training Assistant"
@@ -69,33 +245,73 @@ class SmartTrainingApp:
         self.page.window_resizable = False
         self.page.padding = 0
         self.page.spacing = 0
-        self.page.fonts = {
-            "Poppins": "https://fonts.googleapis.com/css2?family=Poppins:wght@400;500;600;700&display=swap"
-        }
-        self.page.theme = ft.Theme(font_family="Poppins")
+        self.setup_fonts()
         
-    def create_ui(self):
-        # Avatar avec badge de niveau
-        self.avatar = ft.Stack([
-            ft.CircleAvatar(
-                foreground_image_src="https://i.pravatar.cc/300?u=oussama2025",
-                radius=50,
-            ),
-            ft.Container(
-                content=ft.Text(
-                    f"Nv.{self.stats['level']}",
-                    size=12,
-                    weight="bold",
-                    color="white"
-                ),
-                bgcolor="#ff6d00",
-                padding=ft.padding.symmetric(horizontal=8, vertical=2),
-                border_radius=10,
-                right=0,
-                bottom=0,
-            )
-        ], width=100, height=100)
+    def setup_fonts(self):
+        # Police optionnelle (sous-ensemble généré par tools/subset_fonts.py) ; à défaut, police système
+        if os.path.exists(os.path.join(ASSETS_DIR, FONT_FILE)):
+            self.page.fonts = {"Poppins": FONT_FILE}
+            self.page.theme = ft.Theme(font_family="Poppins")
+        
+    def finish_startup(self):
+        """Construit le menu latéral après le premier affichage"""
+        start = time.perf_counter()
+        self.ensure_drawer()
+        self.updates.flush_now(self.page)
+        record_duration("startup.deferred", time.perf_counter() - start)
+        self.startup_done.set()
+        
+    def load_avatar(self):
+        """Télécharge ou revalide l'avatar (hors du thread UI) puis l'affiche depuis le cache"""
+        try:
+            path = self.asset_cache.fetch(AVATAR_URL)
+            # Menu pas encore construit : il lira directement la copie en cache
+            with self.drawer_lock:
+                if self.page.drawer is None:
+                    return
+            src = self.asset_cache.src(path)
+            if src and src != self.avatar_image.foreground_image_src:
+                self.avatar_image.foreground_image_src = src
+                self.updates.mark_dirty(self.avatar_image)
+        finally:
+            self.assets_loaded.set()
+        
+    def ensure_search_index(self):
+        """Index de recherche du catalogue : relu depuis le disque, reconstruit si le catalogue a changé"""
+        with self.search_lock:
+            if self.search_index is None and self.shared:
+                self.search_index = self.shared.search_index()
+            elif self.search_index is None:
+                path = os.path.join(self.store.root, "search_index.pickle")
+                self.search_index = SearchIndex.load_or_build(self.catalog.entries, path)
+        return self.search_index
+        
+    def load_leaderboards(self):
+        """Classements construits une fois le démarrage terminé, pour ne pas le ralentir"""
+        self.startup_done.wait()
+        self.ensure_leaderboards()
+        
+    def ensure_leaderboards(self):
+        """Classements général et hebdomadaire, avec les minutes déjà enregistrées du joueur"""
+        with self.leaderboard_lock:
+            if self.leaderboards is None:
+                minutes = (self.stats_engine.totals()["minutes"], self.stats_engine.week_totals()["minutes"])
+                if self.shared:
+                    self.leaderboards = self.shared.leaderboards()
+                    self.leaderboards.join(self.player_id, *minutes)
+                else:
+                    self.leaderboards = local_community(COMMUNITY_SIZE, players={self.player_id: minutes})
+                if getattr(self, "home_rank_text", None):
+                    self.home_rank_text.value = self.rank_label()
+                    self.updates.mark_dirty(self.home_rank_text)
+        return self.leaderboards
         
+    def rank_label(self):
+        if self.leaderboards is None:
+            return "#–"
+        return f"#{self.leaderboards.rank(self.player_id)}"
+        
+    def create_ui(self):
         # Boutons de navigation
         self.hamburger = ft.IconButton(
             icon=Icons.MENU_ROUNDED,
@@ -121,7 +337,7 @@ class SmartTrainingApp:
             leading_width=60,
             title=ft.Text("Accueil", size=24, weight="bold"),
             center_title=True,
-            bgcolor=Colors.with_opacity(0.95, "#140535"),
+            bgcolor=tint("#140535", 0.95),
             elevation=10,
             actions=[
                 ft.IconButton(
@@ -132,17 +348,55 @@ class SmartTrainingApp:
             ]
         )
         
-        # Drawer
-        self.create_drawer()
+        # Drawer (différé en démarrage rapide, voir finish_startup)
+        if self.startup_mode != "fast":
+            self.ensure_drawer()
+        
+        # Conteneur des écrans en cache : un seul écran visible à la fois
+        self.screen_host = ft.Stack([], expand=True, fit=ft.StackFit.EXPAND)
+        self.page.controls.append(self.screen_host)
         
         # Premier écran
         self.animate_to(0)
         
+    def ensure_drawer(self):
+        """Construit le menu latéral une seule fois, au premier besoin"""
+        with self.drawer_lock:
+            if self.page.drawer is None:
+                self.create_drawer()
+        
     def create_drawer(self):
+        # Avatar avec badge de niveau
+        self.avatar_level_text = ft.Text(
+            f"Nv.{self.stats['level']}",
+            size=12,
+            weight="bold",
+            color="white"
+        )
+        # Copie locale de l'avatar si disponible, initiales sinon : jamais d'attente réseau
+        self.avatar_image = ft.CircleAvatar(
+            content=ft.Text("O", size=40, weight="bold", color="white"),
+            bgcolor="#7c4dff",
+            foreground_image_src=self.asset_cache.src(self.asset_cache.lookup(AVATAR_URL)),
+            radius=50,
+        )
+        self.avatar = ft.Stack([
+            self.avatar_image,
+            ft.Container(
+                content=self.avatar_level_text,
+                bgcolor="#ff6d00",
+                padding=symmetric_padding(horizontal=8, vertical=2),
+                border_radius=10,
+                right=0,
+                bottom=0,
+            )
+        ], width=100, height=100)
+        
+        self.drawer_streak_text = ft.Text(self.streak_label(), color="#ff6d00", weight="bold")
         self.page.drawer = ft.NavigationDrawer(
-            bgcolor=Colors.with_opacity(0.96, "#140535"),
+            bgcolor=tint("#140535", 0.96),
             indicator_color="#7c4dff",
-            selected_index=0,
+            selected_index=self.current_index,
             elevation=20,
             controls=[
                 ft.Container(height=30),
@@ -153,7 +407,7 @@ class SmartTrainingApp:
                     ft.Container(
                         content=ft.Row([
                             ft.Icon(Icons.LOCAL_FIRE_DEPARTMENT, color="#ff6d00", size=20),
-                            ft.Text(f"{self.stats['streak']} jours", color="#ff6d00", weight="bold")
+                            self.drawer_streak_text
                         ], spacing=5),
                         padding=10
                     )
@@ -198,6 +452,7 @@ class SmartTrainingApp:
         )
     
     def open_drawer(self, e):
+        self.ensure_drawer()
         self.page.drawer.selected_index = self.current_index
         self.page.open(self.page.drawer)
         
@@ -211,20 +466,32 @@ class SmartTrainingApp:
                         subtitle=ft.Text("Complétez 5 séances cette semaine"),
                         leading=ft.Icon(Icons.EMOJI_EVENTS, color="#ffd700"),
                     ),
-                    ft.ListTile(
-                        title=ft.Text("Votre série continue !"),
-                        subtitle=ft.Text("3 jours d'affilée - Continuez comme ça !"),
-                        leading=ft.Icon(Icons.LOCAL_FIRE_DEPARTMENT, color="#ff6d00"),
-                    ),
+                    self.streak_notification(),
                 ], tight=True),
                 actions=[ft.TextButton("Fermer", on_click=lambda _: self.page.close_dialog())]
             )
         )
         
+    def streak_notification(self):
+        streak = self.calendar.current()
+        if streak:
+            title = "Votre série continue !"
+            subtitle = f"{self.streak_label(streak)} d'affilée - Continuez comme ça !"
+        else:
+            title = "Lancez une nouvelle série"
+            subtitle = f"Meilleure série : {self.streak_label(self.calendar.longest())}"
+        return ft.ListTile(
+            title=ft.Text(title),
+            subtitle=ft.Text(subtitle),
+            leading=ft.Icon(Icons.LOCAL_FIRE_DEPARTMENT, color="#ff6d00"),
+        )
+        
+    @timed()
     def go_to(self, index: int):
         if self.current_index == index:
             return
         self.history.append(index)
+        del self.history[:-HISTORY_LIMIT]
         self.current_index = index
         self.animate_to(index)
         
@@ -234,9 +501,11 @@ class SmartTrainingApp:
             self.current_index = self.history[-1]
             self.animate_to(self.history[-1])
             
+    @timed()
     def animate_to(self, index: int):
-        titles = ["Accueil", "Sports", "Solo IA", "Groupe", "Statistiques", "Paramètres", "À propos"]
-        self.page.appbar.title.value = titles[index]
+        start = time.perf_counter()
+        self.last_active = time.monotonic()
+        self.page.appbar.title.value = SCREEN_TITLES[index]
         
         # Basculer entre hamburger et bouton retour
         if index == 0:
@@ -250,21 +519,42 @@ class SmartTrainingApp:
             
         if self.page.drawer:
             self.page.drawer.selected_index = index
-        self.page.update()
+            self.refresh_drawer()
         
-        new_content = ft.Container(
-            content=self.build_screen(index),
-            expand=True,
-            opacity=0,
-            animate_opacity=ft.Animation(500, "easeOutCubic"),
-        )
+        if not self.retain_screens:
+            self.screen_cache.clear()
+            self.screen_host.controls.clear()
         
-        self.page.controls.clear()
-        self.page.add(new_content)
-        self.page.update()
-        new_content.opacity = 1
-        self.page.update()
+        previous = [screen for screen in self.screen_cache.values() if screen.visible]
+        screen = self.screen_cache.get(index)
+        built = screen is None
+        if built:
+            screen = ft.Container(content=self.build_screen(index), expand=True)
+            self.screen_cache[index] = screen
+            self.screen_versions[index] = self.data_version
+            self.screen_host.controls.append(screen)
+        else:
+            self.refresh_screen(index)
+        
+        for cached_index, cached in self.screen_cache.items():
+            cached.visible = cached_index == index
+        
+        # Une seule mise à jour par navigation, envoyée sans attendre l'image suivante
+        # (avec ce qui était déjà en attente) : seuls les contrôles touchés sont
+        # comparés, sauf quand un nouvel écran entre dans l'arbre
+        if built or self.screen_host.page is None:
+            self.updates.flush_now(self.page)
+        else:
+            self.updates.flush_now(*self.mounted(self.page.appbar, self.page.drawer, *previous, screen))
         
+        elapsed = (time.perf_counter() - start) * 1000
+        self.nav_timings.setdefault(index, deque(maxlen=HISTORY_LIMIT)).append(("build" if built else "patch", elapsed))
+        
+    def mounted(self, *controls):
+        """Filtre les contrôles déjà présents côté client"""
+        return [c for c in controls if c is not None and c.page is not None]
+        
+    @timed()
     def build_screen(self, index):
         screens = [
             self.home_screen,
@@ -277,10 +567,112 @@ class SmartTrainingApp:
         ]
         return screens[index]()
         
+    @timed()
+    def refresh_screen(self, index):
+        """Met à jour sur place les valeurs d'un écran en cache si les données ont changé"""
+        if index not in self.screen_cache or self.screen_versions.get(index) == self.data_version:
+            return False
+        refreshers = {
+            0: self.refresh_home,
+            1: self.refresh_sports,
+            2: self.refresh_solo,
+            4: self.refresh_stats,
+        }
+        if index in refreshers:
+            refreshers[index]()
+        self.screen_versions[index] = self.data_version
+        return True
+        
+    def invalidate_screens(self):
+        """Signale un changement des données : l'écran courant est rafraîchi sur place,
+        les autres le seront à leur prochain affichage"""
+        self.data_version += 1
+        self.refresh_drawer()
+        self.refresh_screen(self.current_index)
+        return self.mounted(self.screen_cache.get(self.current_index))
+        
+    @property
+    def busy(self):
+        """Séance, caméra ou session de groupe en cours : des écrans reçoivent des mises à jour"""
+        return self.session_active or self.camera_active or self.group_client is not None
+        
+    def trim_screens(self):
+        """Libère les écrans en cache sauf l'écran courant ; ils seront reconstruits à la prochaine visite"""
+        if self.busy:
+            return 0
+        trimmed = [index for index in self.screen_cache if index != self.current_index]
+        for index in trimmed:
+            self.screen_host.controls.remove(self.screen_cache.pop(index))
+            self.screen_versions.pop(index, None)
+            for name in SCREEN_ATTRIBUTES.get(index, ()):
+                self.__dict__.pop(name, None)
+        if trimmed:
+            self.updates.mark_dirty(*self.mounted(self.screen_host))
+        return len(trimmed)
+        
+    def close(self):
+        """Fin de session : arrête le travail en cours et vide les écritures"""
+        self.stop_camera()
+        if self.session_timer:
+            self.session_timer.stop()
+        if self.group_client:
+            self.page.run_task(self.group_client.close)
+        if self.shared:
+            # Magasin partagé avec les autres onglets du même utilisateur
+            self.shared.release_store(self.store)
+        else:
+            self.store.close()
+        
+    def refresh_drawer(self):
+        if self.page.drawer is None:
+            return
+        self.avatar_level_text.value = f"Nv.{self.stats['level']}"
+        self.drawer_streak_text.value = self.streak_label()
+        
+    def notify(self, message, bgcolor=None, action=None):
+        """Affiche un message ; une seule barre, réutilisée et envoyée avec la prochaine mise à jour groupée"""
+        first = self.snack_bar is None
+        if first:
+            self.snack_bar = ft.SnackBar(content=ft.Text(message))
+        self.snack_bar.content.value = message
+        self.snack_bar.bgcolor = bgcolor
+        self.snack_bar.action = action
+        if first:
+            # Ajout à la page, une seule fois
+            self.page.open(self.snack_bar)
+        else:
+            self.snack_bar.open = True
+            self.updates.mark_dirty(self.snack_bar)
+        
+    def navigation_report(self):
+        """Coût moyen (ms) des constructions et des rafraîchissements par écran"""
+        report = {}
+        for index, samples in sorted(self.nav_timings.items()):
+            entry = {}
+            for kind in ("build", "patch"):
+                values = [ms for k, ms in samples if k == kind]
+                if values:
+                    entry[kind] = {"count": len(values), "avg_ms": round(sum(values) / len(values), 2)}
+            report[index] = entry
+        return report
+        
     def home_screen(self):
         # Progression du niveau
-        xp_needed = 1000
-        xp_progress = self.stats['xp'] / xp_needed
+        self.home_level_text = ft.Text(f"Niveau {self.stats['level']}", size=16, color="#b388ff")
+        self.home_xp_text = ft.Text(self.xp_label(self.stats['xp']), size=12, color="#888")
+        self.home_xp_bar = ft.Container(
+            width=GLOBAL_CURVE.fraction(self.stats['xp']) * 100,
+            height=6,
+            bgcolor="#7c4dff",
+            border_radius=3,
+        )
+        self.home_rank_text = ft.Text(self.rank_label(), size=14, color="#ffd700")
+        self.stat_values = {}
+        totals = self.stats_engine.totals()
+        self.home_sport_emoji = ft.Text(size=40)
+        self.home_sport_title = ft.Text(size=18, weight="bold", color="white")
+        self.home_sport_detail = ft.Text(size=12, color="#888")
+        self.show_recommended_sport()
         
         return ft.Column([
             ft.Container(height=40),
@@ -290,26 +682,21 @@ class SmartTrainingApp:
                 content=ft.Column([
                     ft.Row([
                         ft.Column([
-                            ft.Text(f"Niveau {self.stats['level']}", size=16, color="#b388ff"),
-                            ft.Text(f"{self.stats['xp']}/{xp_needed} XP", size=12, color="#888"),
+                            self.home_level_text,
+                            self.home_xp_text,
                         ], expand=True),
                         ft.Container(
-                            content=ft.Text(f"#{random.randint(150, 250)}", size=14, color="#ffd700"),
-                            bgcolor=Colors.with_opacity(0.2, "#ffd700"),
-                            padding=ft.padding.symmetric(horizontal=12, vertical=6),
+                            content=self.home_rank_text,
+                            bgcolor=tint("#ffd700", 0.2),
+                            padding=BADGE_PADDING,
                             border_radius=15,
                         )
                     ]),
                     ft.Container(
-                        content=ft.Container(
-                            width=xp_progress * 100,
-                            height=6,
-                            bgcolor="#7c4dff",
-                            border_radius=3,
-                        ),
+                        content=self.home_xp_bar,
                         width=100,
                         height=6,
-                        bgcolor=Colors.with_opacity(0.2, "white"),
+                        bgcolor=tint("white", 0.2),
                         border_radius=3,
                     ),
                 ]),
@@ -330,7 +717,7 @@ class SmartTrainingApp:
                         color="#888",
                     ),
                 ], spacing=5),
-                padding=ft.padding.symmetric(horizontal=20)
+                padding=SCREEN_PADDING
             ),
             
             # Message motivationnel
@@ -339,7 +726,7 @@ class SmartTrainingApp:
                     ft.Icon(Icons.LIGHTBULB, size=20, color="#ffd700"),
                     ft.Text(self.get_motivational_quote(), size=14, color="#ccc", expand=True),
                 ], spacing=10),
-                bgcolor=Colors.with_opacity(0.1, "#ffd700"),
+                bgcolor=tint("#ffd700", 0.1),
                 padding=15,
                 margin=20,
                 border_radius=15,
@@ -348,11 +735,11 @@ class SmartTrainingApp:
             # Statistiques rapides
             ft.Container(
                 content=ft.Row([
-                    self.stat_card("Séances", str(self.stats['sessions']), Icons.FITNESS_CENTER, "#9c27b0"),
-                    self.stat_card("Minutes", str(self.stats['total_time']), Icons.TIMER, "#00bcd4"),
-                    self.stat_card("Calories", f"{self.stats['calories']}", Icons.LOCAL_FIRE_DEPARTMENT, "#ff6d00"),
+                    self.stat_card("Séances", str(totals['sessions']), Icons.FITNESS_CENTER, "#9c27b0"),
+                    self.stat_card("Minutes", str(totals['minutes']), Icons.TIMER, "#00bcd4"),
+                    self.stat_card("Calories", f"{totals['calories']}", Icons.LOCAL_FIRE_DEPARTMENT, "#ff6d00"),
                 ], alignment="center", spacing=10),
-                padding=ft.padding.symmetric(horizontal=20)
+                padding=SCREEN_PADDING
             ),
             
             ft.Container(height=30),
@@ -367,20 +754,20 @@ class SmartTrainingApp:
                     ft.Container(height=10),
                     ft.Container(
                         content=ft.Row([
-                            ft.Text("🥋", size=40),
+                            self.home_sport_emoji,
                             ft.Column([
-                                ft.Text("Judo", size=18, weight="bold", color="white"),
-                                ft.Text("Niveau 3 • 8 séances", size=12, color="#888"),
+                                self.home_sport_title,
+                                self.home_sport_detail,
                             ], expand=True),
                             ft.Icon(Icons.CHEVRON_RIGHT, color="#888"),
                         ], spacing=15),
-                        bgcolor=Colors.with_opacity(0.05, "white"),
+                        bgcolor=PANEL_BGCOLOR,
                         padding=15,
                         border_radius=15,
-                        on_click=lambda _: self.select_sport("Judo")
+                        on_click=lambda _: self.select_sport(self.home_sport)
                     ),
                 ]),
-                padding=ft.padding.symmetric(horizontal=20)
+                padding=SCREEN_PADDING
             ),
             
             ft.Container(height=30),
@@ -393,13 +780,7 @@ class SmartTrainingApp:
                         icon=Icons.PLAY_ARROW,
                         width=340,
                         height=70,
-                        bgcolor="#9c27b0",
-                        color="white",
-                        elevation=15,
-                        style=ft.ButtonStyle(
-                            shape=ft.RoundedRectangleBorder(radius=35),
-                            overlay_color=Colors.with_opacity(0.1, "white")
-                        ),
+                        style=button_style(35, color="white", bgcolor="#9c27b0", elevation=15, overlay_opacity=0.1),
                         on_click=lambda _: self.go_to(1)
                     ),
                     ft.Row([
@@ -408,11 +789,7 @@ class SmartTrainingApp:
                             icon=Icons.ANALYTICS,
                             width=165,
                             height=60,
-                            style=ft.ButtonStyle(
-                                color="white",
-                                side=ft.BorderSide(2, "#7c4dff"),
-                                shape=ft.RoundedRectangleBorder(radius=30)
-                            ),
+                            style=button_style(30, color="white", side_color="#7c4dff"),
                             on_click=lambda _: self.go_to(4)
                         ),
                         ft.OutlinedButton(
@@ -420,11 +797,7 @@ class SmartTrainingApp:
                             icon=Icons.SMART_TOY,
                             width=165,
                             height=60,
-                            style=ft.ButtonStyle(
-                                color="white",
-                                side=ft.BorderSide(2, "#00bcd4"),
-                                shape=ft.RoundedRectangleBorder(radius=30)
-                            ),
+                            style=button_style(30, color="white", side_color="#00bcd4"),
                             on_click=lambda _: self.go_to(2)
                         ),
                     ], spacing=10),
@@ -433,56 +806,74 @@ class SmartTrainingApp:
             ),
         ], scroll=ft.ScrollMode.AUTO, expand=True)
     
+    def refresh_home(self):
+        self.home_level_text.value = f"Niveau {self.stats['level']}"
+        self.home_xp_text.value = self.xp_label(self.stats['xp'])
+        self.home_xp_bar.width = GLOBAL_CURVE.fraction(self.stats['xp']) * 100
+        self.home_rank_text.value = self.rank_label()
+        totals = self.stats_engine.totals()
+        self.stat_values["Séances"].value = str(totals['sessions'])
+        self.stat_values["Minutes"].value = str(totals['minutes'])
+        self.stat_values["Calories"].value = f"{totals['calories']}"
+        self.show_recommended_sport()
+        
+    def recommended_sport(self):
+        """Sport le plus pratiqué (séances, puis niveau) ; à défaut, le premier sport du catalogue"""
+        progress = self.sports_progress
+        if progress:
+            return max(progress, key=lambda sport: (progress[sport].get("sessions", 0), progress[sport].get("level", 1)))
+        return next((entry["sport"] for entry in self.catalog.entries if entry["kind"] == "sport"), SPORTS[0][0])
+        
+    def show_recommended_sport(self):
+        sport = self.recommended_sport()
+        progress = self.sports_progress.get(sport, {})
+        try:
+            emoji = self.catalog[slugify(sport)]["emoji"]
+        except KeyError:
+            emoji = "🏅"
+        self.home_sport = sport
+        self.home_sport_emoji.value = emoji
+        self.home_sport_title.value = sport
+        self.home_sport_detail.value = f"Niveau {progress.get('level', 1)} • {progress.get('sessions', 0)} séances"
+    
     def get_motivational_quote(self):
-        quotes = [
-            "La discipline est le pont entre les objectifs et leur réalisation.",
-            "Chaque séance vous rapproche de votre meilleur vous-même.",
-            "La persévérance transforme l'obstacle en opportunité.",
-            "Votre corps peut accomplir tout ce que votre esprit croit.",
-            "Le succès est la somme de petits efforts répétés jour après jour."
-        ]
-        return random.choice(quotes)
+        return random.choice(QUOTES)
         
     def stat_card(self, label, value, icon, color):
+        value_text = ft.Text(value, size=24, weight="bold", color=color)
+        self.stat_values[label] = value_text
         return ft.Container(
             width=110,
             height=100,
-            bgcolor=Colors.with_opacity(0.1, color),
+            bgcolor=tint(color, 0.1),
             border_radius=20,
-            border=ft.border.all(2, Colors.with_opacity(0.3, color)),
+            border=outline(2, color, 0.3),
             content=ft.Column([
                 ft.Icon(icon, color=color, size=30),
-                ft.Text(value, size=24, weight="bold", color=color),
+                value_text,
                 ft.Text(label, size=12, color="#888"),
             ], alignment="center", horizontal_alignment="center", spacing=5),
             padding=10,
-            animate_scale=ft.Animation(200, "easeOut"),
+            animate_scale=SCALE_ANIMATION,
         )
         
     def sports_screen(self):
-        sports_data = [
-            ("Judo", "🥋", "#ad1457", "#f50057", self.sports_progress.get("Judo", {})),
-            ("Yoga", "🧘", "#00695c", "#009688", self.sports_progress.get("Yoga", {})),
-            ("Musculation", "💪", "#b71c1c", "#f44336", self.sports_progress.get("Musculation", {})),
-            ("Karaté", "🥊", "#e65100", "#ff9800", self.sports_progress.get("Karaté", {})),
-            ("Course", "🏃", "#1565c0", "#2196f3", self.sports_progress.get("Course", {})),
-            ("Natation", "🏊", "#006064", "#00bcd4", self.sports_progress.get("Natation", {})),
-        ]
+        self.sport_card_refs = {}
+        self.no_results_text = ft.Text("Aucun résultat", size=14, color="#888", visible=False)
+        self.sports_grid = LazyGrid(
+            self.catalog,
+            self.sport_card,
+            page_size=SPORTS_PAGE_SIZE,
+            runs_count=2,
+            child_aspect_ratio=0.9,
+            spacing=15,
+            run_spacing=15,
+            padding=SCREEN_PADDING,
+            expand=True,
+            schedule=self.updates.mark_dirty,
+            release_item=lambda entry: self.sport_card_refs.pop(entry["id"], None),
+        )
         
-        cards = []
-        for i in range(0, len(sports_data), 2):
-            row_sports = [sports_data[i]]
-            if i + 1 < len(sports_data):
-                row_sports.append(sports_data[i + 1])
-            
-            row = ft.Row(
-                [self.sport_card(*sport) for sport in row_sports],
-                alignment="center",
-                spacing=15
-            )
-            cards.append(row)
-            cards.append(ft.Container(height=15))
-            
         return ft.Column([
             ft.Container(height=30),
             ft.Text(
@@ -498,103 +889,169 @@ class SmartTrainingApp:
                 color="#888",
                 text_align="center"
             ),
-            ft.Container(height=30),
-            *cards
-        ], horizontal_alignment="center", scroll=ft.ScrollMode.AUTO, expand=True)
+            ft.Container(height=15),
+            ft.Container(
+                content=ft.TextField(
+                    hint_text="Rechercher un sport, un exercice, un muscle…",
+                    prefix_icon=Icons.SEARCH,
+                    border_radius=25,
+                    border_color="#7c4dff",
+                    dense=True,
+                    on_change=self.search_changed,
+                ),
+                padding=SCREEN_PADDING,
+            ),
+            self.no_results_text,
+            ft.Container(height=15),
+            self.sports_grid.view,
+        ], horizontal_alignment="center", expand=True)
+        
+    def on_search(self, e):
+        query = e.control.value or ""
+        results = self.catalog if not query.strip() else Catalog(self.ensure_search_index().search(query))
+        self.no_results_text.visible = len(results) == 0
+        self.updates.mark_dirty(self.no_results_text)
+        self.sports_grid.reset(results)
+        
+    def refresh_sports(self):
+        for sport, level_text, sessions_text, xp_bar in self.sport_card_refs.values():
+            progress = self.sports_progress.get(sport, {})
+            level_text.value = f"Nv.{progress.get('level', 1)}"
+            sessions_text.value = f"{progress.get('sessions', 0)} séances"
+            xp_bar.width = 140 * curve_for(sport).fraction(progress.get("xp", 0))
         
-    def sport_card(self, title, emoji, color_from, color_to, progress):
+    def sport_card(self, entry):
+        title = entry["title"]
+        sport = entry["sport"]
+        color_from = entry["color_from"]
+        progress = self.sports_progress.get(sport, {})
         level = progress.get("level", 1)
         sessions = progress.get("sessions", 0)
         
-        card = ft.Container(
+        level_text = ft.Text(f"Nv.{level}", size=12, color="white", weight="bold")
+        sessions_text = ft.Text(f"{sessions} séances", size=10, color=tint("white", 0.8))
+        xp_bar = ft.Container(
+            width=140 * curve_for(sport).fraction(progress.get("xp", 0)),
+            height=6,
+            bgcolor="white",
+            border_radius=3,
+        )
+        # Seules les cartes présentes dans la grille sont suivies (retirées au recyclage)
+        self.sport_card_refs[entry["id"]] = (sport, level_text, sessions_text, xp_bar)
+        
+        return ft.Container(
             width=180,
             height=200,
-            gradient=ft.LinearGradient(
-                colors=[color_from, color_to],
-                begin=ft.alignment.top_left,
-                end=ft.alignment.bottom_right
-            ),
+            gradient=diagonal_gradient(color_from, entry["color_to"]),
             border_radius=25,
-            shadow=ft.BoxShadow(
-                blur_radius=15,
-                color=Colors.with_opacity(0.5, color_from),
-                offset=ft.Offset(0, 5)
-            ),
+            shadow=glow(color_from),
             content=ft.Column([
                 ft.Container(height=15),
                 ft.Row([
-                    ft.Text(f"Nv.{level}", size=12, color="white", weight="bold"),
+                    level_text,
                     ft.Container(expand=True),
-                    ft.Text(f"{sessions} séances", size=10, color=Colors.with_opacity(0.8, "white")),
+                    sessions_text,
                 ]),
-                ft.Text(emoji, size=60, text_align="center"),
-                ft.Text(title, size=20, weight="bold", color="white", text_align="center"),
+                ft.Text(entry["emoji"], size=60, text_align="center"),
+                ft.Text(title, size=20 if len(title) < 14 else 16, weight="bold", color="white", text_align="center"),
                 ft.Container(height=10),
                 ft.Container(
-                    content=ft.Container(
-                        width=140 * min(progress.get("xp", 0) / 1000, 1.0),
-                        height=6,
-                        bgcolor="white",
-                        border_radius=3,
-                    ),
+                    content=xp_bar,
                     width=140,
                     height=6,
-                    bgcolor=Colors.with_opacity(0.3, "white"),
+                    bgcolor=tint("white", 0.3),
                     border_radius=3,
                 ),
             ], alignment="center", horizontal_alignment="center"),
-            animate_scale=ft.Animation(200, "easeOut"),
-            on_click=lambda _, s=title: self.select_sport(s)
+            animate_scale=SCALE_ANIMATION,
+            on_click=lambda _, s=sport: self.select_sport(s),
+            on_hover=self.card_hover,
         )
         
-        def on_hover(e):
-            card.scale = 1.05 if e.data == "true" else 1.0
-            card.update()
-            
-        card.on_hover = on_hover
-        return card
+    def on_card_hover(self, e):
+        if patch(e.control, scale=1.05 if e.data == "true" else 1.0):
+            self.updates.mark_dirty(e.control)
         
+    @timed()
     def select_sport(self, sport):
         self.selected_sport = sport
-        self.page.show_snack_bar(
-            ft.SnackBar(
-                content=ft.Text(f"🎯 {sport} sélectionné - Prêt pour l'entraînement !"),
-                bgcolor="#7c4dff",
-                action="OK"
-            )
-        )
+        self.invalidate_screens()
+        self.notify(f"🎯 {sport} sélectionné - Prêt pour l'entraînement !", bgcolor="#7c4dff", action="OK")
         self.go_to(2)
         
     def solo_screen(self):
-        # Créer les contrôles conditionnels
-        camera_view = ft.Container()  # Conteneur vide par défaut
+        # Vue caméra : état du pipeline d'analyse (cadence, latence)
+        self.camera_status_text = ft.Text("Analyse en attente…", size=12, color="#888")
+        self.reps_text = ft.Text("Répétitions : 0", size=16, weight="bold", color="white")
+        camera_view = ft.Container(
+            content=ft.Column([
+                ft.Row([
+                    ft.Icon(Icons.FORMAT_LIST_NUMBERED, color="#00bcd4", size=20),
+                    self.reps_text,
+                ], spacing=10),
+                ft.Row([
+                    ft.Icon(Icons.VISIBILITY, color="#00bcd4", size=20),
+                    self.camera_status_text,
+                ], spacing=10),
+            ], spacing=8),
+            bgcolor=tint("#00bcd4", 0.05),
+            padding=15,
+            margin=CARD_MARGIN,
+            border_radius=15,
+            visible=self.camera_active,
+        )
+        self.camera_view = camera_view
+        
+        self.solo_sport_text = ft.Text(
+            f"Sport : {self.selected_sport or 'Non sélectionné'}",
+            size=14,
+            color="#7c4dff"
+        )
+        self.camera_icon = ft.Icon(
+            Icons.CAMERA if not self.camera_active else Icons.CAMERA_ENHANCE,
+            color="#00bcd4" if self.camera_active else "#888",
+            size=24
+        )
+        self.camera_label = ft.Text(
+            "Caméra IA " + ("Active" if self.camera_active else "Inactive"),
+            color="white",
+            expand=True
+        )
+        self.camera_switch = ft.Switch(
+            value=self.camera_active,
+            active_color="#00bcd4",
+            on_change=self.toggle_camera
+        )
+        self.session_button = ft.ElevatedButton(
+            "Démarrer la session IA" if not self.session_active else "Arrêter la session",
+            icon=Icons.PLAY_ARROW if not self.session_active else Icons.STOP,
+            width=340,
+            height=70,
+            style=self.session_button_style(),
+            on_click=self.toggle_session
+        )
+        self.session_timer_text = ft.Text(
+            f"Session en cours: 00:00",
+            size=16,
+            color="#00bcd4",
+            weight="bold",
+            visible=self.session_active
+        )
+        self.pause_button = ft.TextButton(
+            "Pause",
+            icon=Icons.PAUSE,
+            visible=self.session_active,
+            on_click=self.toggle_pause
+        )
+        if self.session_timer:
+            self.session_timer.attach(self.session_timer_text)
         
         session_controls = [
-            ft.ElevatedButton(
-                "Démarrer la session IA" if not self.session_active else "Arrêter la session",
-                icon=Icons.PLAY_ARROW if not self.session_active else Icons.STOP,
-                width=340,
-                height=70,
-                bgcolor="#00bcd4" if not self.session_active else "#f44336",
-                color="white",
-                style=ft.ButtonStyle(
-                    shape=ft.RoundedRectangleBorder(radius=35),
-                ),
-                on_click=self.toggle_session
-            )
+            self.session_button,
+            self.session_timer_text,
+            self.pause_button,
         ]
         
-        if self.session_active:
-            session_controls.extend([
-                ft.Container(height=10),
-                ft.Text(
-                    f"Session en cours: 00:00",
-                    size=16,
-                    color="#00bcd4",
-                    weight="bold"
-                )
-            ])
-        
         return ft.Column([
             ft.Container(height=40),
             
@@ -604,11 +1061,7 @@ class SmartTrainingApp:
                     ft.Icon(Icons.SMART_TOY, size=30, color="#7c4dff"),
                     ft.Column([
                         ft.Text("Mode Solo IA", size=24, weight="bold", color="white"),
-                        ft.Text(
-                            f"Sport : {self.selected_sport or 'Non sélectionné'}",
-                            size=14,
-                            color="#7c4dff"
-                        ),
+                        self.solo_sport_text,
                     ], expand=True),
                     ft.IconButton(
                         icon=Icons.INFO,
@@ -622,25 +1075,13 @@ class SmartTrainingApp:
             # État de la caméra
             ft.Container(
                 content=ft.Row([
-                    ft.Icon(
-                        Icons.CAMERA if not self.camera_active else Icons.CAMERA_ENHANCE,
-                        color="#00bcd4" if self.camera_active else "#888",
-                        size=24
-                    ),
-                    ft.Text(
-                        "Caméra IA " + ("Active" if self.camera_active else "Inactive"),
-                        color="white",
-                        expand=True
-                    ),
-                    ft.Switch(
-                        value=self.camera_active,
-                        active_color="#00bcd4",
-                        on_change=self.toggle_camera
-                    )
+                    self.camera_icon,
+                    self.camera_label,
+                    self.camera_switch,
                 ]),
-                bgcolor=Colors.with_opacity(0.05, "white"),
+                bgcolor=PANEL_BGCOLOR,
                 padding=15,
-                margin=ft.margin.symmetric(horizontal=20),
+                margin=CARD_MARGIN,
                 border_radius=15,
             ),
             
@@ -669,6 +1110,23 @@ class SmartTrainingApp:
             ),
         ], scroll=ft.ScrollMode.AUTO, expand=True)
     
+    def refresh_solo(self):
+        self.solo_sport_text.value = f"Sport : {self.selected_sport or 'Non sélectionné'}"
+        self.camera_icon.name = Icons.CAMERA if not self.camera_active else Icons.CAMERA_ENHANCE
+        self.camera_icon.color = "#00bcd4" if self.camera_active else "#888"
+        self.camera_label.value = "Caméra IA " + ("Active" if self.camera_active else "Inactive")
+        self.camera_switch.value = self.camera_active
+        self.camera_view.visible = self.camera_active
+        self.session_button.text = "Démarrer la session IA" if not self.session_active else "Arrêter la session"
+        self.session_button.icon = Icons.PLAY_ARROW if not self.session_active else Icons.STOP
+        self.session_button.style = self.session_button_style()
+        self.session_timer_text.visible = self.session_active
+        self.pause_button.visible = self.session_active
+        if self.session_timer:
+            self.session_timer.attach(self.session_timer_text)
+            self.pause_button.text = "Reprendre" if not self.session_timer.running else "Pause"
+            self.pause_button.icon = Icons.PLAY_ARROW if not self.session_timer.running else Icons.PAUSE
+    
     def show_ai_info(self):
         self.page.show_dialog(
             ft.AlertDialog(
@@ -683,39 +1141,168 @@ class SmartTrainingApp:
             )
         )
         
+    @timed()
     def toggle_camera(self, e):
         self.camera_active = e.control.value
-        self.page.update()
+        if self.camera_active:
+            self.start_camera()
+        else:
+            self.stop_camera()
+        self.updates.mark_dirty(*self.invalidate_screens())
+        
+    def start_camera(self):
+        """Démarre le pipeline caméra → estimation de posture (processus séparé, ou thread sur Android)"""
+        missing = [m for m in ("numpy", "cv2", "mediapipe") if importlib.util.find_spec(m) is None]
+        if missing:
+            self.camera_active = False
+            self.notify(f"📷 Analyse indisponible : {', '.join(missing)} manquant", bgcolor="#f44336")
+            return
+        from camera_pipeline import FramePipeline, MediaPipePoseEstimator, VideoSource, default_worker
+        from form_rules import FORM_RULES, FormChecker
+        from pose_analysis import RepCounter
+        try:
+            source = VideoSource(0)
+        except IOError as ex:
+            self.camera_active = False
+            self.notify(f"📷 {ex}", bgcolor="#f44336")
+            return
+        self.rep_counter = RepCounter(SPORT_EXERCISES.get(self.selected_sport, ("squat", "pushup")))
+        self.form_checker = FormChecker(FORM_RULES.get(self.selected_sport, []))
+        self.pose_buffer = []
+        self.camera_pipeline = FramePipeline(
+            source,
+            MediaPipePoseEstimator,
+            worker=default_worker(),
+            on_result=self.on_pose
+        ).start()
+        
+    def stop_camera(self):
+        if self.camera_pipeline:
+            self.camera_pipeline.stop()
+            self.camera_pipeline = None
+        
+    @timed()
+    def on_pose(self, frame_id, landmarks):
+        """Résultat du worker de posture (thread de collecte) ; l'état affiché est rafraîchi 1 fois/s"""
+        # Les répétitions sont comptées par lots de POSE_BATCH images
+        self.pose_buffer.append(landmarks)
+        if len(self.pose_buffer) >= POSE_BATCH:
+            import numpy as np
+            batch = np.stack([
+                np.full((33, 3), np.nan, dtype=np.float32) if points is None else points
+                for points in self.pose_buffer
+            ])
+            self.pose_buffer = []
+            self.rep_counter.update(batch)
+            for rule in self.form_checker.update(batch):
+                self.notify(f"⚠️ {rule['message']}", bgcolor="#ff6d00")
+            self.reps_text.value = "Répétitions : " + " • ".join(
+                f"{EXERCISE_LABELS.get(name, name)} {count}" for name, count in self.rep_counter.as_dict().items()
+            )
+        
+        now = time.monotonic()
+        if now - self.camera_status_at < 1.0:
+            return
+        self.camera_status_at = now
+        stats = self.camera_pipeline.stats()
+        self.camera_status_text.value = (
+            f"{stats['fps']:.0f} FPS • latence {stats['latency_ms_p50'] or 0:.0f} ms • "
+            f"{stats['dropped']} images ignorées"
+        )
+        if self.current_index == 2:
+            self.updates.mark_dirty(self.camera_view)
         
+    def session_button_style(self):
+        return button_style(35, color="white", bgcolor="#f44336" if self.session_active else "#00bcd4")
+        
+    @timed()
     def toggle_session(self, e):
         self.session_active = not self.session_active
         if self.session_active:
             self.session_start_time = datetime.now()
+            self.session_segments = []
             self.start_session_timer()
-            self.page.show_snack_bar(
-                ft.SnackBar(
-                    content=ft.Text("🎯 Session d'entraînement démarrée !"),
-                    bgcolor="#00bcd4"
-                )
-            )
+            self.open_segment()
+            self.notify("🎯 Session d'entraînement démarrée !", bgcolor="#00bcd4")
         else:
-            if self.session_timer:
-                self.page.controls.remove(self.session_timer)
-            session_duration = (datetime.now() - self.session_start_time).seconds // 60
-            self.stats['sessions'] += 1
-            self.stats['total_time'] += session_duration
-            self.stats['calories'] += random.randint(50, 150)
-            self.page.show_snack_bar(
-                ft.SnackBar(
-                    content=ft.Text(f"✅ Session terminée ! {session_duration} minutes d'entraînement."),
-                    bgcolor="#4caf50"
-                )
-            )
-        self.page.update()
+            self.close_segment()
+            session_duration = int(self.session_timer.stop()) // 60
+            self.session_timer = None
+            level = self.stats["level"]
+            sport = self.selected_sport or "Libre"
+            self.record_session({
+                "date": self.session_start_time.date().isoformat(),
+                "start": self.session_start_time.isoformat(timespec="seconds"),
+                "sport": sport,
+                "minutes": session_duration,
+                "calories": session_calories(
+                    sport, session_duration, self.profile.get("weight", DEFAULT_WEIGHT), self.session_segments
+                ),
+                "segments": self.session_segments,
+            })
+            message = f"✅ Session terminée ! {session_duration} minutes d'entraînement."
+            if self.stats["level"] > level:
+                message += f" 🎉 Niveau {self.stats['level']} atteint !"
+            self.notify(message, bgcolor="#4caf50")
+        self.updates.mark_dirty(*self.invalidate_screens())
+        
+    def record_session(self, record):
+        """Enregistre une séance terminée : agrégats, historique brut, XP et niveaux"""
+        with self.history_lock:
+            for sport, day, values in self.stats_engine.add_session(record):
+                self.store.record("incr", ["daily", sport, str(day)], values)
+            self.store.append_history(record)
+            self.calendar.add(record["date"])
+            if self.leaderboards:
+                self.leaderboards.submit(self.player_id, record["minutes"], datetime.fromisoformat(record["start"]).date())
+            if self.selected_sport:
+                self.sports_progress.setdefault(record["sport"], {"level": 1, "xp": 0, "sessions": 0})
+            self.apply_progression()
+            self.save_user_data()
+        
+    def current_reps(self):
+        return sum(self.rep_counter.as_dict().values()) if self.rep_counter else 0
+        
+    def open_segment(self):
+        self.segment_start = (self.session_timer.elapsed, self.current_reps(), self.rep_counter)
+        
+    def close_segment(self):
+        """Termine le segment en cours ; intensité déduite du rythme des répétitions si la caméra les compte"""
+        if self.segment_start is None:
+            return
+        elapsed, reps, counter = self.segment_start
+        self.segment_start = None
+        minutes = round((self.session_timer.elapsed - elapsed) / 60, 2)
+        if minutes <= 0:
+            return
+        intensity = MODERATE
+        if self.rep_counter is not None:
+            # Caméra démarrée pendant le segment : répétitions comptées depuis son démarrage
+            rate = (self.current_reps() - (reps if counter is self.rep_counter else 0)) / minutes
+            intensity = 0 if rate < 5 else 1 if rate < 15 else 2
+        self.session_segments.append([minutes, INTENSITIES[intensity]])
         
     def start_session_timer(self):
-        # Implémentation simplifiée du timer
-        pass
+        self.session_timer = SessionTimer(
+            self.page,
+            self.session_timer_text,
+            tick_interval=self.timer_tick,
+            is_shown=lambda: self.current_index == 2,
+            schedule=self.updates.mark_dirty
+        )
+        self.session_timer.start()
+        
+    @timed()
+    def toggle_pause(self, e):
+        if not self.session_timer:
+            return
+        if self.session_timer.running:
+            self.close_segment()
+            self.session_timer.pause()
+        else:
+            self.session_timer.resume()
+            self.open_segment()
+        self.updates.mark_dirty(*self.invalidate_screens())
         
     def feature_item(self, text, icon, subtitle):
         return ft.Container(
@@ -728,12 +1315,13 @@ class SmartTrainingApp:
                 ft.Icon(Icons.CHECK_CIRCLE, color="#4caf50", size=20),
             ], spacing=15),
             padding=15,
-            bgcolor=Colors.with_opacity(0.05, "#7c4dff"),
+            bgcolor=tint("#7c4dff", 0.05),
             border_radius=15,
             width=380
         )
         
     def group_screen(self):
+        self.group_online_text = ft.Text(self.online_label(), size=12, color="#4caf50")
         return ft.Column([
             ft.Container(height=60),
             ft.Icon(Icons.GROUPS, size=120, color="#ff6d00"),
@@ -749,9 +1337,9 @@ class SmartTrainingApp:
                         ft.Icon(Icons.PEOPLE, color="#ff6d00"),
                         ft.Text("Communauté Active", size=20, weight="bold", color="white", expand=True),
                         ft.Container(
-                            content=ft.Text(f"{random.randint(50, 200)} en ligne", size=12, color="#4caf50"),
-                            bgcolor=Colors.with_opacity(0.1, "#4caf50"),
-                            padding=ft.padding.symmetric(horizontal=8, vertical=4),
+                            content=self.group_online_text,
+                            bgcolor=tint("#4caf50", 0.1),
+                            padding=symmetric_padding(horizontal=8, vertical=4),
                             border_radius=10,
                         )
                     ]),
@@ -764,11 +1352,13 @@ class SmartTrainingApp:
                     ),
                 ]),
                 padding=20,
-                bgcolor=Colors.with_opacity(0.05, "#ff6d00"),
+                bgcolor=tint("#ff6d00", 0.05),
                 border_radius=20,
                 margin=20,
             ),
             
+            self.group_session_panel(),
+            
             ft.Container(height=20),
             
             ft.Container(
@@ -791,23 +1381,118 @@ class SmartTrainingApp:
                 icon=Icons.NOTIFICATIONS,
                 width=340,
                 height=60,
-                bgcolor="#ff6d00",
-                color="white",
-                style=ft.ButtonStyle(
-                    shape=ft.RoundedRectangleBorder(radius=30),
-                ),
-                on_click=lambda _: self.page.show_snack_bar(
-                    ft.SnackBar(content=ft.Text("✅ Nous vous tiendrons au courant !"))
-                )
+                style=button_style(30, color="white", bgcolor="#ff6d00"),
+                on_click=lambda _: self.notify("✅ Nous vous tiendrons au courant !")
             ),
             
             ft.Container(height=20),
             ft.Text("Lancement prévu : Décembre 2024", size=14, color="#888", italic=True),
         ], horizontal_alignment="center", scroll=ft.ScrollMode.AUTO, expand=True)
         
+    def group_session_panel(self):
+        self.group_status_text = ft.Text("Salle : " + (self.selected_sport or "Libre"), size=14, color="#888")
+        self.group_button = ft.ElevatedButton(
+            "Rejoindre la session",
+            icon=Icons.PLAY_ARROW,
+            style=button_style(20, color="white", bgcolor="#ff6d00"),
+            on_click=self.toggle_group_session,
+        )
+        self.group_participants = ft.Column(spacing=8)
+        return ft.Container(
+            content=ft.Column([
+                ft.Row([
+                    ft.Icon(Icons.PEOPLE, color="#ff6d00"),
+                    ft.Text("Session en direct", size=20, weight="bold", color="white", expand=True),
+                ]),
+                self.group_status_text,
+                self.group_participants,
+                self.group_button,
+            ], spacing=10),
+            padding=20,
+            bgcolor=PANEL_BGCOLOR,
+            border_radius=20,
+            margin=CARD_MARGIN,
+        )
+        
+    def toggle_group_session(self, e):
+        if self.group_client:
+            self.page.run_task(self.group_client.close)
+            return
+        self.group_client = GroupClient(
+            GROUP_HUB_URL,
+            slugify(self.selected_sport or "Libre"),
+            "Oussama",
+            state=self.group_state,
+            on_change=self.on_group_change,
+            sport=self.selected_sport or "Libre",
+        )
+        self.group_button.text = "Quitter la session"
+        self.group_button.icon = Icons.STOP
+        self.group_status_text.value = "Connexion…"
+        self.updates.mark_dirty(self.group_button, self.group_status_text)
+        self.page.run_task(self.run_group_session, self.group_client)
+        
+    async def run_group_session(self, client):
+        try:
+            await client.run()
+        except JoinError as ex:
+            self.notify(f"👥 Session refusée : {'salle complète' if str(ex) == 'full' else ex}", bgcolor="#f44336")
+        except OSError:
+            self.notify(f"👥 Hub de groupe injoignable : {GROUP_HUB_URL}", bgcolor="#f44336")
+        finally:
+            self.group_client = None
+            self.group_button.text = "Rejoindre la session"
+            self.group_button.icon = Icons.PLAY_ARROW
+            self.group_status_text.value = "Salle : " + (self.selected_sport or "Libre")
+            self.group_participants.controls.clear()
+            self.group_online_text.value = self.online_label()
+            self.updates.mark_dirty(
+                self.group_button, self.group_status_text, self.group_participants, self.group_online_text
+            )
+        
+    def online_label(self):
+        """Effectif en ligne annoncé par le hub (inconnu hors session)"""
+        client = self.group_client
+        if client is None or client.online is None:
+            return "– en ligne"
+        return f"{client.online[2]} en ligne"
+        
+    def group_state(self):
+        """État envoyé au hub à chaque tick : répétitions, chrono (s), score"""
+        reps = self.current_reps()
+        elapsed = int(self.session_timer.elapsed) if self.session_timer else 0
+        return {"r": reps, "tm": elapsed, "s": self.stats["xp"]}
+        
+    def on_group_change(self, client):
+        """Message du hub (boucle asyncio de la page) : classement de la salle"""
+        self.group_status_text.value = f"Salle {client.room} • {len(client.participants)} participant(s)"
+        self.group_online_text.value = self.online_label()
+        self.group_participants.controls = [
+            ft.Row([
+                ft.Text(f"{rank}.", size=14, color="#888", width=24),
+                ft.Text(name, size=14, color="#ff6d00" if me else "white", weight="bold" if me else None, expand=True),
+                ft.Text(f"{state['r']} rép. • {format_elapsed(state['tm'])}", size=12, color="#888"),
+                ft.Text(f"{state['s']} pts", size=14, color="#4caf50"),
+            ])
+            for rank, (name, state, me) in enumerate(client.ranking(), 1)
+        ]
+        self.updates.mark_dirty(self.group_status_text, self.group_participants, self.group_online_text)
+        
     def stats_screen(self):
-        weekly_data = [0.6, 0.8, 0.5, 0.9, 0.7, 0.4, 0.0]
-        days = ["Lun", "Mar", "Mer", "Jeu", "Ven", "Sam", "Dim"]
+        totals = self.stats_engine.totals()
+        week = self.stats_engine.week_totals()
+        month = self.stats_engine.month_totals()
+        
+        self.stat_row_values = {}
+        self.activity_title_text = ft.Text(size=20, weight="bold", color="white", expand=True)
+        self.activity_average_text = ft.Text(size=14, color="#7c4dff")
+        self.activity_chart = ActivityChart(self.stats_engine.range_sum, goal=DAILY_GOAL_MINUTES)
+        self.show_activity()
+        self.stats_sports_column = ft.Column([
+            ft.Text("Sports Maîtrisés", size=20, weight="bold", color="white"),
+            ft.Container(height=15),
+            *[self.sport_stat_row(sport, data) for sport, data in self.sports_progress.items()]
+        ])
         
         return ft.Column([
             ft.Container(height=30),
@@ -818,17 +1503,23 @@ class SmartTrainingApp:
             ft.Container(
                 content=ft.Column([
                     ft.Row([
-                        ft.Text("Activité cette semaine", size=20, weight="bold", color="white", expand=True),
-                        ft.Text(f"{sum(weekly_data[:5])/5:.0%} moyenne", size=14, color="#7c4dff"),
+                        self.activity_title_text,
+                        self.activity_average_text,
                     ]),
                     ft.Container(height=15),
-                    ft.Row([
-                        self.progress_bar(days[i], weekly_data[i], "#7c4dff" if weekly_data[i] > 0 else "#555")
-                        for i in range(7)
-                    ], alignment="center", spacing=5),
-                ], horizontal_alignment="center"),
+                    self.activity_chart.canvas,
+                    ft.Container(height=10),
+                    ft.SegmentedButton(
+                        segments=[
+                            ft.Segment(value=view, label=ft.Text(label))
+                            for view, (label, _, _) in ACTIVITY_VIEWS.items()
+                        ],
+                        selected={self.activity_view},
+                        on_change=self.select_activity_view,
+                    ),
+                ], horizontal_alignment=ft.CrossAxisAlignment.STRETCH),
                 padding=20,
-                bgcolor=Colors.with_opacity(0.05, "white"),
+                bgcolor=PANEL_BGCOLOR,
                 border_radius=20,
                 margin=20,
             ),
@@ -836,65 +1527,95 @@ class SmartTrainingApp:
             # Stats détaillées
             ft.Container(
                 content=ft.Column([
-                    self.stat_row("Total des séances", f"{self.stats['sessions']}", Icons.FITNESS_CENTER, "#9c27b0"),
+                    self.stat_row("Total des séances", f"{totals['sessions']}", Icons.FITNESS_CENTER, "#9c27b0"),
+                    ft.Divider(color="#333"),
+                    self.stat_row("Séances cette semaine", f"{week['sessions']}", Icons.DATE_RANGE, "#9c27b0"),
+                    ft.Divider(color="#333"),
+                    self.stat_row("Temps total", f"{totals['minutes']} min", Icons.TIMER, "#00bcd4"),
+                    ft.Divider(color="#333"),
+                    self.stat_row("Temps ce mois", f"{month['minutes']} min", Icons.CALENDAR_MONTH, "#00bcd4"),
                     ft.Divider(color="#333"),
-                    self.stat_row("Temps total", f"{self.stats['total_time']} min", Icons.TIMER, "#00bcd4"),
+                    self.stat_row("Calories brûlées", f"{totals['calories']} kcal", Icons.LOCAL_FIRE_DEPARTMENT, "#ff6d00"),
                     ft.Divider(color="#333"),
-                    self.stat_row("Calories brûlées", f"{self.stats['calories']} kcal", Icons.LOCAL_FIRE_DEPARTMENT, "#ff6d00"),
+                    self.stat_row("Série actuelle", self.streak_label(), Icons.TRENDING_UP, "#4caf50"),
                     ft.Divider(color="#333"),
-                    self.stat_row("Série actuelle", f"{self.stats['streak']} jours", Icons.TRENDING_UP, "#4caf50"),
+                    self.stat_row("Meilleure série", self.streak_label(self.calendar.longest()), Icons.WHATSHOT, "#4caf50"),
+                    ft.Divider(color="#333"),
+                    self.stat_row("Jours actifs ce mois", f"{self.calendar.month_active_days()}", Icons.EVENT_AVAILABLE, "#4caf50"),
                     ft.Divider(color="#333"),
                     self.stat_row("Niveau actuel", f"{self.stats['level']}", Icons.STAR, "#ffd700"),
                     ft.Divider(color="#333"),
-                    self.stat_row("Prochain niveau", f"{1000 - self.stats['xp']} XP", Icons.FLAG, "#7c4dff"),
+                    self.stat_row("Prochain niveau", self.next_level_label(), Icons.FLAG, "#7c4dff"),
                 ], spacing=8),
                 padding=20,
-                bgcolor=Colors.with_opacity(0.05, "white"),
+                bgcolor=PANEL_BGCOLOR,
                 border_radius=20,
                 margin=20,
             ),
             
             # Sports maîtrisés
             ft.Container(
-                content=ft.Column([
-                    ft.Text("Sports Maîtrisés", size=20, weight="bold", color="white"),
-                    ft.Container(height=15),
-                    *[self.sport_stat_row(sport, data) for sport, data in self.sports_progress.items()]
-                ]),
+                content=self.stats_sports_column,
                 padding=20,
-                bgcolor=Colors.with_opacity(0.05, "white"),
+                bgcolor=PANEL_BGCOLOR,
                 border_radius=20,
                 margin=20,
             ),
         ], scroll=ft.ScrollMode.AUTO, expand=True)
         
-    def progress_bar(self, day, value, color):
-        return ft.Column([
-            ft.Container(
-                width=35,
-                height=120,
-                bgcolor=Colors.with_opacity(0.1, "white"),
-                border_radius=8,
-                content=ft.Container(
-                    alignment=ft.alignment.bottom_center,
-                    content=ft.Container(
-                        width=35,
-                        height=120 * value,
-                        bgcolor=color,
-                        border_radius=8,
-                    )
-                )
-            ),
-            ft.Container(height=5),
-            ft.Text(day, size=12, color="#888"),
-            ft.Text(f"{value:.0%}", size=10, color=color),
-        ], spacing=2, horizontal_alignment="center")
+    def refresh_stats(self):
+        totals = self.stats_engine.totals()
+        week = self.stats_engine.week_totals()
+        month = self.stats_engine.month_totals()
+        self.show_activity()
+        self.stat_row_values["Total des séances"].value = f"{totals['sessions']}"
+        self.stat_row_values["Séances cette semaine"].value = f"{week['sessions']}"
+        self.stat_row_values["Temps total"].value = f"{totals['minutes']} min"
+        self.stat_row_values["Temps ce mois"].value = f"{month['minutes']} min"
+        self.stat_row_values["Calories brûlées"].value = f"{totals['calories']} kcal"
+        self.stat_row_values["Série actuelle"].value = self.streak_label()
+        self.stat_row_values["Meilleure série"].value = self.streak_label(self.calendar.longest())
+        self.stat_row_values["Jours actifs ce mois"].value = f"{self.calendar.month_active_days()}"
+        self.stat_row_values["Niveau actuel"].value = f"{self.stats['level']}"
+        self.stat_row_values["Prochain niveau"].value = self.next_level_label()
+        self.stats_sports_column.controls[2:] = [
+            self.sport_stat_row(sport, data) for sport, data in self.sports_progress.items()
+        ]
+        
+    def activity_range(self, view):
+        """Premier jour (ordinal) et nombre de jours d'une vue du graphique d'activité"""
+        today = datetime.now().date().toordinal()
+        monday = today - datetime.now().weekday()
+        if view == "week":
+            return monday, 7
+        if view == "month":
+            return today - 29, 30
+        if view == "year":
+            return today - 364, 365
+        # Calendrier : 52 semaines complètes plus la semaine en cours
+        return monday - 52 * 7, 52 * 7 + today - monday + 1
+        
+    def show_activity(self):
+        """Redessine le graphique d'activité pour la vue choisie"""
+        _, title, mode = ACTIVITY_VIEWS[self.activity_view]
+        start, days = self.activity_range(self.activity_view)
+        minutes = self.stats_engine.range_sum(start, start + days)
+        self.activity_title_text.value = title
+        self.activity_average_text.value = f"{min(minutes / (days * DAILY_GOAL_MINUTES), 1.0):.0%} moyenne"
+        self.activity_chart.show(mode, start, days)
+        
+    def select_activity_view(self, e):
+        self.activity_view = next(iter(e.control.selected), "week")
+        self.show_activity()
+        self.updates.mark_dirty(self.activity_title_text, self.activity_average_text, self.activity_chart.canvas)
         
     def stat_row(self, label, value, icon, color):
+        value_text = ft.Text(value, size=18, weight="bold", color=color)
+        self.stat_row_values[label] = value_text
         return ft.Row([
             ft.Icon(icon, color=color, size=28),
             ft.Text(label, size=16, color="white", expand=True),
-            ft.Text(value, size=18, weight="bold", color=color),
+            value_text,
         ], spacing=15)
     
     def sport_stat_row(self, sport, data):
@@ -908,12 +1629,12 @@ class SmartTrainingApp:
                 ], expand=True),
                 ft.Container(
                     content=ft.Text(f"{data.get('xp', 0)} XP", size=14, color="#7c4dff"),
-                    bgcolor=Colors.with_opacity(0.1, "#7c4dff"),
-                    padding=ft.padding.symmetric(horizontal=12, vertical=6),
+                    bgcolor=tint("#7c4dff", 0.1),
+                    padding=BADGE_PADDING,
                     border_radius=15,
                 ),
             ]),
-            padding=ft.padding.symmetric(vertical=8),
+            padding=symmetric_padding(vertical=8),
         )
         
     def settings_screen(self):
@@ -943,7 +1664,7 @@ class SmartTrainingApp:
                     ),
                 ]),
                 padding=20,
-                bgcolor=Colors.with_opacity(0.05, "white"),
+                bgcolor=PANEL_BGCOLOR,
                 border_radius=20,
                 margin=20,
             ),
@@ -978,7 +1699,38 @@ class SmartTrainingApp:
                     ),
                 ]),
                 padding=20,
-                bgcolor=Colors.with_opacity(0.05, "white"),
+                bgcolor=PANEL_BGCOLOR,
+                border_radius=20,
+                margin=20,
+            ),
+            
+            # Données
+            ft.Container(
+                content=ft.Column([
+                    ft.Text("Données", size=20, weight="bold", color="white"),
+                    ft.Container(height=15),
+                    ft.ListTile(
+                        leading=ft.Icon(Icons.TABLE_CHART, color="#7c4dff"),
+                        title=ft.Text("Exporter l'historique (CSV)", color="white"),
+                        on_click=lambda _: self.page.run_thread(self.export_history_file, ".csv"),
+                    ),
+                    ft.Divider(color="#333"),
+                    ft.ListTile(
+                        leading=ft.Icon(Icons.ARCHIVE, color="#7c4dff"),
+                        title=ft.Text("Exporter l'historique (compact)", color="white"),
+                        subtitle=ft.Text("Format binaire .sth, pour la sauvegarde", color="#888"),
+                        on_click=lambda _: self.page.run_thread(self.export_history_file, ".sth"),
+                    ),
+                    ft.Divider(color="#333"),
+                    ft.ListTile(
+                        leading=ft.Icon(Icons.UPLOAD_FILE, color="#7c4dff"),
+                        title=ft.Text("Importer un historique", color="white"),
+                        subtitle=ft.Text("Fichier .csv ou .sth", color="#888"),
+                        on_click=self.pick_history_file,
+                    ),
+                ]),
+                padding=20,
+                bgcolor=PANEL_BGCOLOR,
                 border_radius=20,
                 margin=20,
             ),
@@ -991,19 +1743,131 @@ class SmartTrainingApp:
                     trailing=ft.Icon(Icons.CHEVRON_RIGHT, color="#888"),
                     on_click=lambda _: self.go_to(6)
                 ),
-                bgcolor=Colors.with_opacity(0.05, "white"),
+                bgcolor=PANEL_BGCOLOR,
                 border_radius=15,
                 margin=20,
             ),
         ], scroll=ft.ScrollMode.AUTO, expand=True)
     
+    def export_history_file(self, suffix):
+        """Exporte history.jsonl dans le dossier exports/ des données (thread de travail)"""
+        try:
+            # Séances encore en file : l'export les manquerait
+            if not self.store.flush():
+                self.notify("Export impossible : écriture de l'historique en cours, réessayez", bgcolor="#f44336")
+                return
+            if not os.path.exists(self.store.history_path):
+                self.notify("Aucune séance à exporter")
+                return
+            folder = os.path.join(self.store.root, "exports")
+            os.makedirs(folder, exist_ok=True)
+            path = os.path.join(folder, f"historique-{datetime.now():%Y%m%d-%H%M%S}{suffix}")
+            count = export_history(self.store.history_path, path)
+        except OSError as ex:
+            self.notify(f"Export impossible : {ex}", bgcolor="#f44336")
+            return
+        self.notify(f"📦 {count} séances exportées : {path}", bgcolor="#4caf50")
+        
+    def pick_history_file(self, e):
+        if self.file_picker is None:
+            self.file_picker = ft.FilePicker(on_result=self.on_history_file)
+            self.page.overlay.append(self.file_picker)
+            # Le sélecteur doit exister côté client avant pick_files
+            self.updates.flush_now(self.page)
+        self.file_picker.pick_files(dialog_title="Importer un historique", allowed_extensions=["csv", "sth"])
+        
+    def on_history_file(self, e):
+        if not e.files:
+            return
+        path = e.files[0].path
+        if path is None:
+            # Navigateur : le fichier n'est pas accessible au serveur sans téléversement
+            self.notify("Import disponible dans l'application de bureau", bgcolor="#f44336")
+            return
+        self.page.run_thread(self.import_history_file, path)
+        
+    def import_history_file(self, path):
+        try:
+            # Tout le fichier est vérifié avant d'appliquer la moindre séance
+            validate_history(path)
+            added, skipped = self.import_sessions(import_history(path))
+        except (OSError, ValueError) as ex:
+            self.notify(f"Import impossible : {ex}", bgcolor="#f44336")
+            return
+        self.updates.mark_dirty(*self.invalidate_screens())
+        self.notify(f"📥 {added} séances importées ({skipped} déjà présentes)", bgcolor="#4caf50")
+        
+    def import_sessions(self, chunks):
+        """Ajoute par paquets les séances absentes de l'historique ; renvoie (ajoutées, ignorées)"""
+        # Séances déjà présentes : même jour, début, sport et durée
+        self.flush_history()
+        known = history_keys(self.store.history_path)
+        added = skipped = 0
+        for chunk in chunks:
+            fresh = []
+            for record in chunk:
+                key = session_key(record)
+                if key in known:
+                    skipped += 1
+                    continue
+                known.add(key)
+                fresh.append(record)
+            # Un incrément journalisé par jour et par sport du paquet
+            with self.history_lock:
+                increments = {}
+                for record in fresh:
+                    for sport, day, values in self.stats_engine.add_session(record):
+                        total = increments.setdefault((sport, day), [0] * len(values))
+                        for i, value in enumerate(values):
+                            total[i] += value
+                    self.store.append_history(record)
+                    self.calendar.add(record["date"])
+                    if record["sport"] != "Libre":
+                        self.sports_progress.setdefault(record["sport"], {"level": 1, "xp": 0, "sessions": 0})
+                for (sport, day), values in increments.items():
+                    self.store.record("incr", ["daily", sport, str(day)], values)
+            # Attend l'écriture du paquet : la file du stockage ne dépasse jamais un paquet
+            self.flush_history()
+            added += len(fresh)
+        with self.history_lock:
+            if self.leaderboards:
+                self.leaderboards.join(
+                    self.player_id, self.stats_engine.totals()["minutes"], self.stats_engine.week_totals()["minutes"]
+                )
+            self.apply_progression()
+            self.save_user_data()
+        return added, skipped
+        
+    def flush_history(self):
+        """Attend l'écriture de l'historique ; OSError si le stockage ne suit plus"""
+        if not self.store.flush(timeout=60.0):
+            raise TimeoutError(f"écriture bloquée dans {self.store.root}")
+        
     def edit_profile(self):
+        weight_field = ft.TextField(
+            label="Poids (kg)", value=f"{self.profile.get('weight', DEFAULT_WEIGHT):g}", keyboard_type=ft.KeyboardType.NUMBER
+        )
+        
+        def save(_):
+            try:
+                weight = float(weight_field.value.replace(",", "."))
+            except ValueError:
+                weight = 0
+            if not 20 <= weight <= 300:
+                weight_field.error_text = "Poids entre 20 et 300 kg"
+                self.updates.mark_dirty(weight_field)
+                return
+            self.profile["weight"] = weight
+            self.save_user_data()
+            self.page.close_dialog()
+        
         self.page.show_dialog(
             ft.AlertDialog(
                 title=ft.Text("Modifier le profil"),
                 content=ft.Column([
                     ft.TextField(label="Nom", value="Oussama"),
                     ft.TextField(label="Âge", value="25"),
+                    weight_field,
                     ft.Dropdown(
                         label="Niveau",
                         value="Intermediaire",
@@ -1017,7 +1881,7 @@ class SmartTrainingApp:
                 ], tight=True),
                 actions=[
                     ft.TextButton("Annuler", on_click=lambda _: self.page.close_dialog()),
-                    ft.TextButton("Sauvegarder", on_click=lambda _: self.page.close_dialog()),
+                    ft.TextButton("Sauvegarder", on_click=save),
                 ]
             )
         )
@@ -1053,7 +1917,7 @@ class SmartTrainingApp:
                     ),
                 ]),
                 padding=20,
-                bgcolor=Colors.with_opacity(0.05, "white"),
+                bgcolor=PANEL_BGCOLOR,
                 border_radius=20,
                 margin=20,
             ),
@@ -1099,4 +1963,4 @@ def main(page: ft.Page):
     SmartTrainingApp(page)
 
 if __name__ == "__main__":
-    ft.app(target=main)
\ No newline at end of file
+    ft.app(target=main, assets_dir="assets")
\ No newline at end of file
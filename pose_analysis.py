@@ -0,0 +1,126 @@
+"""Angles articulaires et comptage des répétitions, vectorisés avec NumPy.
+
+Les points de posture arrivent par lots ``(images × articulations × 3)``
+(format MediaPipe Pose, 33 points). Les angles de toutes les images sont
+calculés en une seule passe, puis lissés par moyenne glissante ; les
+répétitions sont détectées par hystérésis (seuil bas / seuil haut) sans
+boucle Python par image. L'état est conservé d'un lot à l'autre pour
+fonctionner en flux.
+"""
+import numpy as np
+
+# Indices MediaPipe Pose
+LANDMARKS = {
+    "nose": 0,
+    "left_shoulder": 11, "right_shoulder": 12,
+    "left_elbow": 13, "right_elbow": 14,
+    "left_wrist": 15, "right_wrist": 16,
+    "left_hip": 23, "right_hip": 24,
+    "left_knee": 25, "right_knee": 26,
+    "left_ankle": 27, "right_ankle": 28,
+}
+
+# Angle au sommet du point central : (extrémité, sommet, extrémité)
+JOINT_ANGLES = {
+    "left_elbow": ("left_shoulder", "left_elbow", "left_wrist"),
+    "right_elbow": ("right_shoulder", "right_elbow", "right_wrist"),
+    "left_shoulder": ("left_elbow", "left_shoulder", "left_hip"),
+    "right_shoulder": ("right_elbow", "right_shoulder", "right_hip"),
+    "left_hip": ("left_shoulder", "left_hip", "left_knee"),
+    "right_hip": ("right_shoulder", "right_hip", "right_knee"),
+    "left_knee": ("left_hip", "left_knee", "left_ankle"),
+    "right_knee": ("right_hip", "right_knee", "right_ankle"),
+}
+
+# Une répétition = passage sous `low` puis retour au-dessus de `high`
+EXERCISES = {
+    "squat": {"angles": ("left_knee", "right_knee"), "low": 100.0, "high": 160.0},
+    "pushup": {"angles": ("left_elbow", "right_elbow"), "low": 90.0, "high": 155.0},
+    "curl": {"angles": ("left_elbow", "right_elbow"), "low": 50.0, "high": 140.0},
+    "shoulder_press": {"angles": ("left_shoulder", "right_shoulder"), "low": 70.0, "high": 150.0},
+}
+
+ANGLE_NAMES = tuple(JOINT_ANGLES)
+_TRIPLETS = np.array(
+    [[LANDMARKS[point] for point in JOINT_ANGLES[name]] for name in ANGLE_NAMES], dtype=np.intp
+)
+
+
+def joint_angles(landmarks, names=ANGLE_NAMES):
+    """Angles (degrés) de toutes les images : (F, J, 3) → (F, len(names))"""
+    landmarks = np.asarray(landmarks, dtype=np.float32)
+    triplets = _TRIPLETS if names is ANGLE_NAMES else _TRIPLETS[[ANGLE_NAMES.index(n) for n in names]]
+    a = landmarks[:, triplets[:, 0]]
+    b = landmarks[:, triplets[:, 1]]
+    c = landmarks[:, triplets[:, 2]]
+    ba = a - b
+    bc = c - b
+    cosine = np.einsum("fkd,fkd->fk", ba, bc) / (
+        np.linalg.norm(ba, axis=-1) * np.linalg.norm(bc, axis=-1) + 1e-9
+    )
+    return np.degrees(np.arccos(np.clip(cosine, -1.0, 1.0)))
+
+
+class RepCounter:
+    """Compte les répétitions de plusieurs exercices en parallèle, lot par lot"""
+
+    def __init__(self, exercises=("squat",), smoothing=5):
+        self.exercises = tuple(exercises)
+        self.smoothing = smoothing
+        specs = [EXERCISES[name] for name in self.exercises]
+        self._angle_names = tuple(sorted({a for spec in specs for a in spec["angles"]}, key=ANGLE_NAMES.index))
+        # Matrice de moyenne : angles → signal de chaque exercice (moyenne gauche/droite)
+        self._mix = np.zeros((len(self._angle_names), len(specs)), dtype=np.float32)
+        for e, spec in enumerate(specs):
+            for angle in spec["angles"]:
+                self._mix[self._angle_names.index(angle), e] = 1.0 / len(spec["angles"])
+        self._low = np.array([spec["low"] for spec in specs], dtype=np.float32)
+        self._high = np.array([spec["high"] for spec in specs], dtype=np.float32)
+        self.reset()
+
+    def reset(self):
+        self.counts = np.zeros(len(self.exercises), dtype=np.int64)
+        self._state = np.full(len(self.exercises), -1, dtype=np.int8)
+        self._tail = np.empty((0, len(self.exercises)), dtype=np.float32)
+
+    def signal(self, landmarks):
+        """Signal angulaire brut par exercice : (F, E)"""
+        return joint_angles(landmarks, self._angle_names) @ self._mix
+
+    def _smooth(self, signal):
+        # Moyenne glissante causale, en reprenant les dernières valeurs du lot précédent
+        window = self.smoothing
+        if window <= 1:
+            return signal
+        extended = np.concatenate([self._tail, signal])
+        self._tail = extended[-(window - 1):]
+        # Les images sans posture détectée (NaN) sont exclues de la moyenne
+        valid = ~np.isnan(extended)
+        zeros = np.zeros((1, signal.shape[1]))
+        sums = np.concatenate([zeros, np.cumsum(np.where(valid, extended, 0.0), axis=0, dtype=np.float64)])
+        counts = np.concatenate([zeros, np.cumsum(valid, axis=0)])
+        ends = np.arange(len(extended) - len(signal), len(extended)) + 1
+        starts = np.maximum(ends - window, 0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return ((sums[ends] - sums[starts]) / (counts[ends] - counts[starts])).astype(np.float32)
+
+    def update(self, landmarks):
+        """Traite un lot (F, J, 3) ; renvoie les répétitions ajoutées par exercice"""
+        if len(landmarks) == 0:
+            return np.zeros(len(self.exercises), dtype=np.int64)
+        signal = self._smooth(self.signal(landmarks))
+
+        # 0 = position basse, 1 = position haute, -1 = zone d'hystérésis (état inchangé)
+        raw = np.where(signal < self._low, 0, np.where(signal > self._high, 1, -1)).astype(np.int8)
+        raw = np.concatenate([self._state[None, :], raw])
+        frames = np.arange(len(raw))[:, None]
+        last_known = np.maximum.accumulate(np.where(raw >= 0, frames, 0), axis=0)
+        states = np.take_along_axis(raw, last_known, axis=0)
+
+        added = np.count_nonzero((states[:-1] == 0) & (states[1:] == 1), axis=0)
+        self._state = states[-1].copy()
+        self.counts += added
+        return added
+
+    def as_dict(self):
+        return dict(zip(self.exercises, self.counts.tolist()))
@@ -0,0 +1,111 @@
+"""Présence en ligne : battements de cœur et expiration par roue temporelle.
+
+Un utilisateur est en ligne tant qu'il envoie un battement au moins toutes les
+`ttl` secondes. Au lieu de parcourir tous les utilisateurs pour trouver ceux
+qui ont expiré, chaque échéance est rangée dans une case d'une roue
+temporelle (une case par `resolution` secondes) ; ``expire`` ne vide que les
+cases écoulées depuis l'appel précédent :
+
+    heartbeat   O(1)   (la case change au plus une fois par `resolution`)
+    expire      O(1) amorti par utilisateur expiré, indépendant du nombre en ligne
+    online      O(1)   (compteurs par salle et par sport tenus à jour)
+"""
+import math
+import time
+
+TTL = 15.0
+RESOLUTION = 1.0
+
+
+class Presence:
+    def __init__(self, ttl=TTL, resolution=RESOLUTION, clock=time.monotonic):
+        self.ttl = ttl
+        self.resolution = resolution
+        self.clock = clock
+        self.wheel = [set() for _ in range(math.ceil(ttl / resolution) + 2)]
+        # utilisateur → [case d'échéance, salle, sport]
+        self.users = {}
+        self.rooms = {}
+        self.sports = {}
+        self.cursor = None
+        self.expired = 0
+
+    def _slot(self, at):
+        return math.floor(at / self.resolution)
+
+    def __len__(self):
+        return len(self.users)
+
+    def __contains__(self, user):
+        return user in self.users
+
+    def heartbeat(self, user, room=None, sport=None, now=None):
+        """Prolonge la présence ; renvoie True si l'utilisateur vient d'arriver"""
+        # Case arrondie au-dessus : présent au moins `ttl` secondes, au plus `ttl + resolution`
+        slot = math.ceil(((self.clock() if now is None else now) + self.ttl) / self.resolution)
+        entry = self.users.get(user)
+        if entry is None:
+            self.users[user] = [slot, room, sport]
+            self._count(room, sport, 1)
+            self.wheel[slot % len(self.wheel)].add(user)
+            return True
+        if (room, sport) != (entry[1], entry[2]):
+            self._count(entry[1], entry[2], -1)
+            self._count(room, sport, 1)
+            entry[1], entry[2] = room, sport
+        if slot != entry[0]:
+            self.wheel[entry[0] % len(self.wheel)].discard(user)
+            self.wheel[slot % len(self.wheel)].add(user)
+            entry[0] = slot
+        return False
+
+    def leave(self, user):
+        entry = self.users.pop(user, None)
+        if entry is None:
+            return False
+        self.wheel[entry[0] % len(self.wheel)].discard(user)
+        self._count(entry[1], entry[2], -1)
+        return True
+
+    def expire(self, now=None):
+        """Retire les utilisateurs dont l'échéance est passée ; renvoie leur liste"""
+        current = self._slot(self.clock() if now is None else now)
+        expired = []
+        # Un tour de roue au plus, même après une longue pause
+        start = current - len(self.wheel) + 1
+        for slot in range(start if self.cursor is None else max(self.cursor, start), current + 1):
+            bucket = self.wheel[slot % len(self.wheel)]
+            if not bucket:
+                continue
+            kept = set()
+            for user in bucket:
+                entry = self.users[user]
+                if entry[0] > current:
+                    # Échéance d'un tour suivant (expire appelé en retard) : reste dans sa case
+                    kept.add(user)
+                    continue
+                del self.users[user]
+                self._count(entry[1], entry[2], -1)
+                expired.append(user)
+            self.wheel[slot % len(self.wheel)] = kept
+        self.cursor = current + 1
+        self.expired += len(expired)
+        return expired
+
+    def _count(self, room, sport, delta):
+        for counts, key in ((self.rooms, room), (self.sports, sport)):
+            if key is None:
+                continue
+            value = counts.get(key, 0) + delta
+            if value:
+                counts[key] = value
+            else:
+                del counts[key]
+
+    def online(self, room=None, sport=None):
+        """En ligne dans une salle, pour un sport, ou au total"""
+        if room is not None:
+            return self.rooms.get(room, 0)
+        if sport is not None:
+            return self.sports.get(sport, 0)
+        return len(self.users)
@@ -0,0 +1,110 @@
+"""Progression : XP gagnée à l'entraînement et niveaux, global et par sport.
+
+Une séance rapporte ``XP_PER_SESSION`` plus ``XP_PER_MINUTE`` par minute ;
+l'XP d'un profil est donc une fonction linéaire des totaux déjà agrégés
+(séances, minutes) et n'a pas à être stockée à part.
+
+Une courbe (``Curve``) donne l'XP nécessaire pour passer chaque niveau. Elle
+est précalculée en table de seuils cumulés (XP totale pour atteindre le
+niveau n) : le niveau d'un total d'XP est une seule recherche dichotomique.
+Changer une courbe ne touche pas aux données, seulement aux niveaux qu'on en
+déduit ; ``recompute`` recalcule XP et niveaux de tous les profils à partir
+de l'historique des séances en une passe vectorisée (NumPy, importé à la
+demande).
+"""
+import bisect
+
+XP_PER_SESSION = 50
+XP_PER_MINUTE = 10
+
+
+class Curve:
+    """Niveau n → n+1 : round(base × growth^(n-1)) XP, jusqu'à max_level"""
+
+    def __init__(self, base=1000, growth=1.2, max_level=100):
+        self.base = base
+        self.growth = growth
+        self.max_level = max_level
+        # thresholds[n - 1] : XP totale pour atteindre le niveau n
+        self.thresholds = [0]
+        for level in range(1, max_level):
+            self.thresholds.append(self.thresholds[-1] + round(base * growth ** (level - 1)))
+        self._array = None
+
+    def level(self, xp):
+        return bisect.bisect_right(self.thresholds, xp)
+
+    def progress(self, xp):
+        """(niveau, XP acquise dans le niveau, XP du niveau) ; XP du niveau None au niveau maximal"""
+        level = self.level(xp)
+        start = self.thresholds[level - 1]
+        if level >= self.max_level:
+            return level, xp - start, None
+        return level, xp - start, self.thresholds[level] - start
+
+    def fraction(self, xp):
+        """Avancement dans le niveau courant, entre 0 et 1"""
+        _, done, needed = self.progress(xp)
+        return 1.0 if needed is None else done / needed
+
+    def levels(self, xp):
+        """Niveaux d'un tableau d'XP (NumPy)"""
+        import numpy as np
+
+        if self._array is None:
+            self._array = np.asarray(self.thresholds, dtype=np.int64)
+        return np.searchsorted(self._array, xp, side="right")
+
+
+GLOBAL_CURVE = Curve(base=1000, growth=1.2)
+SPORT_CURVE = Curve(base=500, growth=1.25)
+# Sports aux séances plus longues ou plus fréquentes : progression plus lente
+SPORT_CURVES = {
+    "Course": Curve(base=700, growth=1.25),
+    "Natation": Curve(base=700, growth=1.25),
+    "Musculation": Curve(base=600, growth=1.25),
+}
+
+
+def curve_for(sport=None):
+    if sport is None:
+        return GLOBAL_CURVE
+    return SPORT_CURVES.get(sport, SPORT_CURVE)
+
+
+def session_xp(minutes):
+    return XP_PER_SESSION + XP_PER_MINUTE * minutes
+
+
+def total_xp(sessions, minutes):
+    """XP de `sessions` séances totalisant `minutes` minutes"""
+    return XP_PER_SESSION * sessions + XP_PER_MINUTE * minutes
+
+
+def recompute(users, sports, minutes, user_count, sport_names):
+    """XP et niveaux de tous les profils depuis l'historique, en une passe.
+
+    `users`, `sports`, `minutes` : un élément par séance (indice du profil,
+    indice du sport dans `sport_names`, durée). Renvoie un dictionnaire de
+    tableaux : xp et level (user_count,), sport_xp et sport_level
+    (user_count, len(sport_names)).
+    """
+    import numpy as np
+
+    users = np.asarray(users, dtype=np.int64)
+    sports = np.asarray(sports, dtype=np.int64)
+    xp = XP_PER_SESSION + XP_PER_MINUTE * np.asarray(minutes, dtype=np.int64)
+    sport_count = len(sport_names)
+    per_user = np.bincount(users, weights=xp, minlength=user_count).astype(np.int64)
+    per_sport = np.bincount(
+        users * sport_count + sports, weights=xp, minlength=user_count * sport_count
+    ).astype(np.int64).reshape(user_count, sport_count)
+    sport_level = np.empty_like(per_sport)
+    for column, sport in enumerate(sport_names):
+        sport_level[:, column] = curve_for(sport).levels(per_sport[:, column])
+    return {
+        "xp": per_user,
+        "level": GLOBAL_CURVE.levels(per_user),
+        "sport_xp": per_sport,
+        "sport_level": sport_level,
+    }
@@ -0,0 +1,167 @@
+"""Recherche instantanée dans le catalogue (saisie au fil de la frappe).
+
+Les textes sont normalisés sans accents ni casse (« karate » trouve
+« Karaté »). L'index associe chaque mot normalisé à la liste des entrées qui
+le contiennent, pondérée par champ (titre > sport > muscles, tags). Les mots
+sont aussi rangés dans une liste triée : tous les mots commençant par un
+préfixe forment une plage contiguë trouvée par dichotomie (l'équivalent d'un
+trie, en plus compact et directement sérialisable).
+
+Une requête de plusieurs mots renvoie les entrées qui contiennent chacun
+d'eux (en préfixe), classées par score. Pendant la frappe du dernier mot, le
+résultat des mots précédents est réutilisé d'une touche à l'autre.
+
+L'index est sérialisé (pickle) avec une empreinte du catalogue : il n'est
+reconstruit que si le catalogue change.
+"""
+import bisect
+import hashlib
+import heapq
+import os
+import pickle
+import unicodedata
+
+FIELD_WEIGHTS = {"title": 4.0, "sport": 2.0, "muscles": 1.0, "tags": 1.0}
+FORMAT_VERSION = 1
+
+
+def normalize(text):
+    """Minuscules, sans accents, ponctuation remplacée par des espaces"""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(c if c.isalnum() else " " for c in decomposed if not unicodedata.combining(c))
+
+
+def tokenize(text):
+    return normalize(text).split()
+
+
+def fingerprint(entries):
+    digest = hashlib.sha256()
+    for entry in entries:
+        digest.update(repr([entry.get(field) for field in ("id", *FIELD_WEIGHTS)]).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class SearchIndex:
+    def __init__(self, entries):
+        self.entries = list(entries)
+        self.fingerprint = fingerprint(self.entries)
+        # Départage intégré au score : à poids égal, l'entrée la plus haute du catalogue gagne.
+        # Le classement se fait alors sur la seule valeur du score (clé de tri native).
+        tie = 1e-3 / (len(self.entries) + 1)
+        postings = {}
+        for doc, entry in enumerate(self.entries):
+            for field, weight in FIELD_WEIGHTS.items():
+                value = entry.get(field) or ""
+                words = value if isinstance(value, list) else [value]
+                for term in {t for word in words for t in tokenize(word)}:
+                    scores = postings.setdefault(term, {})
+                    scores[doc] = scores.get(doc, -doc * tie) + weight
+        self.terms = sorted(postings)
+        self.postings = postings
+        # Préfixes d'une lettre : les plus larges, fusionnés d'avance
+        self.short_prefixes = {}
+        for letter in {term[0] for term in self.terms}:
+            self.short_prefixes[letter] = self._merge(self.prefix_range(letter))
+        self._last = None
+
+    def prefix_range(self, prefix):
+        """Mots de l'index commençant par `prefix` (plage de self.terms)"""
+        start = bisect.bisect_left(self.terms, prefix)
+        end = bisect.bisect_left(self.terms, prefix + "￿", start)
+        return self.terms[start:end]
+
+    def _merge(self, terms, candidates=None):
+        scores = {}
+        for term in terms:
+            posting = self.postings[term]
+            docs = posting.keys() if candidates is None else posting.keys() & candidates.keys()
+            get = scores.get
+            for doc in docs:
+                weight = posting[doc]
+                if doc not in scores or weight > get(doc):
+                    scores[doc] = weight
+        return scores
+
+    def _token_scores(self, token, candidates=None):
+        """{document: score} du meilleur mot commençant par `token`, parmi `candidates` si fourni"""
+        if candidates is not None and not candidates:
+            return {}
+        # Dictionnaires de l'index partagés tels quels : les résultats ne sont jamais modifiés
+        if candidates is None and token in self.short_prefixes:
+            return self.short_prefixes[token]
+        terms = self.prefix_range(token)
+        if len(terms) == 1 and candidates is None:
+            return self.postings[terms[0]]
+        return self._merge(terms, candidates)
+
+    def matches(self, query):
+        """{document: score} des entrées contenant tous les mots de la requête (en préfixe)"""
+        tokens = tokenize(query)
+        if not tokens:
+            self._last = None
+            return None
+        head, tail = tokens[:-1], tokens[-1]
+        # Lu une seule fois : l'index peut être partagé entre sessions (threads)
+        last = self._last
+        if last and last[0] == head:
+            # Frappe dans le dernier mot : les mots précédents sont déjà évalués
+            base = last[1]
+        else:
+            base = None
+            for token in head:
+                scores = self._token_scores(token, base)
+                base = scores if base is None else {doc: base[doc] + s for doc, s in scores.items()}
+        self._last = (head, base)
+        scores = self._token_scores(tail, base)
+        return scores if base is None else {doc: base[doc] + s for doc, s in scores.items()}
+
+    def search(self, query, limit=200):
+        """Entrées correspondantes, les mieux classées d'abord ; tout le catalogue si la requête est vide"""
+        totals = self.matches(query)
+        if totals is None:
+            return self.entries[:limit] if limit else list(self.entries)
+        best = heapq.nlargest(limit, totals, key=totals.get) if limit else sorted(totals, key=totals.get, reverse=True)
+        return [self.entries[doc] for doc in best]
+
+    def save(self, path):
+        tmp_path = path + ".tmp"
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            pickle.dump(
+                {
+                    "version": FORMAT_VERSION,
+                    "fingerprint": self.fingerprint,
+                    "terms": self.terms,
+                    "postings": self.postings,
+                    "short_prefixes": self.short_prefixes,
+                },
+                f,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load_or_build(cls, entries, path):
+        """Index sérialisé s'il correspond au catalogue, sinon reconstruit et réécrit"""
+        entries = list(entries)
+        try:
+            with open(path, "rb") as f:
+                data = pickle.load(f)
+            if data["version"] == FORMAT_VERSION and data["fingerprint"] == fingerprint(entries):
+                index = cls.__new__(cls)
+                index.entries = entries
+                index.fingerprint = data["fingerprint"]
+                index.terms = data["terms"]
+                index.postings = data["postings"]
+                index.short_prefixes = data["short_prefixes"]
+                index._last = None
+                return index
+        except (OSError, EOFError, KeyError, pickle.UnpicklingError):
+            pass
+        index = cls(entries)
+        try:
+            index.save(path)
+        except OSError:
+            pass
+        return index
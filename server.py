@@ -0,0 +1,214 @@
+"""Mode serveur : plusieurs clients web servis par un même processus.
+
+    python server.py --port 8550
+
+Avec ``ft.app`` seul, chaque connexion crée une ``SmartTrainingApp`` complète
+avec ses propres catalogue, index de recherche, classements et cache de
+ressources. Ici, tout ce qui ne dépend pas de l'utilisateur est chargé une
+fois et partagé (``SharedResources``) ; les tables de constantes et les
+styles sont déjà au niveau des modules. Chaque session ne garde que ses
+données (dossier propre sous ``users/``) et les écrans qu'elle affiche. Les
+sessions d'un même utilisateur (plusieurs onglets) partagent son
+``JournalStore`` : un seul écrivain et une seule séquence par dossier.
+
+``SessionRegistry`` suit les sessions ouvertes : une session sans événement
+depuis `idle_after` secondes libère ses écrans en cache (sauf l'écran
+courant, reconstruits à la prochaine visite), et la mémoire par client est
+estimée à partir de la mémoire résidente du processus.
+"""
+import argparse
+import os
+import re
+import threading
+import time
+import uuid
+
+import flet as ft
+
+from asset_cache import AssetCache
+from catalog import Catalog
+from leaderboard import local_community
+from search_index import SearchIndex
+from storage import JournalStore, default_storage_dir
+
+import main1
+
+USER_KEY = "smart_training.user_id"
+# Identifiants générés par le serveur : le navigateur peut renvoyer n'importe quoi
+USER_ID = re.compile(r"[0-9a-f]{32}")
+
+
+def resident_memory():
+    """Mémoire résidente du processus (octets), 0 si indisponible"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+class SharedResources:
+    """Données communes à toutes les sessions, chargées à la première demande"""
+
+    def __init__(self, root=None, community_size=main1.COMMUNITY_SIZE, assets_dir=main1.ASSETS_DIR):
+        self.root = root or default_storage_dir()
+        self.community_size = community_size
+        self.catalog = Catalog.load()
+        # Servi avec les ressources de l'app : le navigateur charge l'avatar par URL
+        self.asset_cache = AssetCache(os.path.join(assets_dir, "cache"), assets_dir=assets_dir)
+        self._search_index = None
+        self._leaderboards = None
+        self._lock = threading.Lock()
+        # Identifiant → [magasin, sessions qui l'utilisent]
+        self._stores = {}
+        self._stores_lock = threading.Lock()
+
+    def search_index(self):
+        with self._lock:
+            if self._search_index is None:
+                path = os.path.join(self.root, "search_index.pickle")
+                self._search_index = SearchIndex.load_or_build(self.catalog.entries, path)
+        return self._search_index
+
+    def leaderboards(self):
+        with self._lock:
+            if self._leaderboards is None:
+                self._leaderboards = local_community(self.community_size)
+        return self._leaderboards
+
+    def open_store(self, user_id):
+        """Magasin de l'utilisateur, partagé par toutes ses sessions ; à rendre avec release_store"""
+        if not USER_ID.fullmatch(user_id):
+            raise ValueError(f"identifiant utilisateur invalide : {user_id!r}")
+        with self._stores_lock:
+            entry = self._stores.get(user_id)
+            if entry is None:
+                entry = self._stores[user_id] = [JournalStore(os.path.join(self.root, "users", user_id)), 0]
+            entry[1] += 1
+            return entry[0]
+
+    def release_store(self, store):
+        """Fin d'une session : le magasin est fermé avec la dernière session de l'utilisateur"""
+        with self._stores_lock:
+            user_id = os.path.basename(store.root)
+            entry = self._stores[user_id]
+            entry[1] -= 1
+            if entry[1]:
+                return
+            del self._stores[user_id]
+            # Sous le verrou : une nouvelle session attend la fin des écritures avant de rouvrir le dossier
+            store.close()
+
+
+class SessionRegistry:
+    def __init__(self, idle_after=300.0, check_interval=30.0):
+        self.idle_after = idle_after
+        self.check_interval = check_interval
+        self.sessions = {}
+        self.trimmed = 0
+        self.baseline = resident_memory()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def add(self, app):
+        page = app.page
+        with self._lock:
+            self.sessions[page.session_id] = app
+        # Toute interaction du client compte comme activité
+        on_event_async = page.on_event_async
+
+        async def tracked_event(e):
+            app.last_active = time.monotonic()
+            await on_event_async(e)
+
+        page.on_event_async = tracked_event
+        page.on_disconnect = lambda _: self.remove(app)
+        page.on_close = lambda _: self.remove(app)
+
+    def remove(self, app):
+        with self._lock:
+            if self.sessions.pop(app.page.session_id, None) is None:
+                return
+        app.close()
+
+    def trim_idle(self, now=None):
+        """Libère les écrans des sessions inactives ; renvoie le nombre d'écrans libérés"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            idle = [app for app in self.sessions.values() if now - app.last_active >= self.idle_after]
+        trimmed = sum(app.trim_screens() for app in idle)
+        self.trimmed += trimmed
+        return trimmed
+
+    def report(self):
+        with self._lock:
+            count = len(self.sessions)
+            cached = sum(len(app.screen_cache) for app in self.sessions.values())
+        rss = resident_memory()
+        return {
+            "sessions": count,
+            "cached_screens": cached,
+            "trimmed_screens": self.trimmed,
+            "rss_mb": round(rss / 2**20, 1),
+            "per_session_kb": round((rss - self.baseline) / count / 1024, 1) if count and rss else None,
+        }
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="session-registry", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.check_interval):
+            if self.trim_idle():
+                report = self.report()
+                print(
+                    f"{report['sessions']} sessions, {report['cached_screens']} écrans en cache, "
+                    f"{report['rss_mb']} Mo ({report['per_session_kb']} Ko/session)"
+                )
+
+
+def user_id(page):
+    """Identifiant anonyme conservé par le navigateur ; à défaut, un nouveau pour la session.
+
+    La valeur vient du client et sert de nom de dossier : seul le format
+    généré ici (32 chiffres hexadécimaux) est accepté, sinon on en crée un.
+    """
+    try:
+        value = page.client_storage.get(USER_KEY)
+        if not isinstance(value, str) or not USER_ID.fullmatch(value):
+            value = uuid.uuid4().hex
+            page.client_storage.set(USER_KEY, value)
+        return value
+    except Exception:
+        return uuid.uuid4().hex
+
+
+def make_target(shared, registry):
+    def session(page):
+        uid = user_id(page)
+        app = main1.SmartTrainingApp(page, store=shared.open_store(uid), shared=shared, player_id=uid)
+        registry.add(app)
+    return session
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8550)
+    parser.add_argument("--idle-after", type=float, default=300.0, help="secondes avant de libérer les écrans")
+    args = parser.parse_args()
+
+    shared = SharedResources()
+    # Chargées avant la référence mémoire : le coût par session n'inclut pas les données partagées
+    shared.search_index()
+    shared.leaderboards()
+    registry = SessionRegistry(idle_after=args.idle_after)
+    registry.start()
+    ft.app(target=make_target(shared, registry), view=ft.AppView.WEB_BROWSER, port=args.port, assets_dir=main1.ASSETS_DIR)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Chronomètre de séance piloté par asyncio.
+
+La boucle tourne dans la tâche de la page (``page.run_task``) et dort jusqu'à
+la prochaine frontière de tick : aucun réveil inutile entre deux secondes.
+Chaque tick ne met à jour que son propre ``ft.Text``, et seulement si le texte
+affiché a changé ; tant que l'écran n'est pas affiché (``is_shown``), rien
+n'est envoyé au client. Avec `schedule` (``UpdateScheduler.mark_dirty``), la
+mise à jour part avec la prochaine image de l'ordonnanceur.
+"""
+import asyncio
+import time
+
+
+def format_elapsed(seconds):
+    seconds = int(seconds)
+    hours, rest = divmod(seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{seconds:02d}"
+    return f"{minutes:02d}:{seconds:02d}"
+
+
+class SessionTimer:
+    def __init__(self, page, text, tick_interval=1.0, template="Session en cours: {}", is_shown=None, schedule=None):
+        self.page = page
+        self.text = text
+        self.is_shown = is_shown
+        self.schedule = schedule
+        self.tick_interval = tick_interval
+        self.template = template
+        self.running = False
+        self._accumulated = 0.0
+        self._resumed_at = None
+        self._task = None
+
+    @property
+    def elapsed(self):
+        """Secondes écoulées, pauses exclues"""
+        if self.running:
+            return self._accumulated + time.monotonic() - self._resumed_at
+        return self._accumulated
+
+    def attach(self, text):
+        """Rattache le chronomètre à un Text ; la valeur part avec la prochaine mise à jour de l'écran"""
+        self.text = text
+        self._render(push=False)
+
+    def start(self):
+        self._accumulated = 0.0
+        self.resume()
+
+    def resume(self):
+        if self.running:
+            return
+        self.running = True
+        self._resumed_at = time.monotonic()
+        self._task = self.page.run_task(self._run)
+
+    def pause(self):
+        if not self.running:
+            return
+        self._accumulated = self.elapsed
+        self.running = False
+        self._cancel()
+        self._render()
+
+    def stop(self):
+        """Arrête le chronomètre et renvoie la durée totale en secondes"""
+        self.pause()
+        return self._accumulated
+
+    def _cancel(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        while self.running:
+            self._render()
+            # Se réveiller pile à la prochaine frontière de tick
+            await asyncio.sleep(self.tick_interval - self.elapsed % self.tick_interval)
+
+    def _render(self, push=True):
+        # Écran masqué : la valeur est tenue à jour localement et partira avec la navigation
+        if push and self.is_shown is not None and not self.is_shown():
+            push = False
+        label = self.template.format(format_elapsed(self.elapsed))
+        if label == self.text.value:
+            return
+        self.text.value = label
+        if push and self.text.page is not None:
+            if self.schedule:
+                self.schedule(self.text)
+            else:
+                self.text.update()
@@ -0,0 +1,151 @@
+"""Moteur de statistiques sur l'historique des séances.
+
+Chaque séance terminée est agrégée par jour et par sport. Pour chaque sport
+(et pour le total, clé ``ALL``) on garde les totaux journaliers et un arbre
+de Fenwick par métrique : n'importe quel intervalle de dates (semaine, mois,
+plage libre) se calcule en O(log n) quel que soit le nombre de séances.
+"""
+from datetime import date, timedelta
+
+from fenwick import FenwickTree
+
+METRICS = ("sessions", "minutes", "calories")
+ALL = "*"
+
+
+def day_key(day):
+    """Ordinal d'une date (date ou chaîne ISO), utilisé comme clé persistée"""
+    if isinstance(day, str):
+        day = date.fromisoformat(day[:10])
+    return day.toordinal()
+
+
+class DailyIndex:
+    """Totaux journaliers d'un sport, indexés à partir de self.origin"""
+
+    def __init__(self, origin, days=0):
+        self.origin = origin
+        self.daily = [[0] * len(METRICS) for _ in range(days)]
+        self._rebuild()
+
+    @classmethod
+    def from_days(cls, days):
+        """Construction en une passe depuis {ordinal: valeurs}"""
+        ordinals = [int(ordinal) for ordinal in days]
+        index = cls.__new__(cls)
+        index.origin = min(ordinals)
+        index.daily = [[0] * len(METRICS) for _ in range(max(ordinals) - index.origin + 1)]
+        for ordinal, values in days.items():
+            index.daily[int(ordinal) - index.origin] = list(values)
+        index._rebuild()
+        return index
+
+    def _rebuild(self):
+        self.trees = [FenwickTree([values[m] for values in self.daily]) for m in range(len(METRICS))]
+
+    def _ensure(self, ordinal):
+        """Étend la plage couverte, vers le passé comme vers l'avenir (reconstruction en O(n), amortie par doublement)"""
+        if ordinal < self.origin:
+            # Historique importé du plus récent au plus ancien : on recule l'origine d'au moins la taille actuelle
+            missing = max(self.origin - ordinal, len(self.daily), 64)
+            self.daily[:0] = [[0] * len(METRICS) for _ in range(missing)]
+            self.origin -= missing
+            self._rebuild()
+        elif ordinal - self.origin >= len(self.daily):
+            needed = ordinal - self.origin + 1
+            grown = max(needed, 2 * len(self.daily), 64)
+            self.daily.extend([0] * len(METRICS) for _ in range(grown - len(self.daily)))
+            self._rebuild()
+
+    def add(self, ordinal, values):
+        self._ensure(ordinal)
+        index = ordinal - self.origin
+        for m, delta in enumerate(values):
+            if delta:
+                self.daily[index][m] += delta
+                self.trees[m].add(index, delta)
+
+    def range_totals(self, start, end):
+        """Totaux sur les ordinaux [start, end)"""
+        lo = start - self.origin
+        hi = end - self.origin
+        return [tree.range_sum(lo, hi) for tree in self.trees]
+
+    def day_values(self, ordinal):
+        index = ordinal - self.origin
+        if 0 <= index < len(self.daily):
+            return self.daily[index]
+        return [0] * len(METRICS)
+
+
+class StatsEngine:
+    def __init__(self, daily=None):
+        """daily : {sport: {ordinal: [séances, minutes, calories]}} tel que persisté"""
+        self.indexes = {}
+        for sport, days in (daily or {}).items():
+            if days:
+                self.indexes[sport] = DailyIndex.from_days(days)
+
+    def _index(self, sport, ordinal):
+        index = self.indexes.get(sport)
+        if index is None:
+            index = self.indexes[sport] = DailyIndex(ordinal)
+        return index
+
+    def add_session(self, record):
+        """Agrège une séance ; renvoie les incréments (sport, ordinal, valeurs) à persister"""
+        ordinal = day_key(record["date"])
+        values = [1, record.get("minutes", 0), record.get("calories", 0)]
+        increments = []
+        for sport in (record["sport"], ALL):
+            self._index(sport, ordinal).add(ordinal, values)
+            increments.append((sport, ordinal, values))
+        return increments
+
+    def range_totals(self, start, end, sport=None):
+        """Totaux entre deux dates incluses, pour un sport ou tous"""
+        index = self.indexes.get(sport or ALL)
+        if index is None:
+            return dict.fromkeys(METRICS, 0)
+        values = index.range_totals(day_key(start), day_key(end) + 1)
+        return dict(zip(METRICS, values))
+
+    def range_sum(self, start, end, metric="minutes", sport=None):
+        """Somme d'une métrique sur les ordinaux [start, end), en O(log n)"""
+        index = self.indexes.get(sport or ALL)
+        if index is None:
+            return 0
+        return index.trees[METRICS.index(metric)].range_sum(start - index.origin, end - index.origin)
+
+    def totals(self, sport=None):
+        index = self.indexes.get(sport or ALL)
+        if index is None:
+            return dict.fromkeys(METRICS, 0)
+        return dict(zip(METRICS, index.range_totals(index.origin, index.origin + len(index.daily))))
+
+    def week_totals(self, today=None, sport=None):
+        today = today or date.today()
+        monday = today - timedelta(days=today.weekday())
+        return self.range_totals(monday, monday + timedelta(days=6), sport)
+
+    def month_totals(self, today=None, sport=None):
+        today = today or date.today()
+        first = today.replace(day=1)
+        next_month = (first + timedelta(days=32)).replace(day=1)
+        return self.range_totals(first, next_month - timedelta(days=1), sport)
+
+    def per_sport_totals(self, start=None, end=None):
+        """Totaux de chaque sport, sur tout l'historique ou sur une plage de dates"""
+        return {
+            sport: self.range_totals(start, end, sport) if start else self.totals(sport)
+            for sport in self.indexes if sport != ALL
+        }
+
+    def daily_series(self, start, days, metric="minutes", sport=None):
+        """Valeurs journalières d'une métrique sur `days` jours à partir de start"""
+        index = self.indexes.get(sport or ALL)
+        m = METRICS.index(metric)
+        first = day_key(start)
+        if index is None:
+            return [0] * days
+        return [index.day_values(first + i)[m] for i in range(days)]
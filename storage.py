@@ -0,0 +1,265 @@
+"""Stockage local journalisé des données utilisateur.
+
+Chaque modification de ``stats`` / ``sports_progress`` est ajoutée à un journal
+append-only (une ligne JSON par opération). Un snapshot complet est écrit
+périodiquement puis le journal est remis à zéro : au démarrage on ne lit que
+le dernier snapshot et la fin du journal.
+
+Les séances brutes sont ajoutées à part dans ``history.jsonl``, qui n'est
+jamais relu au démarrage (export, recalculs).
+
+Les écritures passent par une file et sont regroupées par un thread dédié,
+l'interface ne touche donc jamais au disque.
+"""
+import atexit
+import copy
+import json
+import os
+import queue
+import threading
+import time
+
+DEFAULT_USER_DATA = {
+    "stats": {
+        "level": 1,
+        "xp": 0
+    },
+    "sports_progress": {},
+    "daily": {}
+}
+
+_CLOSE = object()
+
+
+class _HistoryRecord(dict):
+    """Marque une séance destinée à history.jsonl plutôt qu'au journal"""
+
+
+def default_storage_dir():
+    """Dossier de données : celui fourni par Flet une fois l'app packagée, sinon ~/.smart_training"""
+    return (
+        os.environ.get("SMART_TRAINING_DATA_DIR")
+        or os.environ.get("FLET_APP_STORAGE_DATA")
+        or os.path.join(os.path.expanduser("~"), ".smart_training")
+    )
+
+
+def diff_leaves(old, new, path=()):
+    """Opérations (op, chemin, valeur) qui mènent de `old` à `new` (dictionnaires imbriqués).
+
+    Les clés absentes de `new` sont supprimées (« del »), sauf au premier
+    niveau : ``save`` ne reçoit qu'une partie des données (pas ``daily``).
+    """
+    changes = []
+    for key, value in new.items():
+        before = old.get(key) if isinstance(old, dict) else None
+        if isinstance(value, dict) and isinstance(before, dict):
+            changes.extend(diff_leaves(before, value, path + (key,)))
+        elif before != value or (before is None and key not in old):
+            changes.append(("set", list(path + (key,)), copy.deepcopy(value)))
+    if path and isinstance(old, dict):
+        changes.extend(("del", list(path + (key,)), None) for key in old if key not in new)
+    return changes
+
+
+def apply_op(state, entry):
+    """Rejoue une opération du journal sur un état en mémoire"""
+    *parents, leaf = entry["k"]
+    target = state
+    for key in parents:
+        if entry["op"] == "del":
+            target = target.get(key)
+            if not isinstance(target, dict):
+                return
+        else:
+            target = target.setdefault(key, {})
+    if entry["op"] == "set":
+        target[leaf] = entry["v"]
+    elif entry["op"] == "incr":
+        current = target.get(leaf) or [0] * len(entry["v"])
+        target[leaf] = [a + b for a, b in zip(current, entry["v"])]
+    elif entry["op"] == "del":
+        target.pop(leaf, None)
+
+
+class JournalStore:
+    def __init__(self, root=None, snapshot_every=500, flush_interval=0.5):
+        self.root = root or default_storage_dir()
+        self.snapshot_path = os.path.join(self.root, "snapshot.json")
+        self.journal_path = os.path.join(self.root, "journal.jsonl")
+        self.history_path = os.path.join(self.root, "history.jsonl")
+        self.snapshot_every = snapshot_every
+        self.flush_interval = flush_interval
+        self.seq = 0
+        self._saved = {}
+        self._disk_state = {}
+        self._disk_seq = 0
+        self._journal_entries = 0
+        self._queue = queue.Queue()
+        self._writer = None
+        # Numéro de séquence et ordre de la file attribués ensemble (thread UI et import)
+        self._lock = threading.Lock()
+        # Erreur qui a arrêté l'écrivain (disque plein, dossier supprimé…)
+        self.write_error = None
+
+    def load(self):
+        """Lit le dernier snapshot puis rejoue les entrées du journal plus récentes"""
+        if self._writer is not None:
+            # Déjà ouvert (autre session du même utilisateur) : état courant, écritures en file comprises
+            with self._lock:
+                return copy.deepcopy(self._saved)
+        os.makedirs(self.root, exist_ok=True)
+        state = copy.deepcopy(DEFAULT_USER_DATA)
+        seq = 0
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, encoding="utf-8") as f:
+                snapshot = json.load(f)
+            state = snapshot["state"]
+            seq = snapshot["seq"]
+
+        replayed = 0
+        if os.path.exists(self.journal_path):
+            valid_bytes = 0
+            with open(self.journal_path, "rb") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        break
+                    valid_bytes += len(line)
+                    # Entrées déjà couvertes par le snapshot (arrêt entre les deux écritures)
+                    if entry["s"] <= seq:
+                        continue
+                    apply_op(state, entry)
+                    seq = entry["s"]
+                    replayed += 1
+            # Dernière ligne tronquée par un arrêt brutal : on la coupe avant d'ajouter
+            if valid_bytes < os.path.getsize(self.journal_path):
+                with open(self.journal_path, "r+b") as f:
+                    f.truncate(valid_bytes)
+
+        self.seq = seq
+        self._journal_entries = replayed
+        self._saved = copy.deepcopy(state)
+        self._disk_state = copy.deepcopy(state)
+        self._disk_seq = seq
+        self._start_writer()
+        return copy.deepcopy(state)
+
+    def save(self, data):
+        """Met en file les écarts avec l'état enregistré (non bloquant) : chaque clé passée le remplace"""
+        with self._lock:
+            for op, path, value in diff_leaves(self._saved, data):
+                self._record(op, path, value)
+
+    def record(self, op, path, value):
+        with self._lock:
+            self._record(op, path, value)
+
+    def _record(self, op, path, value):
+        self.seq += 1
+        entry = {"s": self.seq, "op": op, "k": path, "v": value}
+        # Copie : l'écrivain applique la même entrée à son propre état
+        apply_op(self._saved, copy.deepcopy(entry))
+        self._queue.put(entry)
+
+    def append_history(self, record):
+        """Ajoute une séance brute à l'historique (hors journal, non relu au démarrage)"""
+        self._queue.put(_HistoryRecord(record))
+
+    def flush(self, timeout=5.0):
+        """Attend que toutes les opérations en file soient sur disque ; False si le délai est dépassé"""
+        self._check_writer()
+        done = threading.Event()
+        self._queue.put(done)
+        flushed = done.wait(timeout)
+        self._check_writer()
+        return flushed
+
+    def _check_writer(self):
+        if self.write_error is not None:
+            raise OSError(f"Écriture impossible dans {self.root} : {self.write_error}") from self.write_error
+
+    def close(self):
+        # Sans ce retrait, la liste atexit garderait le magasin (et ses copies des données) à vie
+        atexit.unregister(self.close)
+        if self._writer and self._writer.is_alive():
+            self._queue.put(_CLOSE)
+            self._writer.join(timeout=5.0)
+
+    def _start_writer(self):
+        if self._writer is None:
+            self._writer = threading.Thread(target=self._write_loop, name="journal-writer", daemon=True)
+            self._writer.start()
+            atexit.register(self.close)
+
+    def _write_loop(self):
+        journal = None
+        items = []
+        try:
+            journal = open(self.journal_path, "a", encoding="utf-8")
+            while True:
+                # Regroupe tout ce qui arrive pendant flush_interval en une seule écriture
+                items = [self._queue.get()]
+                deadline = time.monotonic() + self.flush_interval
+                while items[-1] is not _CLOSE and not isinstance(items[-1], threading.Event):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        items.append(self._queue.get(timeout=remaining))
+                    except queue.Empty:
+                        break
+
+                records = [item for item in items if isinstance(item, _HistoryRecord)]
+                if records:
+                    with open(self.history_path, "a", encoding="utf-8") as history:
+                        history.write("".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records))
+                        history.flush()
+                        os.fsync(history.fileno())
+
+                entries = [item for item in items if isinstance(item, dict) and not isinstance(item, _HistoryRecord)]
+                if entries:
+                    journal.write("".join(json.dumps(e, ensure_ascii=False) + "\n" for e in entries))
+                    journal.flush()
+                    os.fsync(journal.fileno())
+                    for entry in entries:
+                        apply_op(self._disk_state, entry)
+                    self._disk_seq = entries[-1]["s"]
+                    self._journal_entries += len(entries)
+
+                closing = items[-1] is _CLOSE
+                if self._journal_entries >= self.snapshot_every or (closing and self._journal_entries):
+                    journal.close()
+                    self._write_snapshot()
+                    journal = open(self.journal_path, "w", encoding="utf-8")
+
+                for item in items:
+                    if isinstance(item, threading.Event):
+                        item.set()
+                if closing:
+                    return
+        except OSError as ex:
+            self.write_error = ex
+            # Plus personne ne videra la file : les flush en attente lèvent l'erreur au lieu d'attendre
+            while True:
+                for item in items:
+                    if isinstance(item, threading.Event):
+                        item.set()
+                try:
+                    items = [self._queue.get_nowait()]
+                except queue.Empty:
+                    break
+        finally:
+            if journal is not None:
+                journal.close()
+
+    def _write_snapshot(self):
+        """Écriture atomique du snapshot, puis remise à zéro du journal par l'appelant"""
+        tmp_path = self.snapshot_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"seq": self._disk_seq, "state": self._disk_state}, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+        self._journal_entries = 0
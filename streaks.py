@@ -0,0 +1,158 @@
+"""Calendrier d'entraînement : un bit par jour, séries et cartes d'activité.
+
+Les jours actifs sont les bits d'un seul entier Python (bit i = jour
+``origin + i``, ordinal de date) : dix ans tiennent dans 3 650 bits, soit une
+soixantaine de mots machine. Toutes les questions se ramènent à des décalages,
+des masques et des comptages de bits :
+
+    add (séance)         O(1) pour la série en cours (jour suivant ou même jour)
+    current              O(1)
+    longest              O(log L) opérations sur l'entier (L = plus longue série)
+    active_days / mois   un masque et un ``bit_count``
+    heatmap(année)       une conversion en chaîne binaire
+
+Persisté sous forme compacte (``to_dict`` : origine et bits en hexadécimal).
+"""
+import calendar as _calendar
+from datetime import date, timedelta
+
+
+def _ordinal(day):
+    if isinstance(day, str):
+        day = date.fromisoformat(day[:10])
+    return day if isinstance(day, int) else day.toordinal()
+
+
+class TrainingCalendar:
+    def __init__(self, origin=None, bits=0):
+        self.origin = origin
+        self.bits = bits
+        # Série qui se termine au dernier jour actif : tenue à jour à chaque séance
+        self.last = None
+        self.run = 0
+        if bits:
+            self.last = origin + bits.bit_length() - 1
+            self.run = self._run_ending(self.last)
+
+    @classmethod
+    def from_days(cls, days):
+        """Construction depuis des jours actifs (dates, chaînes ISO ou ordinaux)"""
+        ordinals = sorted({_ordinal(day) for day in days})
+        if not ordinals:
+            return cls()
+        origin = ordinals[0]
+        bits = 0
+        for ordinal in ordinals:
+            bits |= 1 << (ordinal - origin)
+        return cls(origin, bits)
+
+    @classmethod
+    def from_dict(cls, data):
+        if not data or not data.get("bits"):
+            return cls()
+        return cls(data["origin"], int(data["bits"], 16))
+
+    def to_dict(self):
+        return {"origin": self.origin, "bits": format(self.bits, "x")}
+
+    def __contains__(self, day):
+        offset = _ordinal(day) - (self.origin or 0)
+        return offset >= 0 and bool(self.bits >> offset & 1)
+
+    def add(self, day):
+        """Marque un jour actif ; renvoie True s'il ne l'était pas encore"""
+        ordinal = _ordinal(day)
+        if self.origin is None:
+            self.origin = ordinal
+        elif ordinal < self.origin:
+            # Jour antérieur à l'origine : on décale tout (rare, import d'historique)
+            self.bits <<= self.origin - ordinal
+            self.origin = ordinal
+        bit = 1 << (ordinal - self.origin)
+        if self.bits & bit:
+            return False
+        self.bits |= bit
+        if self.last is None or ordinal > self.last:
+            self.run = self.run + 1 if self.last == ordinal - 1 else 1
+            self.last = ordinal
+        elif ordinal >= self.last - self.run:
+            # Trou comblé dans la série en cours ou juste avant : elle rejoint la précédente
+            self.run = self._run_ending(self.last)
+        return True
+
+    def _run_ending(self, ordinal):
+        """Nombre de jours actifs consécutifs se terminant à `ordinal` (inclus)"""
+        width = ordinal - self.origin + 1
+        if width <= 0:
+            return 0
+        # Plus haut jour inactif au plus tard à `ordinal`
+        gaps = ~self.bits & ((1 << width) - 1)
+        return width - gaps.bit_length()
+
+    def current(self, today=None):
+        """Série en cours : compte encore si le dernier jour actif est hier"""
+        if self.last is None:
+            return 0
+        return self.run if _ordinal(today or date.today()) - self.last <= 1 else 0
+
+    def longest(self):
+        """Plus longue série, par doublements successifs de x & (x >> k)"""
+        if not self.bits:
+            return 0
+        # runs[j] : bit i à 1 si les 2^j jours à partir de i sont actifs
+        runs = [self.bits]
+        while True:
+            width = 1 << (len(runs) - 1)
+            doubled = runs[-1] & (runs[-1] >> width)
+            if not doubled:
+                break
+            runs.append(doubled)
+        length = 1 << (len(runs) - 1)
+        starts = runs[-1]
+        for j in range(len(runs) - 2, -1, -1):
+            longer = starts & (runs[j] >> length)
+            if longer:
+                starts = longer
+                length += 1 << j
+        return length
+
+    def _window(self, start, end):
+        """Bits des jours [start, end) ramenés au bit 0"""
+        if self.origin is None or end <= start:
+            return 0
+        lo = start - self.origin
+        hi = end - self.origin
+        if hi <= 0:
+            return 0
+        if lo < 0:
+            return (self.bits & ((1 << hi) - 1)) << -lo
+        return (self.bits >> lo) & ((1 << (hi - lo)) - 1)
+
+    def active_days(self, start, end):
+        """Jours actifs entre deux dates incluses"""
+        return self._window(_ordinal(start), _ordinal(end) + 1).bit_count()
+
+    def month_active_days(self, today=None):
+        today = today or date.today()
+        first = today.replace(day=1)
+        last = today.replace(day=_calendar.monthrange(today.year, today.month)[1])
+        return self.active_days(first, last)
+
+    def days(self, start, count):
+        """Activité (0/1) de `count` jours à partir de `start`"""
+        start = _ordinal(start)
+        window = self._window(start, start + count)
+        return [int(bit) for bit in reversed(format(window, f"0{count}b"))] if count > 0 else []
+
+    def heatmap(self, year):
+        """Grille semaines × jours (lundi en tête) d'une année ; None hors de l'année"""
+        first = date(year, 1, 1)
+        count = (date(year + 1, 1, 1) - first).days
+        cells = [None] * first.weekday() + self.days(first, count)
+        cells += [None] * (-len(cells) % 7)
+        return [cells[week:week + 7] for week in range(0, len(cells), 7)]
+
+    def week_days(self, today=None):
+        """Activité du lundi au dimanche de la semaine courante"""
+        today = today or date.today()
+        return self.days(today - timedelta(days=today.weekday()), 7)
@@ -0,0 +1,82 @@
+"""Styles partagés de l'interface.
+
+Les objets de style Flet (animations, bordures, dégradés, ombres, styles de
+bouton) ne sont que des valeurs sérialisées avec le contrôle : un même objet
+peut servir à tous les contrôles qui l'utilisent. Ils sont donc créés une
+seule fois, à l'import ou au premier appel (mémoïsation), puis réutilisés par
+tous les écrans et toutes les sessions. Ces objets sont partagés : ne jamais
+les modifier après coup, demander plutôt une autre variante.
+
+Attention aux boutons : ``ElevatedButton`` recopie ses propres ``color``,
+``bgcolor`` et ``elevation`` dans son style. Un bouton qui reçoit un style
+partagé doit donc passer ces valeurs à ``button_style`` et non au bouton.
+"""
+from functools import lru_cache
+
+import flet as ft
+from flet import Colors
+
+SCALE_ANIMATION = ft.Animation(200, "easeOut")
+
+
+@lru_cache(maxsize=None)
+def tint(color, opacity):
+    """Couleur avec transparence (``Colors.with_opacity`` mémoïsé)"""
+    return Colors.with_opacity(opacity, color)
+
+
+@lru_cache(maxsize=None)
+def symmetric_padding(horizontal=0, vertical=0):
+    return ft.padding.symmetric(horizontal=horizontal, vertical=vertical)
+
+
+@lru_cache(maxsize=None)
+def symmetric_margin(horizontal=0, vertical=0):
+    return ft.margin.symmetric(horizontal=horizontal, vertical=vertical)
+
+
+@lru_cache(maxsize=None)
+def outline(width, color, opacity=1.0):
+    return ft.border.all(width, tint(color, opacity) if opacity < 1.0 else color)
+
+
+@lru_cache(maxsize=None)
+def rounded(radius):
+    return ft.RoundedRectangleBorder(radius=radius)
+
+
+@lru_cache(maxsize=None)
+def button_style(radius, color=None, bgcolor=None, elevation=None, side_color=None, overlay_opacity=None):
+    return ft.ButtonStyle(
+        color=color,
+        bgcolor=bgcolor,
+        elevation=elevation,
+        side=ft.BorderSide(2, side_color) if side_color else None,
+        overlay_color=tint("white", overlay_opacity) if overlay_opacity else None,
+        shape=rounded(radius),
+    )
+
+
+@lru_cache(maxsize=None)
+def diagonal_gradient(color_from, color_to):
+    return ft.LinearGradient(
+        colors=[color_from, color_to],
+        begin=ft.alignment.top_left,
+        end=ft.alignment.bottom_right
+    )
+
+
+@lru_cache(maxsize=None)
+def glow(color, blur_radius=15):
+    return ft.BoxShadow(
+        blur_radius=blur_radius,
+        color=tint(color, 0.5),
+        offset=ft.Offset(0, 5)
+    )
+
+
+PANEL_BGCOLOR = tint("white", 0.05)
+SCREEN_PADDING = symmetric_padding(horizontal=20)
+CARD_MARGIN = symmetric_margin(horizontal=20)
+BADGE_PADDING = symmetric_padding(horizontal=12, vertical=6)
+
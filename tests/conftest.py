@@ -0,0 +1,7 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+# Page sans rendu des mesures (benchmarks/headless.py), réutilisée par les tests d'interface
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
@@ -0,0 +1,86 @@
+"""Pipeline caméra : images jetées plutôt qu'accumulées, latence bornée, arrêt."""
+import functools
+import threading
+import time
+
+import pytest
+
+from camera_pipeline import FramePipeline, PoseEstimator, SyntheticFrameSource, SyntheticPoseEstimator, default_worker
+
+COST_MS = 40.0
+
+
+def run_to_end(pipeline, timeout=20.0):
+    """Attend la fin de la source puis celle des images encore en file"""
+    pipeline.wait(timeout)
+    deadline = time.monotonic() + timeout
+    while pipeline.processed + pipeline.dropped < pipeline.captured and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return pipeline.stats()
+
+
+@pytest.mark.parametrize("worker", ["thread", "process"])
+def test_slow_estimator_drops_frames_and_bounds_latency(worker):
+    if worker == "process" and default_worker() != "process":
+        pytest.skip("multiprocessing indisponible")
+    ids = []
+    # 100 images/s pour un estimateur à 25 images/s : sans rejet, le retard croîtrait sans fin
+    pipeline = FramePipeline(
+        SyntheticFrameSource(width=64, height=48, fps=100, count=100),
+        estimator_factory=functools.partial(SyntheticPoseEstimator, cost_ms=COST_MS),
+        worker=worker,
+        on_result=lambda frame_id, landmarks: ids.append(frame_id),
+    ).start()
+    try:
+        stats = run_to_end(pipeline)
+    finally:
+        pipeline.stop()
+
+    assert stats["captured"] == 100
+    assert stats["processed"] + stats["dropped"] == stats["captured"]
+    assert stats["dropped"] >= 30
+    assert ids == sorted(ids)
+    # Au plus l'image en cours et celle en file devant soi ; large marge pour une machine chargée
+    assert stats["latency_ms_p95"] < 6 * COST_MS
+
+
+def test_fast_estimator_drops_nothing():
+    pipeline = FramePipeline(
+        SyntheticFrameSource(width=64, height=48, fps=50, count=25), worker="thread"
+    ).start()
+    try:
+        stats = run_to_end(pipeline)
+    finally:
+        pipeline.stop()
+    assert stats["processed"] == 25
+    assert stats["dropped"] == 0
+
+
+class FailingEstimator(PoseEstimator):
+    def estimate(self, frame):
+        raise RuntimeError("estimateur en panne")
+
+
+def test_stop_returns_when_worker_died():
+    pipeline = FramePipeline(SyntheticFrameSource(width=64, height=48, fps=100), estimator_factory=FailingEstimator,
+                             worker="thread")
+    hook = threading.excepthook
+    threading.excepthook = lambda args: None
+    try:
+        pipeline.start()
+        time.sleep(0.2)
+        started = time.monotonic()
+        pipeline.stop()
+    finally:
+        threading.excepthook = hook
+    assert time.monotonic() - started < 2.0
+    assert pipeline.processed == 0
+    assert not pipeline._worker.is_alive()
+
+
+def test_stop_is_idempotent():
+    pipeline = FramePipeline(SyntheticFrameSource(width=64, height=48, fps=100), worker="thread").start()
+    time.sleep(0.1)
+    pipeline.stop()
+    pipeline.stop()
+    assert pipeline.processed > 0
@@ -0,0 +1,91 @@
+"""Regroupement des événements : dernier par image, limitation, anti-rebond, par contrôle."""
+import asyncio
+from types import SimpleNamespace
+
+from event_coalescing import EventCoalescer, patch
+
+
+class LoopPage:
+    """Page réduite à sa boucle ; les gestionnaires tournent directement sur la boucle"""
+
+    def __init__(self, loop):
+        self.loop = loop
+
+    def run_thread(self, handler, *args):
+        handler(*args)
+
+
+def event(control, value):
+    return SimpleNamespace(control=control, data=value)
+
+
+def run(scenario):
+    async def main():
+        coalescer = EventCoalescer(LoopPage(asyncio.get_running_loop()))
+        await scenario(coalescer)
+        return coalescer
+
+    return asyncio.run(main())
+
+
+def test_latest_keeps_last_event_per_control():
+    seen = []
+
+    async def scenario(coalescer):
+        handler = coalescer.latest(lambda e: seen.append((e.control, e.data)))
+        for value in range(20):
+            handler(event("carte-1", value))
+            handler(event("carte-2", -value))
+        await asyncio.sleep(0.05)
+        handler(event("carte-1", 99))
+        await asyncio.sleep(0.05)
+
+    coalescer = run(scenario)
+    assert sorted(seen) == sorted([("carte-1", 19), ("carte-2", -19), ("carte-1", 99)])
+    assert coalescer.stats() == {"received": 41, "dispatched": 3, "coalesced": 38}
+
+
+def test_debounce_waits_for_a_pause():
+    seen = []
+
+    async def scenario(coalescer):
+        handler = coalescer.debounce(lambda e: seen.append(e.data), 0.05)
+        for text in ("j", "ju", "jud", "judo"):
+            handler(event("recherche", text))
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.1)
+        handler(event("recherche", "yoga"))
+        await asyncio.sleep(0.1)
+
+    run(scenario)
+    assert seen == ["judo", "yoga"]
+
+
+def test_throttle_limits_rate_and_delivers_latest():
+    runs = []
+
+    async def scenario(coalescer):
+        loop = asyncio.get_running_loop()
+        handler = coalescer.throttle(lambda e: runs.append((loop.time(), e.data)), 0.05)
+        started = loop.time()
+        value = 0
+        while loop.time() - started < 0.3:
+            handler(event("curseur", value))
+            value += 1
+            await asyncio.sleep(0.002)
+        await asyncio.sleep(0.1)
+        runs.append((None, value - 1))
+
+    run(scenario)
+    times = [at for at, _ in runs[:-1]]
+    # Au plus une exécution par intervalle, et la dernière valeur finit toujours par passer
+    assert all(b - a >= 0.05 - 1e-3 for a, b in zip(times, times[1:]))
+    assert 3 <= len(times) <= 8
+    assert runs[-2][1] == runs[-1][1]
+
+
+def test_patch_reports_changes_only():
+    control = SimpleNamespace(scale=1.0, bgcolor="#fff")
+    assert not patch(control, scale=1.0, bgcolor="#fff")
+    assert patch(control, scale=1.05, bgcolor="#fff")
+    assert control.scale == 1.05
@@ -0,0 +1,151 @@
+"""Hub de groupe sur localhost : arrivée, deltas, contre-pression, expiration."""
+import asyncio
+import json
+
+import pytest
+
+pytest.importorskip("websockets")
+
+from group_hub import MAX_PARTICIPANTS, GroupClient, GroupHub, JoinError, encode
+
+
+async def wait_until(predicate, timeout=5.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError("condition jamais remplie")
+        await asyncio.sleep(0.01)
+
+
+async def joined(hub, room, names, **options):
+    url = f"ws://{hub.host}:{hub.port}"
+    clients = [GroupClient(url, room, name, **options) for name in names]
+    tasks = [asyncio.create_task(client.run()) for client in clients]
+    await wait_until(lambda: all(client.id is not None for client in clients))
+    await wait_until(lambda: all(len(client.participants) == len(names) for client in clients))
+    return clients, tasks
+
+
+async def closed(clients, tasks):
+    for client in clients:
+        await client.close()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def run(scenario, **options):
+    async def main():
+        hub = GroupHub(port=0, **options)
+        await hub.start()
+        try:
+            await scenario(hub)
+        finally:
+            await hub.stop()
+
+    asyncio.run(main())
+
+
+def test_join_and_deltas():
+    async def scenario(hub):
+        clients, tasks = await joined(hub, "judo", ["a", "b", "c"], sport="Judo")
+        a, b, c = clients
+        assert len({client.id for client in clients}) == 3
+        assert a.online == [3, 3, 3]
+
+        sent = hub.messages_sent
+        await a.send(r=5, tm=10, s=40)
+        await wait_until(lambda: b.participants[str(a.id)]["s"] == 40 and c.participants[str(a.id)]["r"] == 5)
+        # Un seul delta par tick et par membre, pas un message par mise à jour reçue
+        await a.send(r=6)
+        await a.send(s=45)
+        await wait_until(lambda: b.participants[str(a.id)]["s"] == 45)
+        assert b.participants[str(a.id)] == {"n": "a", "r": 6, "tm": 10, "s": 45}
+        assert hub.messages_sent - sent <= 3 * 3
+        assert b.ranking()[0][0] == "a"
+
+        await c.close()
+        await wait_until(lambda: str(c.id) not in a.participants)
+        await wait_until(lambda: a.online == [2, 2, 2])
+        await closed(clients, tasks)
+        await wait_until(lambda: not hub.rooms)
+
+    run(scenario, tick_interval=0.02)
+
+
+def test_full_room_is_refused():
+    async def scenario(hub):
+        clients, tasks = await joined(hub, "yoga", [f"p{i}" for i in range(MAX_PARTICIPANTS)])
+        extra = GroupClient(f"ws://{hub.host}:{hub.port}", "yoga", "en trop")
+        with pytest.raises(JoinError, match="full"):
+            await extra.run()
+        assert hub.stats()["peers"] == MAX_PARTICIPANTS
+        await closed(clients, tasks)
+
+    run(scenario, tick_interval=0.02)
+
+
+def test_backpressure_replaces_deltas_with_snapshot():
+    async def scenario(hub):
+        clients, tasks = await joined(hub, "karate", ["a", "b"])
+        a, b = clients
+        room = hub.rooms["karate"]
+        snapshots = hub.snapshots
+        # Ticks enchaînés sans rendre la main : les écrivains ne peuvent rien envoyer
+        for value in range(1, 20):
+            room.set(a.id, {"s": value})
+            hub.broadcast()
+        assert all(len(peer.outbox) <= hub.max_pending for peer in room.peers.values())
+        assert hub.dropped > 0
+        # Chaque membre reçoit un instantané à la place des deltas perdus, puis l'état final
+        await wait_until(lambda: hub.snapshots >= snapshots + 2)
+        await wait_until(lambda: all(client.participants[str(a.id)]["s"] == 19 for client in clients))
+        await closed(clients, tasks)
+
+    # Pas de tick automatique pendant la mesure
+    run(scenario, tick_interval=60.0, max_pending=2)
+
+
+def test_silent_client_expires():
+    async def scenario(hub):
+        from websockets.asyncio.client import connect
+
+        async with connect(f"ws://{hub.host}:{hub.port}") as connection:
+            await connection.send(encode({"t": "join", "room": "muet", "name": "m"}))
+            assert json.loads(await connection.recv())["t"] == "snap"
+            # Plus aucun message : le hub ferme la connexion après presence_ttl (+ resolution)
+            await asyncio.wait_for(connection.wait_closed(), timeout=5.0)
+        await wait_until(lambda: not hub.rooms)
+        assert hub.stats()["expired"] == 1
+        assert hub.stats()["online"] == 0
+
+    run(scenario, tick_interval=0.05, presence_ttl=0.5)
+
+
+def test_invalid_values_are_not_broadcast():
+    async def scenario(hub):
+        from websockets.asyncio.client import connect
+
+        errors = []
+
+        def rank(client):
+            try:
+                client.ranking()
+            except TypeError as ex:
+                errors.append(ex)
+
+        clients, tasks = await joined(hub, "judo", ["a"])
+        (a,) = clients
+        a.on_change = rank
+        async with connect(f"ws://{hub.host}:{hub.port}") as connection:
+            await connection.send(encode({"t": "join", "room": "judo", "name": {"n": "x" * 100}}))
+            await wait_until(lambda: len(a.participants) == 2)
+            for values in ({"s": "x"}, {"r": -1}, {"tm": True}, {"s": 1.5}, {"s": 10**12}, {"r": None}):
+                await connection.send(encode({"t": "set", **values}))
+            await connection.send(encode({"t": "set", "s": "beaucoup", "r": 7}))
+            await wait_until(lambda: any(p["r"] == 7 for p in a.participants.values()))
+            intruder = next(p for pid, p in a.participants.items() if pid != str(a.id))
+            assert intruder == {"n": "", "r": 7, "tm": 0, "s": 0}
+            assert sorted(name for name, _, _ in a.ranking()) == ["", "a"]
+        assert errors == []
+        await closed(clients, tasks)
+
+    run(scenario, tick_interval=0.02)
@@ -0,0 +1,114 @@
+"""Export / import de l'historique : allers-retours et fichiers abîmés."""
+import json
+import zlib
+
+import pytest
+
+from history_io import (
+    MAGIC, check_record, export_history, history_keys, import_history, session_key, validate_history, write_jsonl,
+)
+
+RECORDS = [
+    {"date": "2025-01-01", "start": "2025-01-01T07:30:00", "sport": "Judo", "minutes": 45, "calories": 420,
+     "segments": [[30.0, "modéré"], [15.25, "intense"]]},
+    {"date": "2025-01-01", "start": "2025-01-01T19:05:09", "sport": "Yoga", "minutes": 20, "calories": 80},
+    # Sans début, jour sauté, début après minuit du jour de la séance
+    {"date": "2025-01-04", "sport": "Libre", "minutes": 0, "calories": 0},
+    {"date": "2025-01-05", "start": "2025-01-06T00:15:00", "sport": "Karaté", "minutes": 60, "calories": 600},
+]
+
+
+@pytest.fixture
+def history(tmp_path):
+    path = str(tmp_path / "history.jsonl")
+    write_jsonl([RECORDS], path)
+    return path
+
+
+def imported(path, chunk_size=2):
+    return [record for chunk in import_history(path, chunk_size) for record in chunk]
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".sth"])
+def test_round_trip(history, tmp_path, suffix):
+    path = str(tmp_path / f"export{suffix}")
+    assert export_history(history, path, chunk_size=3) == len(RECORDS)
+    assert validate_history(path) == len(RECORDS)
+    assert imported(path) == RECORDS
+
+
+def test_keys_identify_existing_sessions(history):
+    assert history_keys(history) == {session_key(record) for record in RECORDS}
+    # Séance sans début : la durée la distingue d'une autre du même jour
+    assert session_key(dict(RECORDS[2], minutes=1)) not in history_keys(history)
+
+
+@pytest.fixture
+def binary(history, tmp_path):
+    path = tmp_path / "export.sth"
+    export_history(history, str(path))
+    return path
+
+
+@pytest.mark.parametrize("cut", [2, 6, 12, 20, -1])
+def test_truncated_binary_is_rejected(binary, cut):
+    data = binary.read_bytes()
+    # Coupé dans l'en-tête du bloc (struct.error) ou dans le bloc compressé (zlib.error)
+    binary.write_bytes(data[:len(MAGIC) + cut] if cut > 0 else data[:cut])
+    with pytest.raises(ValueError, match="bloc corrompu"):
+        validate_history(str(binary))
+
+
+def test_altered_binary_is_rejected(binary):
+    data = bytearray(binary.read_bytes())
+    data[len(data) // 2] ^= 0xFF
+    binary.write_bytes(bytes(data))
+    with pytest.raises(ValueError):
+        validate_history(str(binary))
+
+
+def test_inconsistent_block_is_rejected(binary):
+    # Bloc bien compressé mais trop court pour les colonnes annoncées
+    raw = (1000).to_bytes(4, "little") + (0).to_bytes(4, "little")
+    data = zlib.compress(raw)
+    binary.write_bytes(MAGIC + len(data).to_bytes(4, "little") + len(raw).to_bytes(4, "little") + data)
+    with pytest.raises(ValueError, match="bloc corrompu"):
+        validate_history(str(binary))
+
+
+def test_unknown_binary_format(tmp_path):
+    path = tmp_path / "export.sth"
+    path.write_bytes(b"PK\x03\x04")
+    with pytest.raises(ValueError, match="format"):
+        validate_history(str(path))
+
+
+@pytest.mark.parametrize("text, message", [
+    ("date,sport,minutes\n2025-01-01,Judo,10\n", "colonnes manquantes"),
+    ("date,start,sport,minutes,calories,segments\n2025-01-01,,Judo,dix,0,\n", "ligne 2"),
+    ("date,start,sport,minutes,calories,segments\n2025-01-01,,Judo\n", "ligne 2"),
+    ("date,start,sport,minutes,calories,segments\n2025-01-01,,Judo,10,0,5\n", "ligne 2"),
+    ("", "colonnes manquantes"),
+])
+def test_broken_csv_is_rejected(tmp_path, text, message):
+    path = tmp_path / "export.csv"
+    path.write_text(text, encoding="utf-8")
+    with pytest.raises(ValueError, match=message):
+        validate_history(str(path))
+
+
+def test_invalid_sessions_are_rejected(tmp_path):
+    path = tmp_path / "export.csv"
+    path.write_text("date,start,sport,minutes,calories,segments\n2025-13-01,,Judo,10,0,\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="séance invalide"):
+        validate_history(str(path))
+    for record in ({"date": "2025-01-01", "sport": "", "minutes": 1}, {"date": "2025-01-01", "sport": "Judo", "minutes": -1},
+                   {"date": "2025-01-01", "sport": "Judo", "segments": [[1.0, "extrême"]]}):
+        with pytest.raises(ValueError):
+            check_record(record)
+
+
+def test_truncated_jsonl_line_is_ignored(history):
+    with open(history, "a", encoding="utf-8") as f:
+        f.write(json.dumps(RECORDS[0])[:20])
+    assert len(history_keys(history)) == len(RECORDS)
@@ -0,0 +1,56 @@
+"""Grille virtualisée : envoi par l'ordonnanceur et cartes suivies limitées à la fenêtre."""
+from types import SimpleNamespace
+
+from lazy_grid import LazyGrid
+
+
+class Source:
+    def __init__(self, size, prefix="e"):
+        self.entries = [{"id": f"{prefix}{i}"} for i in range(size)]
+
+    def __len__(self):
+        return len(self.entries)
+
+    def slice(self, start, count):
+        return self.entries[start:start + count]
+
+
+def make_grid(source):
+    built = {}
+    scheduled = []
+
+    def build_item(entry):
+        built[entry["id"]] = card = SimpleNamespace(entry=entry)
+        return card
+
+    grid = LazyGrid(
+        source, build_item, page_size=20, keep_rows=2, spacing=0,
+        schedule=scheduled.append, release_item=lambda entry: built.pop(entry["id"]),
+    )
+    return grid, built, scheduled
+
+
+def scroll(grid, pixels, row=100.0, viewport=400.0):
+    content = grid.spacer + grid._rows(len(grid.view.controls)) * row
+    return SimpleNamespace(pixels=pixels, max_scroll_extent=content - viewport, viewport_dimension=viewport)
+
+
+def test_scrolling_schedules_the_view_and_releases_recycled_cards():
+    grid, built, scheduled = make_grid(Source(200))
+    for _ in range(8):
+        event = scroll(grid, 0)
+        event.pixels = event.max_scroll_extent
+        grid.on_scroll(event)
+        assert sorted(built) == sorted(entry["id"] for entry in grid.entries[grid.first:grid.window.stop])
+    assert grid.first > 0
+    assert scheduled and all(view is grid.view for view in scheduled)
+    # Retour en haut : les cartes reconstruites sont de nouveau suivies, les autres libérées
+    grid.on_scroll(scroll(grid, 0))
+    assert grid.first == 0
+    assert sorted(built) == sorted(entry["id"] for entry in grid.entries[:len(grid.view.controls)])
+
+
+def test_reset_releases_every_card_of_the_previous_source():
+    grid, built, _ = make_grid(Source(50))
+    grid.reset(Source(5, prefix="r"))
+    assert sorted(built) == [f"r{i}" for i in range(5)]
@@ -0,0 +1,110 @@
+"""Classements : rang, fenêtre et voisinage comparés à un tri naïf."""
+import random
+from datetime import date
+
+import pytest
+
+from leaderboard import Leaderboard, Leaderboards
+
+
+class NaiveBoard:
+    """Tri complet : score décroissant, puis ordre de la dernière mise à jour"""
+
+    def __init__(self):
+        self.scores = {}
+        self.arrival = {}
+        self.clock = 0
+
+    def set(self, user, score):
+        self.clock += 1
+        self.scores[user] = score
+        self.arrival[user] = self.clock
+
+    def remove(self, user):
+        del self.scores[user]
+
+    def order(self):
+        return sorted(self.scores, key=lambda user: (-self.scores[user], self.arrival[user]))
+
+    def rank(self, user):
+        return 1 + sum(score > self.scores[user] for score in self.scores.values())
+
+    def entry(self, user):
+        return (self.rank(user), user, self.scores[user])
+
+    def window(self, start, count):
+        return [self.entry(user) for user in self.order()[max(start, 1) - 1:][:max(count, 0)]]
+
+    def around(self, user, radius):
+        score = self.scores[user]
+        order = self.order()
+        above = [other for other in order if self.scores[other] > score][-radius:] if radius else []
+        below = [other for other in order if other != user and self.scores[other] <= score][:radius]
+        return [self.entry(other) for other in above + [user] + below]
+
+
+def boards(bucket_width, max_score, players=300, updates=600, seed=0):
+    rng = random.Random(seed)
+    board = Leaderboard(max_score, bucket_width)
+    naive = NaiveBoard()
+    for _ in range(updates):
+        user = f"p{rng.randrange(players)}"
+        if user in naive.scores and rng.random() < 0.1:
+            board.remove(user)
+            naive.remove(user)
+            continue
+        # Beaucoup d'ex aequo, et des scores au-delà du plafond
+        score = rng.choice((rng.randint(0, 50), rng.randint(0, max_score + 200)))
+        naive.set(user, score)
+        assert board.set(user, score) == naive.rank(user)
+    return board, naive
+
+
+@pytest.mark.parametrize("bucket_width, max_score", [(1, 1000), (7, 1000), (1, 40)])
+def test_rank_window_and_around_match_naive(bucket_width, max_score):
+    board, naive = boards(bucket_width, max_score)
+    assert len(board) == len(naive.scores)
+    for user in naive.scores:
+        assert board.rank(user) == naive.rank(user)
+    for start in (1, 2, 17, len(board) - 3, len(board), len(board) + 1, 0):
+        for count in (0, 1, 5, 40):
+            # Seaux larges ou plafonnés triés par score : le tri stable garde l'ordre d'arrivée
+            assert board.window(start, count) == naive.window(start, count)
+    for user in list(naive.scores)[:60]:
+        for radius in (0, 1, 3):
+            assert board.around(user, radius) == naive.around(user, radius)
+
+
+def test_from_scores_matches_incremental_build():
+    rng = random.Random(5)
+    scores = {f"p{i}": rng.randint(0, 300) for i in range(500)}
+    built = Leaderboard.from_scores(scores, max_score=1000)
+    incremental = Leaderboard(1000)
+    for user, score in scores.items():
+        incremental.set(user, score)
+    assert built.top(50) == incremental.top(50)
+    assert all(built.rank(user) == incremental.rank(user) for user in scores)
+
+
+def test_unknown_player_and_empty_board():
+    board = Leaderboard(100)
+    assert board.rank("personne") is None
+    assert board.around("personne") == []
+    assert board.top() == []
+    board.add("a", 5)
+    board.add("a", 7)
+    assert board.top() == [(1, "a", 12)]
+
+
+def test_weekly_board_resets_on_new_week():
+    boards = Leaderboards(week=(2025, 10), max_score=1000)
+    boards.submit("a", 30, day=date(2025, 3, 4))
+    boards.submit("b", 50, day=date(2025, 3, 5))
+    assert boards.rank("a", "weekly") == 2
+    # Séance d'une semaine passée (import) : classement général seulement
+    boards.submit("a", 100, day=date(2025, 2, 20))
+    assert boards.weekly.score("a") == 30
+    boards.submit("a", 10, day=date(2025, 3, 10))
+    assert boards.week == (2025, 11)
+    assert boards.weekly.top() == [(1, "a", 10)]
+    assert boards.all_time.top() == [(1, "a", 140), (2, "b", 50)]
@@ -0,0 +1,67 @@
+"""Expiration de la présence sur la roue temporelle (horloge explicite)."""
+from presence import Presence
+
+
+def test_present_between_ttl_and_ttl_plus_resolution():
+    presence = Presence(ttl=10.0, resolution=1.0)
+    assert presence.heartbeat("a", room="judo", sport="Judo", now=100.2)
+    assert presence.expire(now=110.1) == []
+    assert "a" in presence
+    # Échéance arrondie à la case suivante : 111
+    assert presence.expire(now=111.0) == ["a"]
+    assert "a" not in presence
+    assert presence.online(room="judo") == 0
+    assert presence.online(sport="Judo") == 0
+    assert presence.expired == 1
+
+
+def test_heartbeat_postpones_expiry():
+    presence = Presence(ttl=5.0, resolution=1.0)
+    presence.heartbeat("a", now=0.0)
+    assert not presence.heartbeat("a", now=4.0)
+    assert presence.expire(now=6.0) == []
+    assert presence.expire(now=9.0) == ["a"]
+
+
+def test_leave_removes_without_expiring():
+    presence = Presence(ttl=5.0)
+    presence.heartbeat("a", room="r", now=0.0)
+    assert presence.leave("a")
+    assert not presence.leave("a")
+    assert presence.online(room="r") == 0
+    assert presence.expire(now=10.0) == []
+    assert presence.expired == 0
+
+
+def test_counts_follow_room_changes():
+    presence = Presence(ttl=5.0)
+    presence.heartbeat("a", room="r1", sport="Yoga", now=0.0)
+    presence.heartbeat("b", room="r1", sport="Yoga", now=0.0)
+    presence.heartbeat("b", room="r2", sport="Judo", now=1.0)
+    assert presence.online(room="r1") == 1
+    assert presence.online(room="r2") == 1
+    assert presence.online(sport="Yoga") == 1
+    assert len(presence) == 2
+    assert presence.expire(now=5.0) == ["a"]
+    assert presence.online(sport="Yoga") == 0
+    assert presence.online() == 1
+
+
+def test_late_expire_after_long_pause():
+    # Pause plus longue qu'un tour de roue : tout le monde expire, rien n'est perdu
+    presence = Presence(ttl=3.0, resolution=1.0)
+    for index in range(20):
+        presence.heartbeat(index, now=index * 0.1)
+    presence.expire(now=1.0)
+    assert sorted(presence.expire(now=100.0)) == list(range(20))
+    assert len(presence) == 0
+
+
+def test_next_lap_deadline_stays_in_its_slot():
+    # Roue de 5 cases : les échéances 3 et 8 partagent une case, expire appelé en retard
+    presence = Presence(ttl=3.0, resolution=1.0)
+    presence.heartbeat("a", now=0.0)
+    presence.heartbeat("b", now=5.0)
+    assert presence.expire(now=7.0) == ["a"]
+    assert "b" in presence
+    assert presence.expire(now=8.0) == ["b"]
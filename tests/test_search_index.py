@@ -0,0 +1,86 @@
+"""Recherche dans le catalogue : résultats comparés à un parcours naïf, index sérialisé."""
+import os
+import pickle
+
+import pytest
+
+from catalog import builtin_entries
+from search_index import FIELD_WEIGHTS, SearchIndex, tokenize
+
+
+def naive_search(entries, query):
+    """Entrées dont chaque mot de la requête préfixe un mot d'un champ, par score puis ordre du catalogue"""
+    tokens = tokenize(query)
+    if not tokens:
+        return list(entries)
+    ranked = []
+    for doc, entry in enumerate(entries):
+        weights = {}
+        for field, weight in FIELD_WEIGHTS.items():
+            value = entry.get(field) or ""
+            for term in {t for word in (value if isinstance(value, list) else [value]) for t in tokenize(word)}:
+                weights[term] = weights.get(term, 0) + weight
+        best = [max((w for term, w in weights.items() if term.startswith(token)), default=None) for token in tokens]
+        if None not in best:
+            ranked.append((-sum(best), doc))
+    return [entries[doc] for _, doc in sorted(ranked)]
+
+
+@pytest.fixture(scope="module")
+def entries():
+    return builtin_entries()
+
+
+QUERIES = ["", "karate", "KARATÉ", "ka", "k", "art mar", "art martial", "muscu jambes", "yo", "zzz", "j", "ju do", "é"]
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_search_matches_naive(entries, query):
+    index = SearchIndex(entries)
+    assert index.search(query, limit=None) == naive_search(entries, query)
+
+
+def test_typing_reuses_previous_words(entries):
+    # Frappe lettre par lettre, puis retour arrière : le cache des mots précédents ne fausse rien
+    index = SearchIndex(entries)
+    query = "art martial combat"
+    steps = [query[:i] for i in range(1, len(query) + 1)] + [query[:i] for i in range(len(query), 0, -1)]
+    for text in steps:
+        assert index.search(text, limit=None) == naive_search(entries, text)
+
+
+def test_limit_keeps_best_results(entries):
+    index = SearchIndex(entries)
+    assert index.search("a", limit=3) == naive_search(entries, "a")[:3]
+
+
+def test_serialized_index_is_reused_when_catalog_is_unchanged(entries, tmp_path):
+    path = str(tmp_path / "search_index.pickle")
+    built = SearchIndex.load_or_build(entries, path)
+    assert os.path.exists(path)
+    loaded = SearchIndex.load_or_build(entries, path)
+    assert loaded.terms == built.terms
+    assert loaded.search("judo") == built.search("judo")
+    with open(path, "rb") as f:
+        assert pickle.load(f)["fingerprint"] == built.fingerprint
+
+
+def test_changed_catalog_invalidates_serialized_index(entries, tmp_path):
+    path = str(tmp_path / "search_index.pickle")
+    SearchIndex.load_or_build(entries, path)
+    changed = [dict(entry) for entry in entries]
+    changed[0]["title"] = "Jiu-jitsu brésilien"
+    index = SearchIndex.load_or_build(changed, path)
+    assert index.search("bresilien") == [changed[0]]
+    with open(path, "rb") as f:
+        assert pickle.load(f)["fingerprint"] == index.fingerprint
+
+
+@pytest.mark.parametrize("content", [b"", b"pas un pickle", pickle.dumps({"version": 0})])
+def test_unreadable_or_old_index_is_rebuilt(entries, tmp_path, content):
+    path = tmp_path / "search_index.pickle"
+    path.write_bytes(content)
+    index = SearchIndex.load_or_build(entries, str(path))
+    assert index.search("judo", limit=None) == naive_search(entries, "judo")
+    with open(path, "rb") as f:
+        assert pickle.load(f)["fingerprint"] == index.fingerprint
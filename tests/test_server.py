@@ -0,0 +1,84 @@
+"""Mode serveur : sessions d'un même utilisateur sur un seul magasin."""
+import json
+import os
+
+import pytest
+
+pytest.importorskip("flet")
+
+from headless import make_headless_page
+
+import main1
+from server import SessionRegistry, SharedResources
+from storage import JournalStore
+
+USER = "0123456789abcdef0123456789abcdef"
+
+
+def session(shared, registry, name):
+    page, _ = make_headless_page(name)
+    app = main1.SmartTrainingApp(page, store=shared.open_store(USER), shared=shared, player_id=USER)
+    registry.add(app)
+    app.startup_done.wait(10)
+    app.assets_loaded.wait(10)
+    return app
+
+
+def training(day, minutes):
+    return {
+        "date": f"2025-03-{day:02d}", "start": f"2025-03-{day:02d}T18:00:00", "sport": "Judo",
+        "minutes": minutes, "calories": 10 * minutes, "segments": [],
+    }
+
+
+def test_two_tabs_share_one_store(tmp_path):
+    shared = SharedResources(str(tmp_path), community_size=100, assets_dir=str(tmp_path / "assets"))
+    registry = SessionRegistry()
+    first = session(shared, registry, "onglet-1")
+    second = session(shared, registry, "onglet-2")
+    assert first.store is second.store
+
+    first.record_session(training(1, 30))
+    second.record_session(training(2, 45))
+    registry.remove(first)
+    # Encore ouvert pour le second onglet
+    assert second.store._writer.is_alive()
+    second.record_session(training(3, 20))
+    store = second.store
+    registry.remove(second)
+    assert not store._writer.is_alive()
+
+    # Une séquence unique : rien n'est écarté à la relecture
+    reopened = JournalStore(store.root)
+    state = reopened.load()
+    days = state["daily"]["Judo"]
+    assert sorted(values[1] for values in days.values()) == [20, 30, 45]
+    with open(store.history_path, encoding="utf-8") as f:
+        assert [json.loads(line)["minutes"] for line in f] == [30, 45, 20]
+    reopened.close()
+
+    # Onglet rouvert plus tard : nouveau magasin, mêmes données
+    third = session(shared, registry, "onglet-3")
+    assert third.store is not store
+    assert third.stats_engine.totals()["minutes"] == 95
+    registry.remove(third)
+
+
+def test_second_session_sees_pending_writes(tmp_path):
+    shared = SharedResources(str(tmp_path), community_size=100, assets_dir=str(tmp_path / "assets"))
+    store = shared.open_store(USER)
+    store.load()
+    store.record("incr", ["daily", "Judo", "1"], [1, 30, 0])
+    # Deuxième session : pas de relecture du disque, l'entrée en file est déjà là
+    assert shared.open_store(USER).load()["daily"] == {"Judo": {"1": [1, 30, 0]}}
+    shared.release_store(store)
+    assert store._writer.is_alive()
+    shared.release_store(store)
+    assert not store._writer.is_alive()
+    assert os.path.exists(store.snapshot_path)
+
+
+def test_invalid_user_id_is_refused(tmp_path):
+    shared = SharedResources(str(tmp_path), community_size=100, assets_dir=str(tmp_path / "assets"))
+    with pytest.raises(ValueError):
+        shared.open_store("../../etc")
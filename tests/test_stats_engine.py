@@ -0,0 +1,130 @@
+"""Arbre de Fenwick et moteur de statistiques contre des sommes naïves."""
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from fenwick import FenwickTree
+from stats_engine import ALL, METRICS, DailyIndex, StatsEngine, day_key
+
+
+def test_fenwick_sums_match_naive():
+    rng = random.Random(1)
+    values = [rng.randint(-5, 20) for _ in range(300)]
+    tree = FenwickTree(values)
+    for _ in range(500):
+        index, delta = rng.randrange(len(values)), rng.randint(-3, 3)
+        values[index] += delta
+        tree.add(index, delta)
+        start, end = sorted(rng.randint(-10, len(values) + 10) for _ in range(2))
+        assert tree.range_sum(start, end) == sum(values[max(start, 0):max(end, 0)])
+    assert tree.range_sum(50, 10) == 0
+    assert tree.prefix_sum(len(values) + 100) == sum(values)
+
+
+def test_fenwick_find_matches_naive():
+    rng = random.Random(2)
+    counts = [rng.choice((0, 0, 1, 3)) for _ in range(257)]
+    tree = FenwickTree(counts)
+    total = sum(counts)
+    for k in range(0, total + 3):
+        expected = next((i for i in range(len(counts)) if sum(counts[:i + 1]) >= k), len(counts)) if k > 0 else 0
+        assert tree.find(k) == expected
+
+
+def test_empty_fenwick():
+    tree = FenwickTree()
+    assert tree.prefix_sum(10) == 0
+    assert tree.find(1) == 0
+
+
+def random_sessions(count, seed=0):
+    rng = random.Random(seed)
+    start = date(2024, 1, 1)
+    return [
+        {"date": (start + timedelta(days=rng.randint(0, 900))).isoformat(), "sport": rng.choice(("Judo", "Yoga", "Libre")),
+         "minutes": rng.randint(5, 90), "calories": rng.randint(20, 900)}
+        for _ in range(count)
+    ]
+
+
+def naive_totals(sessions, first, last, sport=None):
+    totals = dict.fromkeys(METRICS, 0)
+    for record in sessions:
+        if first <= record["date"] <= last and sport in (None, record["sport"]):
+            totals["sessions"] += 1
+            totals["minutes"] += record["minutes"]
+            totals["calories"] += record["calories"]
+    return totals
+
+
+@pytest.mark.parametrize("order", ["chronological", "reversed", "shuffled"])
+def test_range_totals_match_naive(order):
+    sessions = random_sessions(400)
+    if order == "chronological":
+        sessions.sort(key=lambda r: r["date"])
+    elif order == "reversed":
+        # Import du plus récent au plus ancien : l'origine recule à chaque séance
+        sessions.sort(key=lambda r: r["date"], reverse=True)
+    engine = StatsEngine()
+    for record in sessions:
+        engine.add_session(record)
+    rng = random.Random(3)
+    for _ in range(100):
+        first, last = sorted((date(2023, 12, 1) + timedelta(days=rng.randint(0, 1000))).isoformat() for _ in range(2))
+        sport = rng.choice((None, "Judo", "Yoga", "Libre", "Karaté"))
+        assert engine.range_totals(first, last, sport) == naive_totals(sessions, first, last, sport)
+    assert engine.totals() == naive_totals(sessions, "0000", "9999")
+    assert engine.per_sport_totals()["Yoga"] == naive_totals(sessions, "0000", "9999", "Yoga")
+
+
+def test_persisted_increments_rebuild_same_engine():
+    sessions = random_sessions(200, seed=4)
+    engine = StatsEngine()
+    daily = {}
+    for record in sessions:
+        for sport, ordinal, values in engine.add_session(record):
+            current = daily.setdefault(sport, {}).setdefault(str(ordinal), [0] * len(values))
+            for i, value in enumerate(values):
+                current[i] += value
+    rebuilt = StatsEngine(daily)
+    for sport in (None, "Judo", "Yoga"):
+        assert rebuilt.totals(sport) == engine.totals(sport)
+    start = date(2024, 6, 1)
+    assert rebuilt.daily_series(start, 60) == engine.daily_series(start, 60)
+    assert rebuilt.daily_series(start, 60, sport=ALL) == [
+        naive_totals(sessions, day.isoformat(), day.isoformat())["minutes"]
+        for day in (start + timedelta(days=i) for i in range(60))
+    ]
+
+
+def test_daily_index_growth_is_amortized():
+    index = DailyIndex(day_key("2025-01-01"))
+    rebuilds = 0
+    rebuild = index._rebuild
+
+    def counted():
+        nonlocal rebuilds
+        rebuilds += 1
+        rebuild()
+
+    index._rebuild = counted
+    base = day_key("2025-01-01")
+    for offset in range(2000):
+        index.add(base - offset, [1, 1, 1])
+        index.add(base + offset, [1, 1, 1])
+    # Doublement : un nombre logarithmique de reconstructions dans chaque sens
+    assert rebuilds <= 20
+    assert index.range_totals(base - 1999, base + 2000) == [4000, 4000, 4000]
+    assert index.range_totals(base, base + 1) == [2, 2, 2]
+    assert index.day_values(base - 5000) == [0, 0, 0]
+
+
+def test_week_and_month_totals():
+    engine = StatsEngine()
+    for day, minutes in (("2025-03-02", 10), ("2025-03-03", 20), ("2025-03-09", 30), ("2025-03-10", 40), ("2025-04-01", 5)):
+        engine.add_session({"date": day, "sport": "Judo", "minutes": minutes, "calories": 0})
+    # Semaine du lundi 3 au dimanche 9 mars
+    assert engine.week_totals(date(2025, 3, 5))["minutes"] == 50
+    assert engine.month_totals(date(2025, 3, 31))["minutes"] == 100
+    assert engine.range_sum(day_key("2025-03-03"), day_key("2025-03-10")) == 50
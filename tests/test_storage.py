@@ -0,0 +1,157 @@
+"""Stockage journalisé : ordre des entrées, suppressions, erreurs d'écriture."""
+import json
+import os
+import threading
+
+import pytest
+
+from storage import JournalStore, apply_op, diff_leaves
+
+
+def reopen(root, **options):
+    store = JournalStore(root, **options)
+    return store, store.load()
+
+
+def journal_entries(store):
+    with open(store.journal_path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_concurrent_records_reach_journal_in_seq_order(tmp_path):
+    store, _ = reopen(str(tmp_path), snapshot_every=10**6)
+
+    def increments(sport):
+        for day in range(500):
+            store.record("incr", ["daily", sport, str(day)], [1, 2])
+
+    threads = [threading.Thread(target=increments, args=(sport,)) for sport in ("Judo", "Yoga", "Libre")]
+    for thread in threads:
+        thread.start()
+    store.save({"stats": {"level": 2, "xp": 10}})
+    for thread in threads:
+        thread.join()
+    assert store.flush()
+    seqs = [entry["s"] for entry in journal_entries(store)]
+    assert seqs == list(range(1, 1503))
+    store.close()
+
+    _, state = reopen(str(tmp_path))
+    assert all(len(state["daily"][sport]) == 500 for sport in ("Judo", "Yoga", "Libre"))
+    assert state["stats"] == {"level": 2, "xp": 10}
+
+
+def test_deleted_keys_are_journaled(tmp_path):
+    store, data = reopen(str(tmp_path))
+    data["stats"]["streak"] = 4
+    data["sports_progress"] = {"Judo": {"level": 1}, "Yoga": {"level": 2}}
+    store.save(data)
+    del data["stats"]["streak"]
+    del data["sports_progress"]["Judo"]
+    store.save(data)
+    store.close()
+
+    _, state = reopen(str(tmp_path))
+    assert state["stats"] == {"level": 1, "xp": 0}
+    assert state["sports_progress"] == {"Yoga": {"level": 2}}
+
+
+def test_partial_save_keeps_other_top_level_keys(tmp_path):
+    store, _ = reopen(str(tmp_path))
+    store.record("incr", ["daily", "Judo", "1"], [1, 30])
+    store.save({"stats": {"level": 1, "xp": 5}})
+    store.close()
+    _, state = reopen(str(tmp_path))
+    assert state["daily"] == {"Judo": {"1": [1, 30]}}
+
+
+def test_diff_leaves_matches_apply_op():
+    old = {"a": {"b": 1, "c": {"d": 2}, "gone": 3}, "keep": 1}
+    new = {"a": {"b": 1, "c": {"d": 5, "e": None}, "f": [1]}}
+    state = json.loads(json.dumps(old))
+    for op, path, value in diff_leaves(old, new):
+        apply_op(state, {"op": op, "k": path, "v": value})
+    assert state == {**new, "keep": 1}
+
+
+def test_flush_raises_when_writer_died(tmp_path):
+    store, _ = reopen(str(tmp_path / "user"), flush_interval=0.0)
+    # Dossier supprimé : l'ajout à history.jsonl échoue et arrête l'écrivain
+    store.flush()
+    os.remove(store.journal_path)
+    os.rmdir(store.root)
+    store.append_history({"date": "2025-01-01", "minutes": 10})
+    with pytest.raises(OSError):
+        store.flush(timeout=5.0)
+    with pytest.raises(OSError):
+        store.flush(timeout=5.0)
+    store.close()
+
+
+def test_journal_is_replayed_on_load(tmp_path):
+    store, _ = reopen(str(tmp_path), snapshot_every=10**6)
+    expected = {}
+    for day in range(50):
+        store.record("incr", ["daily", "Judo", str(day % 7)], [1, day])
+        current = expected.setdefault(str(day % 7), [0, 0])
+        current[0] += 1
+        current[1] += day
+    store.save({"stats": {"level": 1, "xp": 120}})
+    store.flush()
+    # Arrêt brutal : ni close ni snapshot, seul le journal est sur disque
+    assert not os.path.exists(store.snapshot_path)
+
+    _, state = reopen(str(tmp_path))
+    assert state["daily"]["Judo"] == expected
+    assert state["stats"]["xp"] == 120
+
+
+def test_truncated_last_line_is_cut_before_appending(tmp_path):
+    store, _ = reopen(str(tmp_path), snapshot_every=10**6)
+    store.record("incr", ["daily", "Judo", "1"], [1, 30])
+    store.flush()
+    store._queue.put(threading.Event())
+    with open(store.journal_path, "a", encoding="utf-8") as f:
+        f.write('{"s": 2, "op": "incr", "k": ["daily", "Ju')
+
+    second, state = reopen(str(tmp_path), snapshot_every=10**6)
+    assert state["daily"] == {"Judo": {"1": [1, 30]}}
+    assert second.seq == 1
+    second.record("incr", ["daily", "Judo", "1"], [1, 15])
+    second.flush()
+    # La ligne tronquée a été coupée : l'ajout suivant reste lisible
+    assert [entry["s"] for entry in journal_entries(second)] == [1, 2]
+    _, state = reopen(str(tmp_path))
+    assert state["daily"] == {"Judo": {"1": [2, 45]}}
+
+
+def test_snapshot_rotation_resets_journal(tmp_path):
+    store, _ = reopen(str(tmp_path), snapshot_every=10, flush_interval=0.0)
+    for day in range(25):
+        store.record("incr", ["daily", "Yoga", str(day)], [1])
+        store.flush()
+    with open(store.snapshot_path, encoding="utf-8") as f:
+        snapshot = json.load(f)
+    assert snapshot["seq"] == 20
+    assert sorted(map(int, snapshot["state"]["daily"]["Yoga"])) == list(range(20))
+    assert [entry["s"] for entry in journal_entries(store)] == list(range(21, 26))
+    store.close()
+    # Fermeture : snapshot final, journal vide
+    assert journal_entries(store) == []
+
+    _, state = reopen(str(tmp_path))
+    assert sorted(map(int, state["daily"]["Yoga"])) == list(range(25))
+
+
+def test_entries_covered_by_snapshot_are_skipped(tmp_path):
+    store, _ = reopen(str(tmp_path), snapshot_every=10**6)
+    for _ in range(3):
+        store.record("incr", ["daily", "Judo", "1"], [1])
+    store.close()
+    # Arrêt entre l'écriture du snapshot et la remise à zéro du journal : les entrées 1 à 3 y sont encore
+    with open(store.journal_path, "w", encoding="utf-8") as f:
+        f.write("".join(json.dumps({"s": s, "op": "incr", "k": ["daily", "Judo", "1"], "v": [1]}) + "\n"
+                        for s in (1, 2, 3, 4)))
+    second, state = reopen(str(tmp_path))
+    assert state["daily"]["Judo"]["1"] == [4]
+    assert second.seq == 4
@@ -0,0 +1,111 @@
+"""Calendrier d'entraînement : séries et comptages comparés à un parcours jour par jour."""
+import random
+from datetime import date
+
+import pytest
+
+from streaks import TrainingCalendar
+
+BASE = date(2024, 1, 1).toordinal()
+
+
+def naive_longest(days):
+    best = run = 0
+    previous = None
+    for day in sorted(days):
+        run = run + 1 if previous == day - 1 else 1
+        best = max(best, run)
+        previous = day
+    return best
+
+
+def naive_current(days, today):
+    day = max(days) if days else None
+    if day is None or today - day > 1:
+        return 0
+    run = 0
+    while day in days:
+        run += 1
+        day -= 1
+    return run
+
+
+def random_days(seed, count=300, span=900):
+    rng = random.Random(seed)
+    days = set()
+    while len(days) < count:
+        # Des séries de quelques jours, séparées par des trous
+        start = BASE + rng.randrange(span)
+        days.update(range(start, start + rng.randint(1, 12)))
+    return days
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_add_in_any_order_matches_naive(seed):
+    days = sorted(random_days(seed))
+    rng = random.Random(seed)
+    order = days[:]
+    rng.shuffle(order)
+    calendar = TrainingCalendar()
+    added = set()
+    for day in order:
+        assert calendar.add(day)
+        assert not calendar.add(day)
+        added.add(day)
+        # Trous comblés et jours antérieurs à l'origine : la série en cours reste exacte
+        assert calendar.current(max(added)) == naive_current(added, max(added))
+    assert calendar.longest() == naive_longest(days)
+    assert calendar.current(days[-1] + 1) == naive_current(added, days[-1] + 1)
+    assert calendar.current(days[-1] + 2) == 0
+
+
+def test_filling_a_gap_joins_runs():
+    calendar = TrainingCalendar()
+    for day in (1, 2, 4, 5, 6):
+        calendar.add(date.fromordinal(BASE + day))
+    assert calendar.current(date.fromordinal(BASE + 6)) == 3
+    calendar.add(date.fromordinal(BASE + 3))
+    assert calendar.current(date.fromordinal(BASE + 6)) == 6
+    assert calendar.longest() == 6
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_round_trip_and_counts(seed):
+    days = random_days(seed + 10)
+    calendar = TrainingCalendar.from_days(date.fromordinal(day).isoformat() for day in days)
+    restored = TrainingCalendar.from_dict(calendar.to_dict())
+    assert (restored.origin, restored.bits, restored.last, restored.run) == (
+        calendar.origin, calendar.bits, calendar.last, calendar.run)
+    assert restored.longest() == naive_longest(days)
+
+    rng = random.Random(seed)
+    for _ in range(50):
+        first, last = sorted(BASE - 30 + rng.randrange(1000) for _ in range(2))
+        assert restored.active_days(date.fromordinal(first), date.fromordinal(last)) == sum(
+            first <= day <= last for day in days)
+    start = date.fromordinal(BASE - 3)
+    assert restored.days(start, 40) == [int(start.toordinal() + i in days) for i in range(40)]
+    assert all((day in restored) == (day in days) for day in range(BASE - 5, BASE + 1000))
+
+
+def test_empty_calendar():
+    calendar = TrainingCalendar.from_dict(None)
+    assert calendar.longest() == 0
+    assert calendar.current() == 0
+    assert calendar.active_days(date(2025, 1, 1), date(2025, 12, 31)) == 0
+    assert TrainingCalendar.from_dict(calendar.to_dict()).bits == 0
+
+
+def test_heatmap_and_month():
+    calendar = TrainingCalendar.from_days([date(2025, 1, 1), date(2025, 1, 31), date(2025, 2, 1), date(2025, 12, 31)])
+    grid = calendar.heatmap(2025)
+    assert all(len(week) == 7 for week in grid)
+    cells = [cell for week in grid for cell in week]
+    # 1er janvier 2025 : un mercredi
+    assert cells[:3] == [None, None, 1]
+    assert sum(cell or 0 for cell in cells) == 4
+    assert len([cell for cell in cells if cell is not None]) == 365
+    assert calendar.month_active_days(date(2025, 1, 15)) == 2
+    assert calendar.week_days(date(2025, 1, 1)) == [0, 0, 1, 0, 0, 0, 0]
+    assert calendar.days(date(2025, 1, 30), 3) == [0, 1, 1]
+    assert calendar.current(date(2026, 1, 1)) == 1
@@ -0,0 +1,120 @@
+"""Mises à jour groupées : un envoi par image, contrôles dédoublonnés, contrôles retirés ignorés."""
+import asyncio
+import threading
+from types import SimpleNamespace
+
+from update_scheduler import UpdateScheduler
+
+
+class RecordingPage:
+    """Page réduite : boucle asyncio et journal des page.update()"""
+
+    def __init__(self, loop):
+        self.loop = loop
+        self.page = self
+        self.updates = []
+
+    def run_thread(self, handler, *args):
+        threading.Thread(target=handler, args=args).start()
+
+    def update(self, *controls):
+        self.updates.append(controls)
+
+
+def control(name, mounted=True):
+    return SimpleNamespace(name=name, page=object() if mounted else None)
+
+
+def run(scenario):
+    async def main():
+        page = RecordingPage(asyncio.get_running_loop())
+        scheduler = UpdateScheduler(page)
+        await scenario(page, scheduler)
+        return page, scheduler
+
+    return asyncio.run(main())
+
+
+async def next_frames(count=3):
+    await asyncio.sleep(count / 60)
+
+
+def test_marks_from_many_threads_merge_into_one_update():
+    controls = [control(f"c{i}") for i in range(8)]
+
+    async def scenario(page, scheduler):
+        threads = [
+            threading.Thread(target=lambda: [scheduler.mark_dirty(c) for c in controls for _ in range(25)])
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        await next_frames()
+
+    page, scheduler = run(scenario)
+    assert len(page.updates) == 1
+    assert sorted(c.name for c in page.updates[0]) == sorted(c.name for c in controls)
+    assert scheduler.stats() == {"requests": 800, "flushes": 1, "merged": 799, "controls_sent": 8}
+
+
+def test_unmounted_controls_are_not_sent():
+    async def scenario(page, scheduler):
+        scheduler.mark_dirty(control("retiré", mounted=False), None)
+        await next_frames()
+        scheduler.mark_dirty(control("affiché"), control("retiré", mounted=False))
+        await next_frames()
+
+    page, scheduler = run(scenario)
+    assert [[c.name for c in controls] for controls in page.updates] == [["affiché"]]
+    assert scheduler.stats()["flushes"] == 1
+    assert scheduler.stats()["controls_sent"] == 1
+
+
+def test_marking_the_page_sends_a_full_update():
+    async def scenario(page, scheduler):
+        scheduler.mark_dirty(control("a"), page, control("b"))
+        await next_frames()
+
+    page, scheduler = run(scenario)
+    assert page.updates == [()]
+    assert scheduler.stats()["controls_sent"] == 1
+
+
+def test_flush_now_sends_pending_and_extra_controls_at_once():
+    async def scenario(page, scheduler):
+        scheduler.mark_dirty(control("en attente"))
+        scheduler.flush_now(control("navigation"))
+        assert [sorted(c.name for c in controls) for controls in page.updates] == [["en attente", "navigation"]]
+        # L'envoi planifié ne trouve plus rien à envoyer
+        await next_frames()
+        assert len(page.updates) == 1
+        # Nouvelle image, nouvel envoi
+        scheduler.mark_dirty(control("plus tard"))
+        await next_frames()
+
+    page, scheduler = run(scenario)
+    assert len(page.updates) == 2
+    assert scheduler.stats()["flushes"] == 2
+
+
+def test_flush_now_waits_for_a_send_in_progress():
+    sending = threading.Event()
+    release = threading.Event()
+
+    async def scenario(page, scheduler):
+        def slow_update(*controls):
+            sending.set()
+            release.wait(1)
+            page.updates.append(controls)
+
+        page.update = slow_update
+        scheduler.mark_dirty(control("image"))
+        await asyncio.get_running_loop().run_in_executor(None, sending.wait, 1)
+        # L'envoi planifié a déjà pris les contrôles en attente : flush_now n'a rien à envoyer mais attend
+        threading.Timer(0.05, release.set).start()
+        scheduler.flush_now()
+        assert [[c.name for c in controls] for controls in page.updates] == [["image"]]
+
+    run(scenario)
@@ -0,0 +1,59 @@
+"""Sous-ensemble de la police Poppins embarquée dans assets/fonts.
+
+Ne garde que les glyphes réellement affichés : caractères des chaînes du code
+(textes, titres, citations), latin de base, lettres accentuées du français et
+quelques symboles. Le fichier obtenu pèse quelques dizaines de Ko au lieu de
+~150 Ko et l'app ne dépend plus de Google Fonts.
+
+    pip install fonttools
+    python tools/subset_fonts.py chemin/vers/Poppins-Regular.ttf
+
+À relancer quand de nouveaux textes utilisent des caractères inhabituels.
+"""
+import argparse
+import ast
+import os
+import string
+
+from fontTools import subset
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+OUTPUT = os.path.join(ROOT, "assets", "fonts", "Poppins-Regular.ttf")
+BASE_CHARACTERS = string.printable + "àâäçéèêëîïôöùûüÿœæÀÂÄÇÉÈÊËÎÏÔÖÙÛÜŸŒÆ«»’–—…°×·€"
+
+
+def used_characters(root=ROOT):
+    """Caractères de toutes les chaînes littérales des modules de l'app"""
+    characters = set(BASE_CHARACTERS)
+    for name in os.listdir(root):
+        if not name.endswith(".py"):
+            continue
+        with open(os.path.join(root, name), encoding="utf-8") as f:
+            tree = ast.parse(f.read())
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Constant) and isinstance(node.value, str):
+                characters.update(node.value)
+    return "".join(sorted(c for c in characters if c.isprintable()))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("font", help="Poppins-Regular.ttf complet")
+    parser.add_argument("--output", default=OUTPUT)
+    args = parser.parse_args()
+
+    characters = used_characters()
+    os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    options = subset.Options()
+    options.layout_features = ["kern", "liga"]
+    options.drop_tables += ["DSIG"]
+    font = subset.load_font(args.font, options)
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(text=characters)
+    subsetter.subset(font)
+    subset.save_font(font, args.output, options)
+    print(f"{len(characters)} caractères → {args.output} ({os.path.getsize(args.output) // 1024} Ko)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Regroupement des mises à jour de la page, une fois par image.
+
+Au lieu d'appeler ``page.update()`` (ou ``control.update()``) à chaque
+modification, le code marque les contrôles modifiés avec ``mark_dirty`` ;
+un seul ``page.update(*contrôles)`` part à la prochaine image (~16 ms) avec
+le diff de tout ce qui a été marqué entre-temps, y compris depuis d'autres
+threads (caméra, chronomètre, tâches de fond).
+
+``flush_now`` envoie immédiatement ce qui est en attente, plus d'éventuels
+contrôles supplémentaires : pour les cas où l'attente d'une image se verrait
+(navigation, début d'une animation) ; si un envoi est déjà en cours dans un
+autre thread, il attend sa fin, si bien qu'au retour les contrôles peuvent
+être modifiés sans risque. Marquer la page elle-même demande une
+mise à jour complète (nouveau contrôle à insérer dans l'arbre, etc.).
+
+``stats()`` indique combien de demandes ont été fusionnées et combien de
+contrôles sont réellement partis (ceux retirés de l'arbre entre-temps ne
+comptent pas ; une mise à jour complète compte pour la page seule).
+"""
+import math
+import threading
+
+from event_coalescing import FRAME_INTERVAL
+from instrumentation import attributed_to, caller_name, timed
+
+
+class UpdateScheduler:
+    def __init__(self, page, frame_interval=FRAME_INTERVAL):
+        self.page = page
+        self.frame_interval = frame_interval
+        self._dirty = {}
+        # Fonctions qui ont demandé les mises à jour en attente (instrumentation activée seulement)
+        self._callers = set()
+        self._scheduled = False
+        self._lock = threading.Lock()
+        # Un seul envoi à la fois : flush_now ne rend la main qu'une fois l'envoi en cours terminé
+        self._flush_lock = threading.RLock()
+        self.requests = 0
+        self.flushes = 0
+        self.controls_sent = 0
+
+    def mark_dirty(self, *controls):
+        """Planifie la mise à jour des contrôles à la prochaine image (thread-safe)"""
+        caller = caller_name()
+        with self._lock:
+            self._add(controls, caller)
+            if self._scheduled or not self._dirty:
+                return
+            self._scheduled = True
+        self.page.loop.call_soon_threadsafe(self._schedule)
+
+    def flush_now(self, *controls):
+        """Envoie tout de suite les contrôles en attente et ceux passés en argument"""
+        caller = caller_name()
+        with self._lock:
+            self._add(controls, caller)
+        self.flush()
+
+    def _add(self, controls, caller):
+        if caller and controls:
+            self._callers.add(caller)
+        for control in controls:
+            if control is None:
+                continue
+            self.requests += 1
+            self._dirty[id(control)] = control
+
+    def _schedule(self):
+        loop = self.page.loop
+        now = loop.time()
+        next_frame = (math.floor(now / self.frame_interval) + 1) * self.frame_interval
+        loop.call_at(next_frame, self.page.run_thread, self.flush)
+
+    @timed()
+    def flush(self):
+        with self._flush_lock:
+            self._flush()
+
+    def _flush(self):
+        with self._lock:
+            dirty = list(self._dirty.values())
+            self._dirty.clear()
+            callers = sorted(self._callers)
+            self._callers.clear()
+            self._scheduled = False
+        if not dirty:
+            return
+        if any(control is self.page for control in dirty):
+            sent = [self.page]
+        else:
+            # Contrôles retirés de l'arbre entre-temps : plus rien à envoyer
+            sent = [control for control in dirty if control.page is not None]
+            if not sent:
+                return
+        # Mesure attribuée aux fonctions qui ont marqué les contrôles, pas à flush
+        with attributed_to(callers):
+            if sent[0] is self.page:
+                self.page.update()
+            else:
+                self.page.update(*sent)
+        with self._lock:
+            self.flushes += 1
+            self.controls_sent += len(sent)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "flushes": self.flushes,
+                "merged": self.requests - self.flushes,
+                "controls_sent": self.controls_sent,
+            }